@@ -32,8 +32,20 @@ admin.site.register(Bookmark)
 admin.site.register(Job)
 admin.site.register(CurrentEvent)
 admin.site.register(SubjectiveSubject)
-admin.site.register(SubjectiveChapter)
-admin.site.register(SubjectiveQA)
+
+class SubjectiveChapterAdmin(admin.ModelAdmin):
+    # __str__ includes the subject's name
+    list_select_related = ('subject',)
+
+admin.site.register(SubjectiveChapter, SubjectiveChapterAdmin)
+
+class SubjectiveQAAdmin(admin.ModelAdmin):
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'chapter':
+            kwargs['queryset'] = SubjectiveChapter.objects.select_related('subject')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+admin.site.register(SubjectiveQA, SubjectiveQAAdmin)
 admin.site.register(Category)
 admin.site.register(ModelSetQuestion)
 
@@ -0,0 +1,59 @@
+"""
+Persisted model set test attempts.
+
+An attempt and all of its answers are stored as a single document (answers
+are an embedded array), so recording a submission costs exactly one insert.
+Reads go through the ``(user, submitted_at)`` and ``(model_set, submitted_at)``
+indexes declared on :class:`core.models.TestAttempt`.
+"""
+from .models import TestAttempt
+from .mongo import collection_for
+
+HISTORY_LIMIT = 50
+
+
+def record_attempt(user, model_set, score, results, elapsed_seconds, started_at=None):
+    """Append one attempt with its graded ``results`` (see ``scoring.score_answers``)."""
+    return TestAttempt.objects.create(
+        user=user,
+        model_set=model_set,
+        score=score,
+        total=len(results),
+        elapsed_seconds=max(int(elapsed_seconds), 0),
+        started_at=started_at,
+        answers=[
+            {'question_id': r['question_id'], 'answer': r['user_answer'], 'is_correct': r['is_correct']}
+            for r in results
+        ],
+    )
+
+
+def user_attempts(user, limit=HISTORY_LIMIT):
+    """Most recent attempts by ``user``, newest first, without the answer arrays."""
+    return TestAttempt.objects.filter(user=user).select_related('model_set').defer('answers').order_by('-submitted_at')[:limit]
+
+
+def question_difficulty(model_set_id):
+    """
+    Per-question answer statistics for a model set across all attempts.
+
+    Returns ``{question_id: {'attempts': int, 'correct': int, 'rate': float}}``
+    where ``rate`` is the share of attempts that answered correctly.
+    """
+    pipeline = [
+        {'$match': {'model_set_id': model_set_id}},
+        {'$unwind': '$answers'},
+        {'$group': {
+            '_id': '$answers.question_id',
+            'attempts': {'$sum': 1},
+            'correct': {'$sum': {'$cond': ['$answers.is_correct', 1, 0]}},
+        }},
+    ]
+    return {
+        row['_id']: {
+            'attempts': row['attempts'],
+            'correct': row['correct'],
+            'rate': row['correct'] / row['attempts'] if row['attempts'] else 0,
+        }
+        for row in collection_for(TestAttempt).aggregate(pipeline)
+    }
@@ -0,0 +1,209 @@
+"""
+Answer autosave and resumable timers for model set tests.
+
+Each (user, model set) pair has an in-progress state in the cache holding
+the server-side start time, the deadline derived from the set's timer and
+the answers saved so far. Browsers post small deltas as the candidate
+answers; the state is flushed to the ``AttemptDraft`` collection every
+``AUTOSAVE_FLUSH_SECONDS`` so it survives a cache eviction. Reloading the
+test resumes the same state instead of restarting the clock.
+
+Two posts for the same attempt (a retry racing the original, or a second
+tab) would each merge into the state they read, and the later write would
+drop the other's answers, so every read-modify-write of a state holds a
+short cache lock. Without a shared cache the state and the lock would be
+per worker, so the draft document itself is the state: deltas are written
+straight to it with one ``$set`` per answer, which MongoDB applies
+atomically.
+"""
+import datetime
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .caches import cache_is_shared
+from .models import AttemptDraft
+from .mongo import collection_for
+
+AUTOSAVE_FLUSH_SECONDS = getattr(settings, 'AUTOSAVE_FLUSH_SECONDS', 30)
+# Answers arriving this long after the deadline are still accepted (network lag)
+DEADLINE_GRACE_SECONDS = getattr(settings, 'DEADLINE_GRACE_SECONDS', 10)
+# Untimed tests keep their state this long after the last activity
+UNTIMED_STATE_TTL = 60 * 60 * 24
+VALID_ANSWERS = ('A', 'B', 'C', 'D', '')
+# How long a state lock is held at most, and waited for before going ahead
+STATE_LOCK_TIMEOUT = 5
+
+
+class DeadlinePassed(Exception):
+    pass
+
+
+def _state_key(user_id, set_id):
+    return f'core:attempt_state:{user_id}:{set_id}'
+
+
+@contextmanager
+def _locked(user_id, set_id):
+    """Hold the attempt's state lock; an abandoned lock expires after ``STATE_LOCK_TIMEOUT``."""
+    key = _state_key(user_id, set_id) + ':lock'
+    give_up = time.monotonic() + STATE_LOCK_TIMEOUT
+    while not cache.add(key, 1, STATE_LOCK_TIMEOUT) and time.monotonic() < give_up:
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        cache.delete(key)
+
+
+def _state_ttl(state, now):
+    if state['deadline'] is None:
+        return UNTIMED_STATE_TTL
+    return max(int(state['deadline'] - now) + DEADLINE_GRACE_SECONDS + AUTOSAVE_FLUSH_SECONDS, 1)
+
+
+def _load_draft(user_id, set_id):
+    row = collection_for(AttemptDraft).find_one(
+        {'user_id': user_id, 'model_set_id': set_id},
+        {'started_at': 1, 'deadline': 1, 'answers': 1},
+    )
+    if row is None:
+        return None
+    return {
+        'started_at': row['started_at'],
+        'deadline': row.get('deadline'),
+        'answers': dict(row.get('answers') or {}),
+        'flushed_at': time.time(),
+    }
+
+
+def _flush(user_id, set_id, state, now):
+    collection_for(AttemptDraft).update_one(
+        {'user_id': user_id, 'model_set_id': set_id},
+        {'$set': {
+            'started_at': state['started_at'],
+            'deadline': state['deadline'],
+            'answers': state['answers'],
+            'updated_at': timezone.now(),
+        }},
+        upsert=True,
+    )
+    state['flushed_at'] = now
+
+
+def _save(user_id, set_id, state, now):
+    if cache_is_shared():
+        cache.set(_state_key(user_id, set_id), state, _state_ttl(state, now))
+
+
+def get_state(user_id, set_id):
+    """Return the in-progress state from the cache, falling back to the flushed draft."""
+    state = cache.get(_state_key(user_id, set_id)) if cache_is_shared() else None
+    if state is None:
+        state = _load_draft(user_id, set_id)
+    return state
+
+
+def is_expired(state, now=None):
+    now = now or time.time()
+    return state['deadline'] is not None and now > state['deadline'] + DEADLINE_GRACE_SECONDS
+
+
+def remaining_seconds(state, now=None):
+    if state['deadline'] is None:
+        return None
+    return max(int(state['deadline'] - (now or time.time())), 0)
+
+
+def start_or_resume(user_id, set_id, total_seconds):
+    """
+    Return the running state for this test, starting the clock if needed.
+
+    An expired state is replaced by a fresh one, so a candidate who comes
+    back after the deadline starts a new attempt.
+    """
+    now = time.time()
+    state = get_state(user_id, set_id)
+    if state is None or is_expired(state, now):
+        state = {
+            'started_at': now,
+            'deadline': now + total_seconds if total_seconds else None,
+            'answers': {},
+            'flushed_at': 0,
+        }
+        _flush(user_id, set_id, state, now)
+    _save(user_id, set_id, state, now)
+    return state
+
+
+def _save_to_draft(user_id, set_id, answers):
+    now = time.time()
+    state = _load_draft(user_id, set_id)
+    if state is None:
+        raise LookupError('No test in progress.')
+    if is_expired(state, now):
+        raise DeadlinePassed()
+    if answers:
+        update = {f'answers.{question_id}': answer for question_id, answer in answers.items()}
+        update['updated_at'] = timezone.now()
+        collection_for(AttemptDraft).update_one({'user_id': user_id, 'model_set_id': set_id}, {'$set': update})
+        state['answers'].update(answers)
+    return state
+
+
+def save_deltas(user_id, set_id, deltas, valid_ids):
+    """
+    Merge ``{question_id: option}`` deltas into the running state.
+
+    Ids outside ``valid_ids`` and options other than A-D (or '' to clear)
+    are ignored. Raises :class:`DeadlinePassed` once time is up and
+    ``LookupError`` when no test is running.
+    """
+    accepted = {}
+    for question_id, answer in deltas.items():
+        answer = answer or ''
+        if question_id in valid_ids and isinstance(answer, str) and answer.upper() in VALID_ANSWERS:
+            accepted[question_id] = answer.upper()
+    if not cache_is_shared():
+        return _save_to_draft(user_id, set_id, accepted)
+    with _locked(user_id, set_id):
+        now = time.time()
+        state = get_state(user_id, set_id)
+        if state is None:
+            raise LookupError('No test in progress.')
+        if is_expired(state, now):
+            raise DeadlinePassed()
+        state['answers'].update(accepted)
+        if now - state['flushed_at'] >= AUTOSAVE_FLUSH_SECONDS:
+            _flush(user_id, set_id, state, now)
+        _save(user_id, set_id, state, now)
+    return state
+
+
+def finish(user_id, set_id, posted_answers):
+    """
+    Close the running test and reconcile its answers with the final post.
+
+    Answers posted before the deadline override the saved deltas; after the
+    deadline only what was autosaved in time counts. Returns
+    ``(answers, elapsed_seconds, started_at)``.
+    """
+    with _locked(user_id, set_id):
+        now = time.time()
+        state = get_state(user_id, set_id)
+        if state is None:
+            return posted_answers, 0, None
+        cache.delete(_state_key(user_id, set_id))
+        if state['flushed_at']:
+            collection_for(AttemptDraft).delete_one({'user_id': user_id, 'model_set_id': set_id})
+    answers = dict(state['answers'])
+    if not is_expired(state, now):
+        answers.update({qid: ans for qid, ans in posted_answers.items() if ans})
+    elapsed = now - state['started_at']
+    if state['deadline'] is not None:
+        elapsed = min(elapsed, state['deadline'] - state['started_at'])
+    started_at = datetime.datetime.fromtimestamp(state['started_at'], tz=datetime.timezone.utc)
+    return answers, elapsed, started_at
@@ -0,0 +1,158 @@
+"""
+Per-user bookmark sets.
+
+A user's bookmarks for one content type are read with a single projected
+query and cached as a frozenset of ObjectId strings, so listing templates
+check ``obj.mongoid in bookmarks`` in O(1) and a page view costs no
+bookmark query once the set is warm. A process-local cache would serve
+other workers' stale sets, so without a shared cache every view reads the
+set from MongoDB. :func:`toggle_bookmark` drops the cached set whenever it
+changes.
+
+:func:`bookmarks_page` lists a user's bookmarks newest first and resolves
+the generic targets with one ``_id__in`` query per content type instead of
+one query per ``content_object``.
+"""
+from collections import defaultdict, namedtuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+from django.core.cache import cache
+
+from .caches import cache_is_shared
+from .contenttypes import model_for_content_type_id
+from .models import Bookmark, ObjectiveMCQ
+from .mongo import collection_for
+from .pagination import KeysetPage, get_page_size
+
+BOOKMARKS_TTL = getattr(settings, 'BOOKMARKS_TTL', 60 * 60 * 24)
+
+SavedItem = namedtuple('SavedItem', ['model', 'label', 'id', 'title', 'url', 'bookmarked_at'])
+
+# Targets without a title are shown by __str__, which for these reads a
+# related row; load it in the same query rather than once per bookmark
+STR_RELATED = {
+    ObjectiveMCQ: ('set',),
+}
+
+
+def _bookmarks_cache_key(user_id, content_type_id):
+    return f'core:bookmarks:{user_id}:{content_type_id}'
+
+
+def bookmark_ids(user, content_type):
+    """Return the frozenset of object ids ``user`` bookmarked for ``content_type``."""
+    if not user.is_authenticated:
+        return frozenset()
+    shared = cache_is_shared()
+    key = _bookmarks_cache_key(user.pk, content_type.pk)
+    ids = cache.get(key) if shared else None
+    if ids is None:
+        ids = frozenset(
+            Bookmark.objects.filter(user=user, content_type=content_type).values_list('object_id', flat=True)
+        )
+        if shared:
+            cache.set(key, ids, BOOKMARKS_TTL)
+    return ids
+
+
+def invalidate_bookmarks(user_id, content_type_id):
+    cache.delete(_bookmarks_cache_key(user_id, content_type_id))
+
+
+def toggle_bookmark(user, content_type, object_id):
+    """
+    Add or remove a bookmark, decided by the database rather than the
+    cached set: the (user, content_type, object_id) row is deleted, and
+    inserted only if there was nothing to delete. ``content_type`` comes
+    from the registry in :mod:`core.contenttypes`. Returns ``'added'`` or
+    ``'removed'``.
+    """
+    object_id = str(object_id)
+    deleted, _ = Bookmark.objects.filter(user=user, content_type=content_type, object_id=object_id).delete()
+    if deleted:
+        status = 'removed'
+    else:
+        Bookmark.objects.create(user=user, content_type=content_type, object_id=object_id)
+        status = 'added'
+    invalidate_bookmarks(user.pk, content_type.pk)
+    return status
+
+
+def _target_url(obj):
+    if hasattr(obj, 'get_absolute_url'):
+        return obj.get_absolute_url()
+    file = getattr(obj, 'file', None) or getattr(obj, 'document', None)
+    return file.url if file else ''
+
+
+def resolve_bookmarks(rows):
+    """
+    Turn raw bookmark rows into :class:`SavedItem`s in the same order.
+
+    Rows are grouped by content type and each target model is fetched with
+    a single ``_id__in`` query; bookmarks whose target was deleted (or whose
+    type is no longer bookmarkable) are dropped.
+    """
+    wanted = defaultdict(set)
+    for row in rows:
+        try:
+            wanted[row['content_type_id']].add(ObjectId(row['object_id']))
+        except (InvalidId, TypeError):
+            continue
+    targets = {}
+    for content_type_id, ids in wanted.items():
+        model = model_for_content_type_id(content_type_id)
+        if model is None:
+            continue
+        queryset = model.objects.filter(_id__in=list(ids))
+        if model in STR_RELATED:
+            queryset = queryset.select_related(*STR_RELATED[model])
+        for obj in queryset:
+            targets[(content_type_id, str(obj.pk))] = obj
+    items = []
+    for row in rows:
+        obj = targets.get((row['content_type_id'], row['object_id']))
+        if obj is None:
+            continue
+        items.append(SavedItem(
+            obj._meta.model_name,
+            obj._meta.verbose_name.title(),
+            str(obj.pk),
+            getattr(obj, 'title', None) or str(obj),
+            _target_url(obj),
+            row.get('created_at'),
+        ))
+    return items
+
+
+def _parse_id_cursor(value):
+    """Return the integer bookmark id encoded in ``value`` or None if it is missing/invalid."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def bookmarks_page(request, page_size=None):
+    """
+    One keyset page of ``request.user``'s bookmarks, newest first.
+
+    Bookmarks are read straight from their collection and walk the model's
+    integer primary key, so the ``bookmark_user_idx`` index on (user, -id)
+    serves both the filter and the sort.
+    """
+    size = get_page_size(request, page_size)
+    cursor = _parse_id_cursor(request.GET.get('cursor'))
+    criteria = {'user_id': request.user.pk}
+    if cursor is not None:
+        criteria['id'] = {'$lt': cursor}
+    rows = list(
+        collection_for(Bookmark)
+        .find(criteria, {'id': 1, 'content_type_id': 1, 'object_id': 1, 'created_at': 1})
+        .sort('id', -1)
+        .limit(size + 1)
+    )
+    next_cursor = str(rows[size - 1]['id']) if len(rows) > size else None
+    return KeysetPage(resolve_bookmarks(rows[:size]), cursor, next_cursor, request.GET)
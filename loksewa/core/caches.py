@@ -0,0 +1,27 @@
+"""
+Whether a cache is seen by every worker process.
+
+Data cached until a model signal invalidates it (answer keys, page
+fragment versions, bookmark sets) is only correct when the invalidation
+reaches every worker, that is when all of them read the same store. Without
+``REDIS_URL`` the default cache is a per-process ``LocMemCache``, so callers
+check :func:`cache_is_shared` and read from MongoDB instead of caching.
+"""
+from django.conf import settings
+
+# Backends whose entries live in, and are only visible to, one process
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared(alias='default'):
+    """
+    True unless cache ``alias`` is local to this process.
+    ``SHARED_CACHE_ALIASES``, when set, lists the shared aliases explicitly.
+    """
+    shared_aliases = getattr(settings, 'SHARED_CACHE_ALIASES', None)
+    if shared_aliases is not None:
+        return alias in shared_aliases
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
@@ -0,0 +1,64 @@
+"""
+Conditional GET (ETag / Last-Modified) for the public content pages.
+
+A page's validators come from the versions :mod:`core.pagecache` keeps for
+the data groups it renders: the ETag hashes them together with the URL,
+query string and viewer, and Last-Modified is the time the newest of them
+was issued, i.e. the last save or delete that touched the page's data.
+Both are read with one cache lookup, so a revalidating visitor gets a
+``304 Not Modified`` without a database query or template render. The
+content models' own ``created_at`` stamps are not enough on their own
+because most of them do not change when a row is edited.
+
+Versions held in a process-local cache differ from worker to worker, so
+without a shared cache (see :func:`core.caches.cache_is_shared`) pages are
+served without validators.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .caches import cache_is_shared
+from .pagecache import group_versions, page_groups, version_time, viewer_variant
+
+
+def _validators(request, view_name, kwargs):
+    # Computed once per request; Django asks for the ETag and Last-Modified separately
+    validators = getattr(request, '_page_validators', None)
+    if validators is None:
+        versions = group_versions(page_groups(view_name, **kwargs))
+        # The outer page shows the signed-in user, so validators are per viewer
+        raw = repr((request.path, request.GET.urlencode(), viewer_variant(request, per_user=True), versions))
+        validators = (hashlib.md5(raw.encode()).hexdigest(), max(version_time(version) for version in versions))
+        request._page_validators = validators
+    return validators
+
+
+def conditional_page(view_name):
+    """
+    Decorate ``view_name``'s view with ETag/Last-Modified handling.
+
+    Responses are marked ``private, no-cache`` so browsers keep them but
+    revalidate on every visit, which the 304 path makes cheap. Without a
+    shared cache the view is called as is.
+    """
+    def decorator(view):
+        def etag(request, *args, **kwargs):
+            return _validators(request, view_name, kwargs)[0]
+
+        def last_modified(request, *args, **kwargs):
+            return _validators(request, view_name, kwargs)[1]
+
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not cache_is_shared():
+                return view(request, *args, **kwargs)
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,71 @@
+"""
+Warm, read-only registry of the ContentTypes that bookmarks point at.
+
+``ContentType.objects.get(model=...)`` and ``get_for_model`` go through
+djongo on a cold or per-thread cache; the registry loads every allowlisted
+type in one query at startup (see ``loksewa/wsgi.py``) and afterwards
+answers from an immutable mapping, so resolving a bookmark target costs no
+database round trip. Names outside :data:`BOOKMARKABLE_MODELS` are
+rejected.
+"""
+import logging
+import threading
+from types import MappingProxyType
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError
+
+from .models import Note, Article, Quiz, ModelSet, GKEntry, Pradesh, CurrentEvent, Job, ObjectiveSet, ObjectiveMCQ, SubjectiveQA
+
+logger = logging.getLogger(__name__)
+
+BOOKMARKABLE_MODELS = (Note, Article, Quiz, ModelSet, GKEntry, Pradesh, CurrentEvent, Job, ObjectiveSet, ObjectiveMCQ, SubjectiveQA)
+
+_registry = None
+_lock = threading.Lock()
+
+
+def _load():
+    by_model = ContentType.objects.get_for_models(*BOOKMARKABLE_MODELS)
+    by_name = {model._meta.model_name: content_type for model, content_type in by_model.items()}
+    by_id = {content_type.pk: model for model, content_type in by_model.items()}
+    return MappingProxyType(by_name), MappingProxyType(by_id)
+
+
+def _get_registry():
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = _load()
+    return _registry
+
+
+def warm_content_types():
+    """Load the registry now; on a database error it is loaded on first use instead."""
+    try:
+        _get_registry()
+    except DatabaseError:
+        logger.warning('Could not warm the content type registry; it will load on first use', exc_info=True)
+
+
+def bookmark_content_types():
+    """Immutable ``{model_name: ContentType}`` mapping of the allowlisted models."""
+    return _get_registry()[0]
+
+
+def content_type_for(model_name):
+    """Return the ContentType for an allowlisted ``model_name``; raise LookupError otherwise."""
+    try:
+        return bookmark_content_types()[model_name]
+    except KeyError:
+        raise LookupError(f'{model_name!r} cannot be bookmarked') from None
+
+
+def content_type_of(model):
+    return content_type_for(model._meta.model_name)
+
+
+def model_for_content_type_id(content_type_id):
+    """Return the allowlisted model class for ``content_type_id``, or None."""
+    return _get_registry()[1].get(content_type_id)
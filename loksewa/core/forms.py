@@ -27,6 +27,11 @@ class SubjectiveQAForm(forms.ModelForm):
         model = SubjectiveQA
         fields = ['chapter', 'question', 'answer']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Chapter choices are labelled with their subject's name
+        self.fields['chapter'].queryset = SubjectiveChapter.objects.select_related('subject')
+
 class CategoryForm(forms.ModelForm):
     class Meta:
         model = Category
@@ -0,0 +1,290 @@
+"""
+Streaming MCQ importers for CSV, JSON, JSON-lines, XLSX and pasted question banks.
+
+Files are read one row at a time and written in fixed-size batches through
+:func:`core.ingest.bulk_ingest`, so memory stays bounded and a large bank
+costs ``rows / batch_size`` inserts. Rows that fail validation are reported
+with their line number instead of aborting the import; a file that cannot
+be read at all raises ValueError, possibly after some batches were written.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import zipfile
+from collections import namedtuple
+
+from .ingest import bulk_ingest, INGEST_BATCH_SIZE
+from .models import ModelSetQuestion, ObjectiveMCQ
+from .scoring import invalidate_answer_key
+from .signals import children_bulk_changed
+from .stats import invalidate_objective_counts
+
+ImportReport = namedtuple('ImportReport', ['inserted', 'errors', 'duplicates'], defaults=(0,))
+
+FORMATS = ('csv', 'json', 'jsonl', 'xlsx')
+EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.xlsx': 'xlsx',
+}
+OPTIONS = ('A', 'B', 'C', 'D')
+OPTION_MAX_LENGTH = 500
+
+# Accepted column names for each normalized MCQ field
+COLUMN_ALIASES = {
+    'question': ('question', 'question_text'),
+    'option_a': ('option_a', 'a'),
+    'option_b': ('option_b', 'b'),
+    'option_c': ('option_c', 'c'),
+    'option_d': ('option_d', 'd'),
+    'correct': ('correct_option', 'correct_answer', 'answer', 'correct'),
+    'explanation': ('explanation',),
+}
+
+
+def detect_format(filename, fmt=None):
+    """Return the import format for ``filename`` (or the explicit ``fmt``)."""
+    if fmt:
+        fmt = fmt.lower()
+    else:
+        fmt = EXTENSION_FORMATS.get(os.path.splitext(filename or '')[1].lower())
+    if fmt not in FORMATS:
+        raise ValueError(f'Unsupported import format for {filename!r}; use CSV, JSON, JSON-lines or XLSX.')
+    return fmt
+
+
+def _binary(fileobj):
+    # Django upload wrappers keep the real file object in ``.file``
+    return getattr(fileobj, 'file', fileobj)
+
+
+def iter_csv(fileobj):
+    reader = csv.DictReader(io.TextIOWrapper(_binary(fileobj), encoding='utf-8-sig', newline=''))
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except csv.Error as e:
+        raise ValueError(f'Invalid CSV on line {reader.line_num}: {e}') from None
+
+
+def iter_json(fileobj):
+    """
+    Read a JSON array of question objects, numbered by their position.
+
+    Unlike the other readers the array is parsed whole, so large banks are
+    better uploaded as JSON-lines.
+    """
+    try:
+        data = json.load(io.TextIOWrapper(_binary(fileobj), encoding='utf-8-sig'))
+    except json.JSONDecodeError as e:
+        raise ValueError(f'Invalid JSON: {e}') from None
+    if not isinstance(data, list):
+        raise ValueError('A .json file must hold an array of questions; use .jsonl for one question per line.')
+    yield from enumerate(data, start=1)
+
+
+def iter_jsonl(fileobj):
+    for line_no, line in enumerate(io.TextIOWrapper(_binary(fileobj), encoding='utf-8-sig'), start=1):
+        if line.strip():
+            yield line_no, line
+
+
+def iter_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ValueError('XLSX import requires the openpyxl package.') from None
+    try:
+        workbook = load_workbook(_binary(fileobj), read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError) as e:
+        raise ValueError(f'Invalid XLSX file: {e}') from None
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell or '').strip() for cell in next(rows, ())]
+        for line_no, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield line_no, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+PASTED_OPTION_RE = re.compile(r'^\(?([A-Da-d])[\).:]\s*(.*)$')
+PASTED_FIELD_RE = re.compile(r'^(answer|correct|explanation)\s*[:\-]\s*(.*)$', re.IGNORECASE)
+
+
+def iter_pasted(text):
+    """
+    Parse a pasted block of MCQs separated by blank lines::
+
+        Which is the largest province of Nepal?
+        A) Karnali
+        B) Bagmati
+        C) Koshi
+        D) Gandaki
+        Answer: A
+        Explanation: optional text
+
+    Yields ``(line_number, row_dict)`` with the line where each MCQ starts.
+    """
+    row, start = {}, None
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            if row:
+                yield start, row
+            row, start = {}, None
+            continue
+        if start is None:
+            start = line_no
+        option = PASTED_OPTION_RE.match(line)
+        field = PASTED_FIELD_RE.match(line)
+        if 'question' in row and option:
+            row[f'option_{option.group(1).lower()}'] = option.group(2)
+        elif field:
+            key = 'explanation' if field.group(1).lower() == 'explanation' else 'correct'
+            row[key] = field.group(2)
+        elif 'question' not in row:
+            row['question'] = line
+        else:
+            row['question'] += ' ' + line
+    if row:
+        yield start, row
+
+
+READERS = {'csv': iter_csv, 'json': iter_json, 'jsonl': iter_jsonl, 'xlsx': iter_xlsx}
+
+
+def iter_rows(fileobj, filename=None, fmt=None):
+    """Yield ``(line_number, raw_row)`` pairs from an uploaded or opened file."""
+    return READERS[detect_format(filename or getattr(fileobj, 'name', ''), fmt)](fileobj)
+
+
+def normalize_mcq(raw):
+    """
+    Map a raw CSV/XLSX/JSON dict or JSON line onto the normalized MCQ fields.
+
+    Raises ValueError with a readable message when the row is invalid.
+    """
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    if not isinstance(raw, dict):
+        raise ValueError('Row is not an object.')
+    columns = {str(key).strip().lower(): value for key, value in raw.items() if key is not None}
+    row = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        value = next((columns[alias] for alias in aliases if columns.get(alias) not in (None, '')), '')
+        row[field] = str(value).strip()
+    if not row['question']:
+        raise ValueError('Question text is missing.')
+    for option in OPTIONS:
+        value = row[f'option_{option.lower()}']
+        if not value:
+            raise ValueError(f'Option {option} is missing.')
+        if len(value) > OPTION_MAX_LENGTH:
+            raise ValueError(f'Option {option} is longer than {OPTION_MAX_LENGTH} characters.')
+    row['correct'] = row['correct'].upper()
+    if row['correct'] not in OPTIONS:
+        raise ValueError('Correct option must be one of A, B, C or D.')
+    return row
+
+
+def question_hash(text):
+    """Hash of ``text`` ignoring case, punctuation and whitespace differences."""
+    normalized = ' '.join(re.sub(r'[^\w\s]', ' ', text.casefold()).split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def import_mcqs(model, rows, build, batch_size=INGEST_BATCH_SIZE, seen_hashes=None):
+    """
+    Validate ``rows`` and insert them into ``model`` in batches.
+
+    ``build`` turns a normalized MCQ dict into model keyword arguments.
+    When ``seen_hashes`` is given, rows whose :func:`question_hash` is
+    already in it are skipped as duplicates (the set is updated as rows are
+    accepted, so repeats within the file are caught too). Returns an
+    :class:`ImportReport` with the inserted count, a list of
+    ``(line_number, message)`` errors and the duplicate count.
+    """
+    errors = []
+    duplicates = 0
+
+    def clean(item):
+        nonlocal duplicates
+        line_no, raw = item
+        try:
+            row = normalize_mcq(raw)
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+            return None
+        if seen_hashes is not None:
+            digest = question_hash(row['question'])
+            if digest in seen_hashes:
+                duplicates += 1
+                return None
+            seen_hashes.add(digest)
+        return build(row)
+
+    result = bulk_ingest(model, rows, clean, batch_size=batch_size)
+    return ImportReport(result.inserted, errors, duplicates)
+
+
+def import_model_set_questions(model_set, rows, batch_size=INGEST_BATCH_SIZE):
+    """
+    Import raw MCQ rows as ``ModelSetQuestion``s of ``model_set``.
+
+    ``bulk_create`` sends no signals, so the set's cached answer key is
+    dropped here once the import finishes, or fails after writing some
+    batches.
+    """
+    def build(row):
+        return {
+            'model_set': model_set,
+            'question_text': row['question'],
+            'option_a': row['option_a'],
+            'option_b': row['option_b'],
+            'option_c': row['option_c'],
+            'option_d': row['option_d'],
+            'correct_option': row['correct'],
+            'explanation': row['explanation'],
+        }
+
+    try:
+        return import_mcqs(ModelSetQuestion, rows, build, batch_size)
+    finally:
+        invalidate_answer_key(model_set.pk)
+
+
+def import_objective_mcqs(obj_set, rows, batch_size=INGEST_BATCH_SIZE):
+    """
+    Import raw MCQ rows into ``obj_set``, skipping questions already in the set.
+
+    ``bulk_create`` sends no signals, so the cached objective counts are
+    dropped and ``children_bulk_changed`` is sent once the import finishes,
+    or fails after writing some batches.
+    """
+    existing = ObjectiveMCQ.objects.filter(set=obj_set).values_list('question', flat=True)
+    seen_hashes = {question_hash(question) for question in existing}
+
+    def build(row):
+        return {
+            'set': obj_set,
+            'question': row['question'],
+            'option_a': row['option_a'],
+            'option_b': row['option_b'],
+            'option_c': row['option_c'],
+            'option_d': row['option_d'],
+            'correct_answer': row['correct'],
+            'explanation': row['explanation'],
+        }
+
+    try:
+        return import_mcqs(ObjectiveMCQ, rows, build, batch_size, seen_hashes)
+    finally:
+        invalidate_objective_counts()
+        children_bulk_changed.send(sender=ObjectiveMCQ, parent=obj_set)
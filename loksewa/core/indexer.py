@@ -0,0 +1,183 @@
+"""
+Background queue that keeps the search index in step with content edits.
+
+Signal handlers and the bulk write paths only record *what* changed; the
+index writes happen later, in batches, through
+:func:`core.search.apply_changes`. Pending changes are keyed by object, so
+ten saves of the same article before the batch runs cost one index write.
+
+``SEARCH_INDEX_MODE`` picks where the queue lives:
+
+``'thread'`` (default)
+    An in-process queue drained by a daemon thread every
+    ``SEARCH_INDEX_DELAY`` seconds. A batch that fails to apply is queued
+    again, up to ``SEARCH_INDEX_MAX_RETRIES`` times, before its events are
+    dropped and left for ``manage.py build_search_index``. Anything still
+    queued when the process exits is flushed by an ``atexit`` hook.
+``'mongo'``
+    A ``core_search_queue`` collection drained by ``manage.py run_indexer``,
+    for deployments that would rather keep indexing out of web workers.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from pymongo import DeleteOne
+
+from .mongo import get_database
+from .search import SOURCE_KINDS, SEARCH_SOURCES, apply_changes
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_MODE = getattr(settings, 'SEARCH_INDEX_MODE', 'thread')
+SEARCH_INDEX_DELAY = getattr(settings, 'SEARCH_INDEX_DELAY', 1.0)
+SEARCH_INDEX_MAX_RETRIES = getattr(settings, 'SEARCH_INDEX_MAX_RETRIES', 3)
+SEARCH_QUEUE_COLLECTION = 'core_search_queue'
+SEARCH_QUEUE_BATCH_SIZE = 500
+
+UPSERT, DELETE, CHILDREN = 'upsert', 'delete', 'children'
+
+
+def _apply(events):
+    """Turn coalesced ``{(kind, op_group, pk): op}`` events into one index update."""
+    upserts, deletes, parents = defaultdict(set), defaultdict(set), defaultdict(set)
+    targets = {UPSERT: upserts, DELETE: deletes, CHILDREN: parents}
+    for (kind, _, pk), op in events.items():
+        targets[op][kind].add(pk)
+    return apply_changes(upserts, deletes, parents)
+
+
+def _event_key(kind, op, pk):
+    # Saves and deletes of one object share a key so the last one wins;
+    # a parent refresh is keyed separately from its own object events.
+    return (kind, 'parent' if op == CHILDREN else 'object', pk)
+
+
+class IndexQueue:
+    """Coalescing in-process queue drained by a lazily started daemon thread."""
+
+    def __init__(self, delay, max_retries=SEARCH_INDEX_MAX_RETRIES):
+        self.delay = delay
+        self.max_retries = max_retries
+        self._pending = {}
+        # Failed attempts per event key, cleared once the event is applied
+        self._attempts = {}
+        self._lock = threading.Condition()
+        self._thread = None
+
+    def put(self, kind, op, pk):
+        with self._lock:
+            key = _event_key(kind, op, pk)
+            self._pending[key] = op
+            self._attempts.pop(key, None)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='search-indexer', daemon=True)
+                self._thread.start()
+            self._lock.notify()
+
+    def _take(self):
+        with self._lock:
+            events, self._pending = self._pending, {}
+        return events
+
+    def _requeue(self, events):
+        """Queue a failed batch again, except events superseded or out of retries."""
+        dropped = 0
+        with self._lock:
+            for key, op in events.items():
+                if key in self._pending:
+                    continue
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts > self.max_retries:
+                    self._attempts.pop(key, None)
+                    dropped += 1
+                    continue
+                self._attempts[key] = attempts
+                self._pending[key] = op
+        if dropped:
+            logger.error('Dropped %d search index updates after %d retries; run manage.py build_search_index', dropped, self.max_retries)
+
+    def flush(self):
+        """Apply everything queued so far in the calling thread."""
+        events = self._take()
+        if events:
+            try:
+                _apply(events)
+            except Exception:
+                self._requeue(events)
+                raise
+            with self._lock:
+                for key in events:
+                    self._attempts.pop(key, None)
+        return len(events)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._lock.wait()
+            # Let a burst of edits accumulate into one batch
+            time.sleep(self.delay)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Search index update failed')
+
+
+local_queue = IndexQueue(SEARCH_INDEX_DELAY)
+atexit.register(local_queue.flush)
+
+
+def queue_collection():
+    return get_database()[SEARCH_QUEUE_COLLECTION]
+
+
+def _put_persistent(kind, op, pk):
+    key = _event_key(kind, op, pk)
+    # Re-queueing bumps the version so run_indexer never drops a newer event
+    queue_collection().update_one(
+        {'_id': f'{key[0]}:{key[1]}:{pk}'},
+        {'$set': {'kind': kind, 'op': op, 'pk': pk}, '$inc': {'version': 1}},
+        upsert=True,
+    )
+
+
+def enqueue(kind, op, pk):
+    if SEARCH_INDEX_MODE == 'mongo':
+        _put_persistent(kind, op, pk)
+    else:
+        local_queue.put(kind, op, pk)
+
+
+def enqueue_instance(instance, deleted=False):
+    """Queue a search update for a saved or deleted row of a searchable model."""
+    kind = SOURCE_KINDS.get(type(instance))
+    if kind is not None:
+        enqueue(kind, DELETE if deleted else UPSERT, instance.pk)
+
+
+def enqueue_children(model, parent):
+    """Queue a refresh of every ``model`` row under ``parent`` after a bulk write."""
+    kind = SOURCE_KINDS.get(model)
+    if kind is not None and SEARCH_SOURCES[kind].parent_field:
+        enqueue(kind, CHILDREN, parent.pk)
+
+
+def drain_persistent_queue(batch_size=SEARCH_QUEUE_BATCH_SIZE):
+    """
+    Apply one batch from the ``core_search_queue`` collection.
+
+    An event is removed only if its version is unchanged, so an edit queued
+    while the batch was running is picked up by the next one. Returns the
+    number of events applied.
+    """
+    collection = queue_collection()
+    rows = list(collection.find({}, {'kind': 1, 'op': 1, 'pk': 1, 'version': 1}).limit(batch_size))
+    if not rows:
+        return 0
+    _apply({_event_key(row['kind'], row['op'], row['pk']): row['op'] for row in rows})
+    collection.bulk_write([DeleteOne({'_id': row['_id'], 'version': row['version']}) for row in rows], ordered=False)
+    return len(rows)
@@ -0,0 +1,143 @@
+"""
+MongoDB indexes for the core collections.
+
+djongo does not reliably turn ``Meta.indexes`` and ``unique_together`` into
+MongoDB indexes, so :func:`ensure_indexes` creates them directly from the
+model declarations (idempotently, matching existing indexes by key pattern
+and uniqueness rather than by name) and :func:`unindexed_queries`
+asks MongoDB to ``explain`` the query shapes the views issue, reporting any
+that still scan a whole collection or sort in memory.
+"""
+from collections import namedtuple
+
+from bson import ObjectId
+from django.apps import apps
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from .models import (
+    GKEntry, GKQuestion, Pradesh, PradeshQA, Article, Category, ModelSet, ModelSetQuestion, ContactMessage,
+    Bookmark, Job, CurrentEvent, ObjectiveSet, ObjectiveMCQ, SubjectiveSubject, SubjectiveChapter, SubjectiveQA,
+    TestAttempt, AttemptDraft,
+)
+from .mongo import collection_for
+from .ordering import sort_keys
+
+IndexSpec = namedtuple('IndexSpec', ['name', 'keys', 'unique'])
+IndexResult = namedtuple('IndexResult', ['model', 'name', 'status', 'detail'], defaults=('',))
+QueryReport = namedtuple('QueryReport', ['view', 'model', 'stages'])
+
+_PLACEHOLDER_ID = ObjectId('000000000000000000000000')
+
+# (view, model, filter, sort) for the hot queries issued by the views;
+# values are placeholders, only the shape matters to the planner.
+VIEW_QUERIES = [
+    ('gk', GKEntry, {'type': 'nepal'}, [('_id', ASCENDING)]),
+    ('gk_detail', GKQuestion, {'entry_id': _PLACEHOLDER_ID}, None),
+    ('pradesh', Pradesh, {'province': 1}, [('_id', ASCENDING)]),
+    ('pradesh_detail', PradeshQA, {'pradesh_id': _PLACEHOLDER_ID}, None),
+    ('blog', Article, {'category': 'blog'}, [('_id', DESCENDING)]),
+    ('job_board', Job, {}, [('_id', DESCENDING)]),
+    ('manage_jobs', Job, {}, [('application_deadline', DESCENDING), ('_id', DESCENDING)]),
+    ('current_event', CurrentEvent, {}, [('_id', DESCENDING)]),
+    ('model_set_categories', Category, {}, [('name', ASCENDING), ('_id', ASCENDING)]),
+    ('model_sets_by_category', ModelSet, {'category_id': _PLACEHOLDER_ID}, None),
+    ('model_set_test', ModelSetQuestion, {'model_set_id': _PLACEHOLDER_ID}, [('_id', ASCENDING)]),
+    ('profile', ContactMessage, {'email': ''}, [('_id', DESCENDING)]),
+    ('bookmarks', Bookmark, {'user_id': 0, 'content_type_id': 0}, None),
+    ('my_bookmarks', Bookmark, {'user_id': 0}, [('id', DESCENDING)]),
+    ('objective_subject_detail', ObjectiveSet, {'subject_id': _PLACEHOLDER_ID}, None),
+    ('objective_set_detail', ObjectiveMCQ, {'set_id': _PLACEHOLDER_ID}, None),
+    ('subjectives', SubjectiveSubject, {}, [('name', ASCENDING), ('_id', ASCENDING)]),
+    ('subjective_chapters', SubjectiveChapter, {'subject_id': _PLACEHOLDER_ID}, [('_id', ASCENDING)]),
+    ('subjective_qas', SubjectiveQA, {'chapter_id': _PLACEHOLDER_ID}, [('_id', ASCENDING)]),
+    ('test_history', TestAttempt, {'user_id': 0}, [('submitted_at', DESCENDING)]),
+    ('model_set_test (resume)', AttemptDraft, {'user_id': 0, 'model_set_id': _PLACEHOLDER_ID}, None),
+]
+
+
+def index_specs(model):
+    """The MongoDB indexes declared by ``model``'s ``Meta.indexes`` and ``unique_together``."""
+    specs = [IndexSpec(index.name, sort_keys(model, index.fields), False) for index in model._meta.indexes]
+    for fields in model._meta.unique_together:
+        name = f"{model._meta.db_table}_{'_'.join(fields)}_uniq"
+        specs.append(IndexSpec(name, sort_keys(model, fields), True))
+    return specs
+
+
+def _same_keys(info, spec):
+    return [tuple(key) for key in info['key']] == [tuple(key) for key in spec.keys]
+
+
+def _matches(info, spec):
+    return _same_keys(info, spec) and bool(info.get('unique')) == spec.unique
+
+
+def ensure_indexes(models=None, dry_run=False):
+    """
+    Create every declared index that is missing and rebuild any that
+    conflict with it. An existing index with the declared keys and
+    uniqueness satisfies a declaration whatever its name; one that holds
+    the declared name or keys with different options is dropped and
+    recreated. Returns a list of :class:`IndexResult` (``ok``, ``created``,
+    ``rebuilt`` or ``failed``).
+    """
+    models = models or apps.get_app_config('core').get_models()
+    results = []
+    for model in models:
+        specs = index_specs(model)
+        if not specs:
+            continue
+        collection = collection_for(model)
+        existing = collection.index_information()
+        for spec in specs:
+            matching = [name for name, info in existing.items() if _matches(info, spec)]
+            if matching:
+                detail = '' if spec.name in matching else f'as {matching[0]}'
+                results.append(IndexResult(model, spec.name, 'ok', detail))
+                continue
+            # MongoDB rejects a second index on the same keys as well as a reused name
+            conflicts = [name for name, info in existing.items() if name != '_id_' and (name == spec.name or _same_keys(info, spec))]
+            status = 'rebuilt' if conflicts else 'created'
+            if dry_run:
+                results.append(IndexResult(model, spec.name, f'would be {status}'))
+                continue
+            try:
+                for name in conflicts:
+                    collection.drop_index(name)
+                    del existing[name]
+                collection.create_index(spec.keys, name=spec.name, unique=spec.unique)
+            except OperationFailure as e:
+                results.append(IndexResult(model, spec.name, 'failed', str(e)))
+                continue
+            existing[spec.name] = {'key': spec.keys, 'unique': spec.unique}
+            results.append(IndexResult(model, spec.name, status))
+    return results
+
+
+def _plan_stages(plan):
+    stages = [plan.get('stage')]
+    for child_key in ('inputStage', 'queryPlan'):
+        if child_key in plan:
+            stages += _plan_stages(plan[child_key])
+    for child in plan.get('inputStages', ()):
+        stages += _plan_stages(child)
+    return stages
+
+
+def unindexed_queries():
+    """
+    Explain each of :data:`VIEW_QUERIES` and return a :class:`QueryReport`
+    for those whose winning plan includes a ``COLLSCAN`` or in-memory
+    ``SORT`` stage.
+    """
+    reports = []
+    for view, model, criteria, sort in VIEW_QUERIES:
+        cursor = collection_for(model).find(criteria)
+        if sort:
+            cursor = cursor.sort(sort)
+        stages = _plan_stages(cursor.explain()['queryPlanner']['winningPlan'])
+        flagged = [stage for stage in stages if stage in ('COLLSCAN', 'SORT')]
+        if flagged:
+            reports.append(QueryReport(view, model, flagged))
+    return reports
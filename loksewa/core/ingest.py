@@ -0,0 +1,141 @@
+"""
+Bulk ingestion helpers for the admin content forms.
+
+Rows are validated in Python and written with a single bulk write per call
+instead of one ``objects.create`` round trip per row.
+"""
+from collections import namedtuple
+from contextlib import nullcontext
+from itertools import zip_longest
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.db import connections, transaction
+from pymongo import InsertOne, UpdateOne, DeleteMany
+
+from .mongo import collection_for
+from .signals import children_bulk_changed
+
+INGEST_BATCH_SIZE = 500
+
+IngestResult = namedtuple('IngestResult', ['inserted', 'skipped'])
+QADiff = namedtuple('QADiff', ['inserted', 'updated', 'deleted'])
+
+
+def _atomic(using):
+    """``transaction.atomic`` where the backend supports it (djongo does not)."""
+    if connections[using].features.supports_transactions:
+        return transaction.atomic(using=using)
+    return nullcontext()
+
+
+def bulk_ingest(model, rows, clean, batch_size=INGEST_BATCH_SIZE, using='default'):
+    """
+    Validate ``rows`` with ``clean`` and insert the survivors in bulk.
+
+    ``clean`` receives each raw row and returns the keyword arguments for a
+    ``model`` instance, or None to skip the row. ``rows`` may be a lazy
+    iterator: at most ``batch_size`` instances are held in memory before
+    they are flushed with one ``bulk_create``. Note that ``bulk_create``
+    does not send ``post_save`` signals.
+    """
+    manager = model.objects.using(using)
+    batch = []
+    inserted = skipped = 0
+    with _atomic(using):
+        for row in rows:
+            fields = clean(row)
+            if fields is None:
+                skipped += 1
+                continue
+            batch.append(model(**fields))
+            if len(batch) >= batch_size:
+                manager.bulk_create(batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            manager.bulk_create(batch)
+            inserted += len(batch)
+    return IngestResult(inserted, skipped)
+
+
+def ingest_qa_pairs(model, parent_field, parent, questions, answers, require_answer=False, strip=False):
+    """
+    Bulk insert question/answer pairs posted as parallel form lists.
+
+    Rows with a blank question (or a blank answer when ``require_answer``)
+    are skipped. ``strip`` trims surrounding whitespace before saving.
+    ``bulk_create`` sends no signals, so the parent's search index and
+    cached pages are notified through ``children_bulk_changed`` here.
+    """
+    def clean(pair):
+        question, answer = pair
+        if not question.strip() or (require_answer and not answer.strip()):
+            return None
+        if strip:
+            question, answer = question.strip(), answer.strip()
+        return {parent_field: parent, 'question': question, 'answer': answer}
+
+    result = bulk_ingest(model, zip_longest(questions, answers, fillvalue=''), clean)
+    if result.inserted:
+        children_bulk_changed.send(sender=model, parent=parent)
+    return result
+
+
+def _parse_id(value):
+    try:
+        return ObjectId(value) if value else None
+    except (InvalidId, TypeError):
+        return None
+
+
+def diff_qa_pairs(existing, ids, questions, answers):
+    """
+    Compare posted Q&A rows against ``existing`` (``{_id: (question, answer)}``).
+
+    Rows keep their ``_id`` through the hidden ``question_id`` input; rows
+    without a known id are new, and existing ids that were not posted (or
+    were posted with a blank question) are deleted. Returns
+    ``(inserts, updates, deletes)`` where ``inserts`` is a list of pairs,
+    ``updates`` maps ``_id`` to its new pair and ``deletes`` lists ``_id``s.
+    """
+    inserts = []
+    updates = {}
+    seen = set()
+    for raw_id, question, answer in zip_longest(ids, questions, answers, fillvalue=''):
+        if not question.strip():
+            continue
+        pk = _parse_id(raw_id)
+        if pk not in existing or pk in seen:
+            inserts.append((question, answer))
+            continue
+        seen.add(pk)
+        if existing[pk] != (question, answer):
+            updates[pk] = (question, answer)
+    deletes = [pk for pk in existing if pk not in seen]
+    return inserts, updates, deletes
+
+
+def apply_qa_diff(model, parent_field, parent, ids, questions, answers):
+    """
+    Sync ``parent``'s Q&A children with the posted rows.
+
+    One read fetches the current rows and a single unordered ``bulk_write``
+    applies the inserts, updates and deletes, so untouched rows keep their
+    ObjectIds and the write cost is proportional to what changed.
+    """
+    collection = collection_for(model)
+    parent_column = model._meta.get_field(parent_field).column
+    existing = {
+        row['_id']: (row.get('question', ''), row.get('answer', ''))
+        for row in collection.find({parent_column: parent.pk}, {'question': 1, 'answer': 1})
+    }
+    inserts, updates, deletes = diff_qa_pairs(existing, ids, questions, answers)
+    ops = [InsertOne({parent_column: parent.pk, 'question': q, 'answer': a}) for q, a in inserts]
+    ops += [UpdateOne({'_id': pk}, {'$set': {'question': q, 'answer': a}}) for pk, (q, a) in updates.items()]
+    if deletes:
+        ops.append(DeleteMany({'_id': {'$in': deletes}}))
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+        children_bulk_changed.send(sender=model, parent=parent)
+    return QADiff(len(inserts), len(updates), len(deletes))
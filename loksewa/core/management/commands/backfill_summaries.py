@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from pymongo import UpdateOne
+
+from core.models import Article, CurrentEvent
+from core.mongo import collection_for
+from core.pagecache import invalidate_groups
+from core.text import summarize
+
+# Model -> (body field the summary is derived from, page cache groups listing it)
+SUMMARY_SOURCES = {
+    Article: ('content', ['article_list']),
+    CurrentEvent: ('description', ['current_event_list']),
+}
+
+
+class Command(BaseCommand):
+    help = 'Recompute the excerpt, word count and reading time of every article and current event'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows updated per bulk write')
+        parser.add_argument('--dry-run', action='store_true', help='Count the rows without updating them')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        for model, (source, groups) in SUMMARY_SOURCES.items():
+            collection = collection_for(model)
+            if options['dry_run']:
+                self.stdout.write(f'Would update {collection.count_documents({})} {model._meta.verbose_name_plural}')
+                continue
+            column = model._meta.get_field(source).column
+            updated = 0
+            ops = []
+            for doc in collection.find({}, {column: 1}):
+                ops.append(UpdateOne({'_id': doc['_id']}, {'$set': summarize(doc.get(column))}))
+                if len(ops) >= batch_size:
+                    collection.bulk_write(ops, ordered=False)
+                    updated += len(ops)
+                    ops = []
+            if ops:
+                collection.bulk_write(ops, ordered=False)
+                updated += len(ops)
+            if updated:
+                # Written behind the ORM, so no save signal refreshes the listings
+                invalidate_groups(groups)
+            self.stdout.write(f'Updated {updated} {model._meta.verbose_name_plural}')
+        self.stdout.write(self.style.SUCCESS('Dry run complete' if options['dry_run'] else 'Summaries backfilled'))
@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from core import repository
+from core.models import (
+    GKEntry, GKQuestion, Pradesh, PradeshQA, SubjectiveChapter, SubjectiveQA, SubjectiveSubject,
+    ObjectiveSet, ModelSet, ModelSetQuestion,
+)
+from core.mongo import read_collection
+from core.pagination import paginate
+
+
+def _sample(model):
+    return read_collection(model).find_one()
+
+
+def _benchmarks():
+    """(page, ORM loader, repository loader) for every page with data to load."""
+    benchmarks = []
+    entry = _sample(GKEntry)
+    if entry:
+        request = RequestFactory().get('/gk/', {'tab': entry['type']})
+
+        def gk_orm():
+            page = paginate(request, GKEntry.objects.filter(type=entry['type']))
+            return [list(row.questions.all()) for row in page.object_list]
+
+        benchmarks.append(('gk', gk_orm, lambda: repository.gk_page(request, entry['type'])))
+        benchmarks.append((
+            'gk_detail',
+            lambda: (GKEntry.objects.get(_id=entry['_id']), list(GKQuestion.objects.filter(entry_id=entry['_id']))),
+            lambda: repository.gk_entry(entry['_id']),
+        ))
+    pradesh = _sample(Pradesh)
+    if pradesh:
+        benchmarks.append((
+            'pradesh_detail',
+            lambda: (Pradesh.objects.get(_id=pradesh['_id']), list(PradeshQA.objects.filter(pradesh_id=pradesh['_id']))),
+            lambda: repository.pradesh_detail(pradesh['_id']),
+        ))
+    chapter = _sample(SubjectiveChapter)
+    if chapter:
+        benchmarks.append((
+            'subjective_qas',
+            lambda: (
+                SubjectiveSubject.objects.get(_id=chapter['subject_id']),
+                SubjectiveChapter.objects.get(_id=chapter['_id'], subject_id=chapter['subject_id']),
+                list(SubjectiveQA.objects.filter(chapter_id=chapter['_id']).order_by('_id')),
+            ),
+            lambda: repository.subjective_chapter(chapter['subject_id'], chapter['_id']),
+        ))
+    obj_set = _sample(ObjectiveSet)
+    if obj_set:
+        def objective_orm():
+            row = ObjectiveSet.objects.get(_id=obj_set['_id'])
+            return row.subject, list(row.mcqs.all())
+
+        benchmarks.append(('objective_set_detail', objective_orm, lambda: repository.objective_set(obj_set['_id'])))
+    model_set = _sample(ModelSet)
+    if model_set:
+        benchmarks.append((
+            'model_set_test',
+            lambda: (ModelSet.objects.get(_id=model_set['_id']), list(ModelSetQuestion.objects.filter(model_set_id=model_set['_id']).order_by('_id'))),
+            lambda: (repository.model_set(model_set['_id']), repository.test_questions(model_set['_id'])),
+        ))
+    return benchmarks
+
+
+def _time(loader, iterations):
+    loader()  # warm up connections and caches
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        loader()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = 'Compare the djongo ORM and the PyMongo repository read paths of the hot public pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs per page and path')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        benchmarks = _benchmarks()
+        if not benchmarks:
+            raise CommandError('No content to benchmark; add some GK, Pradesh, subjective, objective or model set data first')
+        for page, orm_loader, repository_loader in benchmarks:
+            orm_ms = _time(orm_loader, options['iterations'])
+            repository_ms = _time(repository_loader, options['iterations'])
+            speedup = orm_ms / repository_ms if repository_ms else float('inf')
+            self.stdout.write(f'{page}: ORM {orm_ms:.2f} ms, repository {repository_ms:.2f} ms ({speedup:.1f}x)')
+        self.stdout.write(self.style.SUCCESS(f"Median of {options['iterations']} runs per page"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from core.search import SEARCH_BATCH_SIZE, rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the site-wide full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SEARCH_BATCH_SIZE, help='Documents written per insert')
+
+    def handle(self, *args, **options):
+        counts = rebuild_index(batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(
+            self.style.SUCCESS(f'Search index rebuilt with {sum(counts.values())} documents')
+        )
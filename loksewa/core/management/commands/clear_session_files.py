@@ -0,0 +1,48 @@
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SESSION_KEY_LENGTH = 32
+
+
+class Command(BaseCommand):
+    help = 'Delete session files left behind by the old file session engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', type=str, help='Session file directory (the temp directory the old engine used by default)')
+        parser.add_argument('--expired-only', action='store_true', help='Only delete files older than SESSION_COOKIE_AGE')
+        parser.add_argument('--dry-run', action='store_true', help='List what would be deleted without deleting it')
+
+    def handle(self, *args, **options):
+        path = options['path'] or tempfile.gettempdir()
+        prefix = settings.SESSION_COOKIE_NAME
+        cutoff = time.time() - settings.SESSION_COOKIE_AGE
+        try:
+            names = os.listdir(path)
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+        deleted = 0
+        for name in names:
+            # Same naming rule as django.contrib.sessions.backends.file
+            session_key = name[len(prefix):]
+            if not name.startswith(prefix) or len(session_key) != SESSION_KEY_LENGTH or not session_key.isalnum():
+                continue
+            file_path = os.path.join(path, name)
+            try:
+                if options['expired_only'] and os.path.getmtime(file_path) > cutoff:
+                    continue
+                if not options['dry_run']:
+                    os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.stderr.write(self.style.WARNING(f'Could not delete {file_path}: {e}'))
+                continue
+            deleted += 1
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {deleted} session files from {path}'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.indexes import ensure_indexes, unindexed_queries
+
+class Command(BaseCommand):
+    help = 'Create and verify the MongoDB indexes declared on the core models'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report missing indexes without creating them')
+        parser.add_argument('--skip-report', action='store_true', help='Do not explain the view queries afterwards')
+
+    def handle(self, *args, **options):
+        results = ensure_indexes(dry_run=options['dry_run'])
+        failed = pending = 0
+        for result in results:
+            label = f'{result.model._meta.db_table}.{result.name}'
+            if result.status == 'failed':
+                failed += 1
+                self.stderr.write(self.style.ERROR(f'{label}: failed ({result.detail})'))
+            elif result.status != 'ok':
+                if result.status.startswith('would be'):
+                    pending += 1
+                self.stdout.write(f'{label}: {result.status}')
+        summary = f'{len(results) - failed - pending} of {len(results)} declared indexes in place'
+        if pending:
+            summary += f', {pending} would be created or rebuilt'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+        if not options['skip_report']:
+            reports = unindexed_queries()
+            for report in reports:
+                self.stdout.write(self.style.WARNING(
+                    f"{report.view}: {report.model._meta.db_table} query uses {', '.join(report.stages)}"
+                ))
+            if not reports:
+                self.stdout.write(self.style.SUCCESS('All checked view queries are served by an index'))
+
+        if failed:
+            raise CommandError(f'{failed} indexes could not be created')
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from bson import ObjectId
+from bson.errors import InvalidId
+from core.models import ModelSet
+from core.importers import FORMATS, iter_rows, import_model_set_questions
+from core.ingest import INGEST_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Import MCQs into a model set from a CSV, JSON, JSON-lines or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('set_id', type=str, help='ObjectId of the model set')
+        parser.add_argument('path', type=str, help='File to import')
+        parser.add_argument('--format', choices=FORMATS, help='File format (detected from the extension by default)')
+        parser.add_argument('--batch-size', type=int, default=INGEST_BATCH_SIZE, help='Rows written per insert')
+
+    def handle(self, *args, **options):
+        try:
+            model_set = ModelSet.objects.get(_id=ObjectId(options['set_id']))
+        except (InvalidId, ModelSet.DoesNotExist):
+            raise CommandError(f"Model set {options['set_id']} does not exist")
+
+        try:
+            with open(options['path'], 'rb') as f:
+                rows = iter_rows(f, options['path'], options['format'])
+                report = import_model_set_questions(model_set, rows, batch_size=options['batch_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Import failed: {e}')
+
+        for line_no, error in report.errors:
+            self.stderr.write(self.style.WARNING(f'Line {line_no}: {error}'))
+        self.stdout.write(
+            self.style.SUCCESS(f'Imported {report.inserted} questions into "{model_set.title}" ({len(report.errors)} rows rejected)')
+        )
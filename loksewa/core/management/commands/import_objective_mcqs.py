@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from bson import ObjectId
+from bson.errors import InvalidId
+from core.models import ObjectiveSet
+from core.importers import FORMATS, iter_rows, iter_pasted, import_objective_mcqs
+from core.ingest import INGEST_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Import MCQs into an objective set from a CSV, JSON, JSON-lines, XLSX or pasted-text file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('set_id', type=str, help='ObjectId of the objective set')
+        parser.add_argument('path', type=str, help='File to import')
+        parser.add_argument('--format', choices=FORMATS + ('text',), help='File format (detected from the extension by default; "text" for pasted blocks)')
+        parser.add_argument('--batch-size', type=int, default=INGEST_BATCH_SIZE, help='Rows written per insert')
+
+    def handle(self, *args, **options):
+        try:
+            obj_set = ObjectiveSet.objects.get(_id=ObjectId(options['set_id']))
+        except (InvalidId, ObjectiveSet.DoesNotExist):
+            raise CommandError(f"Objective set {options['set_id']} does not exist")
+
+        fmt = options['format']
+        if fmt is None and options['path'].lower().endswith('.txt'):
+            fmt = 'text'
+        try:
+            if fmt == 'text':
+                with open(options['path'], encoding='utf-8-sig') as f:
+                    report = import_objective_mcqs(obj_set, iter_pasted(f.read()), batch_size=options['batch_size'])
+            else:
+                with open(options['path'], 'rb') as f:
+                    rows = iter_rows(f, options['path'], fmt)
+                    report = import_objective_mcqs(obj_set, rows, batch_size=options['batch_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Import failed: {e}')
+
+        for line_no, error in report.errors:
+            self.stderr.write(self.style.WARNING(f'Line {line_no}: {error}'))
+        self.stdout.write(
+            self.style.SUCCESS(f'Imported {report.inserted} MCQs into "{obj_set.title}" ({report.duplicates} duplicates skipped, {len(report.errors)} rows rejected)')
+        )
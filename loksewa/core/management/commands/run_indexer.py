@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from core.indexer import SEARCH_QUEUE_BATCH_SIZE, drain_persistent_queue
+
+class Command(BaseCommand):
+    help = 'Apply queued search index updates (SEARCH_INDEX_MODE = "mongo")'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SEARCH_QUEUE_BATCH_SIZE, help='Events applied per index write')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                applied = drain_persistent_queue(options['batch_size'])
+                total += applied
+                if applied:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Applied {total} search index updates'))
@@ -0,0 +1,33 @@
+import django.db.models.deletion
+import djongo.models.fields
+from django.conf import settings
+from django.db import migrations, models
+
+import core.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestAttempt',
+            fields=[
+                ('_id', djongo.models.fields.ObjectIdField(auto_created=True, primary_key=True, serialize=False)),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('elapsed_seconds', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('submitted_at', models.DateTimeField(auto_now_add=True)),
+                ('answers', djongo.models.fields.ArrayField(default=list, model_container=core.models.AttemptAnswer)),
+                ('model_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='core.modelset')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='test_attempts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-submitted_at'], name='attempt_user_idx'), models.Index(fields=['model_set', '-submitted_at'], name='attempt_model_set_idx')],
+            },
+        ),
+    ]
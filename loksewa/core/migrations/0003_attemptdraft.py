@@ -0,0 +1,29 @@
+import django.db.models.deletion
+import djongo.models.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_testattempt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttemptDraft',
+            fields=[
+                ('_id', djongo.models.fields.ObjectIdField(auto_created=True, primary_key=True, serialize=False)),
+                ('started_at', models.FloatField()),
+                ('deadline', models.FloatField(blank=True, null=True)),
+                ('answers', djongo.models.fields.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('model_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempt_drafts', to='core.modelset')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempt_drafts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'model_set')},
+            },
+        ),
+    ]
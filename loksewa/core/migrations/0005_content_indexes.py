@@ -0,0 +1,59 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_bookmark_object_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gkentry',
+            index=models.Index(fields=['type', '_id'], name='gkentry_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gkquestion',
+            index=models.Index(fields=['entry'], name='gkquestion_entry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['category', '_id'], name='article_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pradesh',
+            index=models.Index(fields=['province', '_id'], name='pradesh_province_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pradeshqa',
+            index=models.Index(fields=['pradesh'], name='pradeshqa_pradesh_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelset',
+            index=models.Index(fields=['category'], name='modelset_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelsetquestion',
+            index=models.Index(fields=['model_set', '_id'], name='modelsetq_model_set_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['email'], name='contact_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='objectiveset',
+            index=models.Index(fields=['subject'], name='objset_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='objectivemcq',
+            index=models.Index(fields=['set'], name='objmcq_set_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectivechapter',
+            index=models.Index(fields=['subject'], name='subjchapter_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectiveqa',
+            index=models.Index(fields=['chapter'], name='subjqa_chapter_idx'),
+        ),
+    ]
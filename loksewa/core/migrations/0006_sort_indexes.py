@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_content_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contactmessage',
+            name='contact_email_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['email', '_id'], name='contact_email_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='subjectivechapter',
+            name='subjchapter_subject_idx',
+        ),
+        migrations.AddIndex(
+            model_name='subjectivechapter',
+            index=models.Index(fields=['subject', '_id'], name='subjchapter_subject_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='subjectiveqa',
+            name='subjqa_chapter_idx',
+        ),
+        migrations.AddIndex(
+            model_name='subjectiveqa',
+            index=models.Index(fields=['chapter', '_id'], name='subjqa_chapter_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-application_deadline', '-_id'], name='job_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['name', '_id'], name='category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectivesubject',
+            index=models.Index(fields=['name', '_id'], name='subjsubject_name_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+import html
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from pymongo import UpdateOne
+
+# Frozen copy of the excerpt rules at the time of this migration, so later
+# changes to core.text do not change what it writes
+EXCERPT_WORDS = 40
+
+
+def make_excerpt(value):
+    text = re.sub(r'\s+', ' ', html.unescape(strip_tags(value or ''))).strip()
+    return Truncator(text).words(EXCERPT_WORDS)
+
+
+def fill_excerpts(apps, schema_editor):
+    database = schema_editor.connection.connection
+    for model_name, source in (('article', 'content'), ('currentevent', 'description')):
+        collection = database[apps.get_model('core', model_name)._meta.db_table]
+        ops = [
+            UpdateOne({'_id': doc['_id']}, {'$set': {'excerpt': make_excerpt(doc.get(source))}})
+            for doc in collection.find({}, {source: 1})
+        ]
+        if ops:
+            collection.bulk_write(ops, ordered=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='currentevent',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
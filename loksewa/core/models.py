@@ -3,6 +3,8 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
+from .text import apply_summary
+
 # Create your models here.
 
 class User(AbstractUser):
@@ -39,6 +41,11 @@ class GKEntry(models.Model):
     document = models.FileField(upload_to='gk/docs/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['type', '_id'], name='gkentry_type_idx'),
+        ]
+
     @property
     def mongoid(self):
         return str(self._id)
@@ -49,6 +56,11 @@ class GKQuestion(models.Model):
     question = models.TextField()
     answer = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['entry'], name='gkquestion_entry_idx'),
+        ]
+
     @property
     def mongoid(self):
         return str(self._id)
@@ -67,6 +79,19 @@ class Article(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     image = models.ImageField(upload_to='blog/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Derived from content on save
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)  # minutes
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', '_id'], name='article_category_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        kwargs['update_fields'] = apply_summary(self, 'content', kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
 
     def get_absolute_url(self):  # noqa: A003
         return f"/blog/{self.pk}/"
@@ -91,6 +116,11 @@ class Pradesh(models.Model):
     document = models.FileField(upload_to='pradesh/docs/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['province', '_id'], name='pradesh_province_idx'),
+        ]
+
     def __str__(self):
         return f"{self.get_province_display()} - {self.title}"
 
@@ -104,6 +134,11 @@ class PradeshQA(models.Model):
     question = models.TextField()
     answer = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['pradesh'], name='pradeshqa_pradesh_idx'),
+        ]
+
     def __str__(self):
         return f"Q: {self.question[:30]}..." if self.question else "Q: ..."
 
@@ -116,6 +151,11 @@ class Category(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', '_id'], name='category_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -134,6 +174,11 @@ class ModelSet(models.Model):
     file = models.FileField(upload_to='model_sets/', blank=True, null=True)
     interactive_url = models.URLField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['category'], name='modelset_category_idx'),
+        ]
+
     def get_absolute_url(self):  # noqa: A003
         return f"/model-sets/{self.pk}/"
 
@@ -157,6 +202,11 @@ class ModelSetQuestion(models.Model):
     ])
     explanation = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_set', '_id'], name='modelsetq_model_set_idx'),
+        ]
+
     def __str__(self):
         return self.question_text[:50]
 
@@ -207,6 +257,11 @@ class ContactMessage(models.Model):
     sent_at = models.DateTimeField(auto_now_add=True)
     reply = models.TextField(blank=True, null=True)  # Admin reply
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['email', '_id'], name='contact_email_idx'),
+        ]
+
     @property
     def mongoid(self):
         return str(self._id)
@@ -214,12 +269,15 @@ class ContactMessage(models.Model):
 class Bookmark(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
-    object_id = models.PositiveIntegerField()
+    object_id = models.CharField(max_length=24)  # str(ObjectId) of the bookmarked document
     content_object = GenericForeignKey('content_type', 'object_id')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ('user', 'content_type', 'object_id')
+        indexes = [
+            models.Index(fields=['user', '-id'], name='bookmark_user_idx'),
+        ]
 
 class Job(models.Model):
     _id = models.ObjectIdField(primary_key=True)
@@ -236,6 +294,11 @@ class Job(models.Model):
     location = models.CharField(max_length=200)
     posted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-application_deadline', '-_id'], name='job_deadline_idx'),
+        ]
+
     @property
     def mongoid(self):
         return str(self._id)
@@ -266,6 +329,11 @@ class ObjectiveSet(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['subject'], name='objset_subject_idx'),
+        ]
+
     def __str__(self):
         return f"{self.subject.name} - {self.title}"
 
@@ -291,6 +359,11 @@ class ObjectiveMCQ(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['set'], name='objmcq_set_idx'),
+        ]
+
     def __str__(self):
         return f"{self.set.title} - Q{self.question[:50]}..."
 
@@ -305,6 +378,14 @@ class CurrentEvent(models.Model):
     image = models.ImageField(upload_to='current_events/images/', blank=True, null=True)
     document = models.FileField(upload_to='current_events/docs/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Derived from description on save
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)  # minutes
+
+    def save(self, *args, **kwargs):
+        kwargs['update_fields'] = apply_summary(self, 'description', kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return f"/current-event/{self.pk}/"
@@ -319,6 +400,11 @@ class SubjectiveSubject(models.Model):
     name = models.CharField(max_length=200)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', '_id'], name='subjsubject_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -332,6 +418,11 @@ class SubjectiveChapter(models.Model):
     name = models.CharField(max_length=200)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['subject', '_id'], name='subjchapter_subject_idx'),
+        ]
+
     def __str__(self):
         return f"{self.subject.name} - {self.name}"
 
@@ -346,6 +437,11 @@ class SubjectiveQA(models.Model):
     answer = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['chapter', '_id'], name='subjqa_chapter_idx'),
+        ]
+
     def __str__(self):
         return f"Q: {self.question[:50]}..."
 
@@ -353,4 +449,57 @@ class SubjectiveQA(models.Model):
     def mongoid(self):
         return str(self._id)
 
+# Model set test attempts
+class AttemptAnswer(models.Model):
+    question_id = models.CharField(max_length=24)
+    answer = models.CharField(max_length=1, blank=True)
+    is_correct = models.BooleanField(default=False)
+
+    class Meta:
+        abstract = True
+
+class TestAttempt(models.Model):
+    """A submitted model set test; answers are embedded so a submit is one insert."""
+    _id = models.ObjectIdField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='test_attempts')
+    model_set = models.ForeignKey(ModelSet, on_delete=models.CASCADE, related_name='attempts')
+    score = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    elapsed_seconds = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    submitted_at = models.DateTimeField(auto_now_add=True)
+    answers = models.ArrayField(model_container=AttemptAnswer, default=list)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-submitted_at'], name='attempt_user_idx'),
+            models.Index(fields=['model_set', '-submitted_at'], name='attempt_model_set_idx'),
+        ]
 
+    def __str__(self):
+        return f"{self.user.username} - {self.model_set.title} ({self.score}/{self.total})"
+
+    @property
+    def percent(self):
+        return (self.score / self.total) * 100 if self.total else 0
+
+    @property
+    def mongoid(self):
+        return str(self._id)
+
+class AttemptDraft(models.Model):
+    """In-progress answers for a timed test, flushed periodically from the autosave cache."""
+    _id = models.ObjectIdField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attempt_drafts')
+    model_set = models.ForeignKey(ModelSet, on_delete=models.CASCADE, related_name='attempt_drafts')
+    started_at = models.FloatField()
+    deadline = models.FloatField(null=True, blank=True)
+    answers = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'model_set')
+
+    @property
+    def mongoid(self):
+        return str(self._id)
@@ -0,0 +1,63 @@
+"""
+Direct access to the MongoDB database behind the djongo connection.
+
+djongo's connection object wraps a PyMongo ``Database``; these helpers hand
+it out so hot paths can talk to MongoDB without going through the SQL
+translation layer.
+
+Django opens one connection (and so one ``MongoClient``) per thread.
+Read-only paths that do not need to share that connection's state can use
+:func:`read_database` instead, which hands out one pooled ``MongoClient``
+per process for every thread.
+"""
+import os
+import threading
+
+from django.conf import settings
+from django.db import connections
+from pymongo import MongoClient
+
+MONGO_MAX_POOL_SIZE = getattr(settings, 'MONGO_MAX_POOL_SIZE', 100)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_database(alias='default'):
+    """Return the PyMongo ``Database`` used by the djongo connection ``alias``."""
+    connection = connections[alias]
+    connection.ensure_connection()
+    return connection.connection
+
+
+def collection_for(model, alias='default'):
+    """Return the PyMongo collection that stores ``model``."""
+    return get_database(alias)[model._meta.db_table]
+
+
+def shared_client(alias='default'):
+    """
+    Return the process-wide pooled ``MongoClient`` for database ``alias``.
+
+    The client is built lazily from the same ``CLIENT`` options djongo uses,
+    and rebuilt after a fork since a ``MongoClient`` must not cross one.
+    """
+    pid = os.getpid()
+    entry = _clients.get(alias)
+    if entry is None or entry[0] != pid:
+        with _clients_lock:
+            entry = _clients.get(alias)
+            if entry is None or entry[0] != pid:
+                options = dict(settings.DATABASES[alias].get('CLIENT', {}))
+                options.setdefault('maxPoolSize', MONGO_MAX_POOL_SIZE)
+                entry = _clients[alias] = (pid, MongoClient(connect=False, **options))
+    return entry[1]
+
+
+def read_database(alias='default'):
+    """The database ``alias`` on the shared client, for read-only queries."""
+    return shared_client(alias)[settings.DATABASES[alias]['NAME']]
+
+
+def read_collection(model, alias='default'):
+    return read_database(alias)[model._meta.db_table]
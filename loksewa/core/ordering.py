@@ -0,0 +1,87 @@
+"""
+Server-side ordering for listings, sorted natively by MongoDB.
+
+djongo's SQL translation of ``ORDER BY`` is what the views used to work
+around by dropping ``order_by`` altogether, leaving rows in whatever order
+the collection returned them. :func:`ordered` sends the filter and sort
+straight to PyMongo instead and turns the documents back into model
+instances, so related managers, properties and templates keep working.
+
+Every sort used here has an index to walk (see ``Meta.indexes`` and
+:data:`core.indexes.VIEW_QUERIES`). Newest-first listings sort on ``_id``:
+an ObjectId starts with its creation time, so it orders rows the way
+``created_at`` would without a second index.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import models
+from pymongo import ASCENDING, DESCENDING
+
+from .mongo import collection_for
+
+NEWEST_FIRST = ('-_id',)
+OLDEST_FIRST = ('_id',)
+
+
+def sort_keys(model, fields):
+    """PyMongo key list for Django-style ``fields`` (``'-name'`` for descending)."""
+    keys = []
+    for field_name in fields:
+        direction = DESCENDING if field_name.startswith('-') else ASCENDING
+        keys.append((model._meta.get_field(field_name.lstrip('-')).column, direction))
+    return keys
+
+
+def _from_mongo(field, value):
+    if value is None:
+        return None
+    if isinstance(field, models.DateTimeField):
+        # PyMongo hands back naive UTC datetimes
+        if settings.USE_TZ and value.tzinfo is None:
+            return value.replace(tzinfo=datetime.timezone.utc)
+        return value
+    if isinstance(field, models.DateField) and isinstance(value, datetime.datetime):
+        # BSON has no date type; djongo stores dates as midnight datetimes
+        return value.date()
+    return value
+
+
+def _load_fields(model, only):
+    if only is None:
+        return model._meta.concrete_fields
+    names = {model._meta.pk.name, *only}
+    return [field for field in model._meta.concrete_fields if field.name in names]
+
+
+def hydrate(model, document, alias='default', only=None):
+    """
+    Build a ``model`` instance from a raw MongoDB ``document``. With
+    ``only``, the other fields are deferred as with ``QuerySet.only()``.
+    """
+    fields = _load_fields(model, only)
+    values = [
+        _from_mongo(field, document[field.column]) if field.column in document else field.get_default()
+        for field in fields
+    ]
+    return model.from_db(alias, [field.attname for field in fields], values)
+
+
+def ordered(model, ordering, criteria=None, limit=None, only=None, alias='default'):
+    """
+    Return the ``model`` rows matching ``criteria`` (a MongoDB filter keyed
+    by column, e.g. ``{'chapter_id': pk}``) sorted by ``ordering``.
+
+    ``ordering`` takes Django-style field names; ``_id`` is appended as a
+    tie-breaker so rows with equal sort keys keep a stable order. ``only``
+    names the fields to load, the way ``QuerySet.only()`` does; the rest
+    are left out of the query's projection.
+    """
+    keys = sort_keys(model, ordering)
+    if keys[-1][0] != '_id':
+        keys.append(('_id', keys[-1][1]))
+    projection = {field.column: 1 for field in _load_fields(model, only)} if only is not None else None
+    cursor = collection_for(model, alias).find(criteria or {}, projection).sort(keys)
+    if limit:
+        cursor = cursor.limit(limit)
+    return [hydrate(model, document, alias, only) for document in cursor]
@@ -0,0 +1,188 @@
+"""
+Cached HTML fragments for the read-heavy public content pages.
+
+A page's content block is rendered once into a fragment template under
+``templates/fragments/`` and kept in the cache; the outer template (nav,
+CSRF token, user menu) is still rendered per request around it. Fragment
+keys combine the view, its parameters, the viewer variant and the current
+version of every *group* the page depends on (:data:`PAGE_GROUPS`).
+Saving or deleting a model bumps the versions of its groups (see
+:data:`OBJECT_GROUPS` and the handlers in :mod:`core.signals`), so an edit
+is visible on the next request and the orphaned fragments simply expire.
+
+Versions embed the time they were issued, which gives
+:mod:`core.conditional` a Last-Modified for each page without a query.
+They expire after ``PAGE_VERSION_TTL``; a lost version only means the
+page's next request renders afresh under a new one.
+
+Only a shared cache sees every worker's invalidations, so with a
+process-local one (see :func:`core.caches.cache_is_shared`) fragments are
+rendered on every request instead of cached.
+"""
+import datetime
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .caches import cache_is_shared
+from .models import (
+    GKEntry, GKQuestion, Pradesh, PradeshQA, Article, CurrentEvent,
+    SubjectiveSubject, SubjectiveChapter, SubjectiveQA, ObjectiveSubject, ObjectiveSet, ObjectiveMCQ,
+)
+from .pagination import paginate, page_json, wants_json
+
+PAGE_CACHE_TTL = getattr(settings, 'PAGE_CACHE_TTL', 60 * 60 * 24)
+# Versions must outlive the fragments keyed by them
+PAGE_VERSION_TTL = getattr(settings, 'PAGE_VERSION_TTL', PAGE_CACHE_TTL * 2)
+
+# View name -> groups its output depends on, from the view's URL kwargs
+PAGE_GROUPS = {
+    'gk': lambda: ['gk_list'],
+    'pradesh': lambda: ['pradesh_list'],
+    'blog': lambda: ['article_list'],
+    'current_event': lambda: ['current_event_list'],
+    'gk_detail': lambda pk: [f'gk:{pk}'],
+    'pradesh_detail': lambda pk: [f'pradesh:{pk}'],
+    'blog_detail': lambda pk: [f'article:{pk}'],
+    'current_event_detail': lambda pk: [f'current_event:{pk}'],
+    'subjective_qas': lambda subject_id, chapter_id: [f'subjective_subject:{subject_id}', f'subjective_chapter:{chapter_id}'],
+    # Set pages show the subject name; subjects are renamed rarely enough to share one group
+    'objective_set_detail': lambda set_id: ['objective_subjects', f'objective_set:{set_id}'],
+}
+
+# Parent model's groups, by the parent's primary key; used for a child's
+# own saves and for bulk writes of a parent's children.
+CHILD_GROUPS = {
+    GKQuestion: ('entry', lambda pk: ['gk_list', f'gk:{pk}']),
+    PradeshQA: ('pradesh', lambda pk: [f'pradesh:{pk}']),
+    SubjectiveQA: ('chapter', lambda pk: [f'subjective_chapter:{pk}']),
+    ObjectiveMCQ: ('set', lambda pk: [f'objective_set:{pk}']),
+}
+
+# Model -> groups touched when one of its rows is saved or deleted
+OBJECT_GROUPS = {
+    GKEntry: lambda obj: ['gk_list', f'gk:{obj.pk}'],
+    Pradesh: lambda obj: ['pradesh_list', f'pradesh:{obj.pk}'],
+    Article: lambda obj: ['article_list', f'article:{obj.pk}'],
+    CurrentEvent: lambda obj: ['current_event_list', f'current_event:{obj.pk}'],
+    SubjectiveSubject: lambda obj: [f'subjective_subject:{obj.pk}'],
+    SubjectiveChapter: lambda obj: [f'subjective_chapter:{obj.pk}'],
+    ObjectiveSubject: lambda obj: ['objective_subjects'],
+    ObjectiveSet: lambda obj: [f'objective_set:{obj.pk}'],
+}
+for _model, (_field, _groups) in CHILD_GROUPS.items():
+    OBJECT_GROUPS[_model] = lambda obj, field=_field, groups=_groups: groups(getattr(obj, f'{field}_id'))
+
+
+def _group_key(group):
+    return f'core:page_group:{group}'
+
+
+def _new_version():
+    return f'{time.time_ns()}-{uuid.uuid4().hex[:12]}'
+
+
+def version_time(version):
+    """When ``version`` was issued, as an aware UTC datetime."""
+    return datetime.datetime.fromtimestamp(int(version.split('-')[0]) / 1e9, tz=datetime.timezone.utc)
+
+
+def page_groups(view_name, **kwargs):
+    return PAGE_GROUPS[view_name](**{key: str(value) for key, value in kwargs.items()})
+
+
+def group_versions(groups):
+    """Current version of each group, creating missing ones."""
+    keys = [_group_key(group) for group in groups]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, PAGE_VERSION_TTL)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate_groups(groups):
+    # Fresh unique versions rather than counters: an evicted counter restarting
+    # at 1 could otherwise resurrect fragments cached under an old version
+    if groups:
+        cache.set_many({_group_key(group): _new_version() for group in groups}, PAGE_VERSION_TTL)
+
+
+def invalidate_object(instance):
+    groups = OBJECT_GROUPS.get(type(instance))
+    if groups is not None:
+        invalidate_groups(groups(instance))
+
+
+def invalidate_children(model, parent_pk):
+    if model in CHILD_GROUPS:
+        invalidate_groups(CHILD_GROUPS[model][1](parent_pk))
+
+
+def viewer_variant(request, per_user):
+    if not request.user.is_authenticated:
+        return 'anon'
+    return f'user:{request.user.pk}' if per_user else 'auth'
+
+
+def cached_fragment(request, view_name, kwargs, build, per_user=False, params=None):
+    """
+    Return the cached context for ``view_name`` called with URL ``kwargs``,
+    building it on a miss.
+
+    ``build`` returns a dict whose ``'fragment'`` entry is the rendered
+    content HTML (plus any small values the outer template needs, such as a
+    title). Anonymous and signed-in viewers get separate entries; pass
+    ``per_user`` when the fragment itself differs per user. Exceptions such
+    as Http404 propagate and nothing is cached. ``params`` adds query
+    string values to the key. Without a shared cache ``build`` runs on
+    every call.
+    """
+    if cache_is_shared():
+        versions = group_versions(page_groups(view_name, **kwargs))
+        params = dict(kwargs, **(params or {}))
+        raw = repr((view_name, sorted((key, str(value)) for key, value in params.items()), viewer_variant(request, per_user), versions))
+        key = f'core:page:{view_name}:{hashlib.md5(raw.encode()).hexdigest()}'
+        context = cache.get(key)
+        if context is None:
+            context = build()
+            cache.set(key, context, PAGE_CACHE_TTL)
+    else:
+        context = build()
+    context = dict(context)
+    context['fragment'] = mark_safe(context['fragment'])
+    return context
+
+
+def render_fragment(template_name, context):
+    """Render a user-independent content fragment (no request, so no CSRF token or user)."""
+    return render_to_string(f'fragments/{template_name}', context)
+
+
+def render_cached_listing(request, view_name, template_name, queryset, context_name, fields, extra_context=None, fetch_page=None):
+    """
+    Cached counterpart of :func:`core.pagination.render_listing`.
+
+    The whole query string (filters and cursor) is part of the key; JSON
+    clients are served uncached. ``fetch_page(request)`` replaces paging
+    through ``queryset`` for the HTML page, e.g. with a
+    :mod:`core.repository` query; JSON clients still get model fields.
+    """
+    if wants_json(request):
+        return page_json(paginate(request, queryset), fields)
+
+    def build():
+        page = fetch_page(request) if fetch_page is not None else paginate(request, queryset)
+        context = {context_name: page.object_list, 'page': page}
+        context.update(extra_context or {})
+        return {'fragment': render_fragment(template_name, context)}
+
+    params = {key: request.GET.getlist(key) for key in request.GET}
+    return render(request, template_name, cached_fragment(request, view_name, {}, build, params=params))
@@ -0,0 +1,141 @@
+"""
+Keyset pagination for the public listing views.
+
+Pages walk a collection on its ObjectId primary key (``_id > cursor``, or
+``_id < cursor`` for newest-first listings) so MongoDB never has to skip
+over or count documents, no matter how deep the reader goes. The same page
+can be rendered as HTML or returned as JSON for "load more" style clients
+(``?cursor=<id>&format=json``).
+"""
+import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.http import JsonResponse
+from django.shortcuts import render
+
+DEFAULT_PAGE_SIZE = getattr(settings, 'LISTING_PAGE_SIZE', 20)
+MAX_PAGE_SIZE = getattr(settings, 'LISTING_MAX_PAGE_SIZE', 100)
+
+
+class KeysetPage:
+    """One page of a listing plus the cursor needed to fetch the next one."""
+
+    def __init__(self, object_list, cursor, next_cursor, query_params):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def next_query(self):
+        """Query string for the next page, keeping filters such as ``tab`` or ``q``."""
+        params = self._query_params.copy()
+        params['cursor'] = self.next_cursor
+        params.pop('format', None)
+        return params.urlencode()
+
+    @property
+    def first_query(self):
+        params = self._query_params.copy()
+        params.pop('cursor', None)
+        params.pop('format', None)
+        return params.urlencode()
+
+
+def parse_cursor(value):
+    """Return the ObjectId encoded in ``value`` or None if it is missing/invalid."""
+    if not value:
+        return None
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def get_page_size(request, default=None):
+    """Read ``?limit=`` from the request, clamped to ``MAX_PAGE_SIZE``."""
+    default = default or DEFAULT_PAGE_SIZE
+    try:
+        size = int(request.GET.get('limit', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def paginate(request, queryset, page_size=None, newest_first=False):
+    """
+    Fetch one page of ``queryset`` after the ``?cursor=`` ObjectId.
+
+    One extra row is read to find out whether a next page exists, so no
+    ``count()`` is ever issued. ``newest_first`` walks ``_id`` downwards,
+    which lists rows by creation time since an ObjectId starts with it.
+    """
+    size = get_page_size(request, page_size)
+    cursor = parse_cursor(request.GET.get('cursor'))
+    if cursor is not None:
+        queryset = queryset.filter(_id__lt=cursor) if newest_first else queryset.filter(_id__gt=cursor)
+    rows = list(queryset.order_by('-_id' if newest_first else '_id')[:size + 1])
+    next_cursor = str(rows[size - 1]._id) if len(rows) > size else None
+    return KeysetPage(rows[:size], cursor, next_cursor, request.GET)
+
+
+def wants_json(request):
+    if request.GET.get('format') == 'json':
+        return True
+    return 'application/json' in request.headers.get('Accept', '')
+
+
+def serialize(obj, fields):
+    """Flatten ``obj`` into a JSON-safe dict holding its id and ``fields``."""
+    data = {'id': str(obj.pk)}
+    for name in fields:
+        value = getattr(obj, name)
+        if isinstance(value, FieldFile):
+            value = value.url if value else None
+        elif isinstance(value, ObjectId):
+            value = str(value)
+        elif isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+        data[name] = value
+    return data
+
+
+def page_json(page, fields):
+    return JsonResponse({
+        'results': [serialize(obj, fields) for obj in page.object_list],
+        'next_cursor': page.next_cursor,
+    })
+
+
+def render_listing(request, template_name, queryset, context_name, fields, extra_context=None, page_size=None, annotate=None, newest_first=False):
+    """
+    Render one keyset page of ``queryset``.
+
+    The page is exposed to the template under ``context_name`` (so existing
+    ``{% for %}`` loops keep working) and as ``page`` for the navigation
+    links. JSON clients get ``{"results": [...], "next_cursor": ...}``.
+    ``annotate`` is called with the page's rows to attach precomputed
+    attributes before rendering.
+    """
+    page = paginate(request, queryset, page_size, newest_first)
+    if annotate is not None:
+        annotate(page.object_list)
+    if wants_json(request):
+        return page_json(page, fields)
+    context = {context_name: page.object_list, 'page': page}
+    if extra_context:
+        context.update(extra_context)
+    return render(request, template_name, context)
@@ -0,0 +1,209 @@
+"""
+Per-request accounting of MongoDB operations, for development and CI.
+
+Every command PyMongo sends, whether djongo issued it for an ORM query or
+a view issued it through :mod:`core.mongo`, is reported to the command
+listener installed by :func:`install_listener`. While a
+:class:`QueryRecorder` is active in the current context, each command is
+recorded with its *shape*: command name, collection and filter with every
+value replaced by ``?``. The same shape issued again and again within one
+request is the signature of an N+1 loop.
+
+:class:`QueryCountMiddleware` records each request when
+``QUERY_COUNT_ENABLED`` (``DEBUG`` by default). It logs N+1 candidates and
+overruns of the budget a view declares with :func:`query_budget`, and
+sets an ``X-Query-Count`` header. Tests use :func:`assert_max_queries` or
+:func:`assert_view_budget` to fail when a view goes over budget.
+"""
+import logging
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import resolve
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_ENABLED = getattr(settings, 'QUERY_COUNT_ENABLED', settings.DEBUG)
+# Raise instead of logging when a view goes over its declared budget
+QUERY_BUDGET_STRICT = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+# Identical query shapes per request before they are reported as N+1
+NPLUSONE_THRESHOLD = getattr(settings, 'QUERY_NPLUSONE_THRESHOLD', 5)
+
+# Connection handshakes and cursor continuations are not queries of their own
+IGNORED_COMMANDS = frozenset({
+    'hello', 'ismaster', 'isMaster', 'ping', 'buildInfo', 'saslStart', 'saslContinue',
+    'getMore', 'killCursors', 'endSessions',
+})
+
+QueryEvent = namedtuple('QueryEvent', ['command', 'collection', 'shape'])
+
+_recorders = ContextVar('query_recorders', default=())
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def _shape(value):
+    """``value`` with every scalar replaced by ``?``; lists collapse to one element."""
+    if isinstance(value, dict):
+        return {key: _shape(value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        return [_shape(value[0])] if value else []
+    return '?'
+
+
+def _query_parts(command_name, command):
+    """The part of ``command`` that identifies the query, minus its values."""
+    if command_name in ('find', 'count', 'distinct', 'findAndModify'):
+        return command.get('query', command.get('filter', {}))
+    if command_name == 'aggregate':
+        return command.get('pipeline', [])
+    if command_name == 'update':
+        return [update.get('q', {}) for update in command.get('updates', [])[:1]]
+    if command_name == 'delete':
+        return [delete.get('q', {}) for delete in command.get('deletes', [])[:1]]
+    return {}
+
+
+class QueryListener(monitoring.CommandListener):
+    """Record started commands into every recorder active in the calling context."""
+
+    def started(self, event):
+        recorders = _recorders.get()
+        if not recorders or event.command_name in IGNORED_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = ''
+        shape = repr(_shape(_query_parts(event.command_name, event.command)))
+        query = QueryEvent(event.command_name, collection, shape)
+        for recorder in recorders:
+            recorder.operations.append(query)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+_listener = None
+
+
+def install_listener():
+    """
+    Register the command listener. Only clients created afterwards report
+    to it, so this runs from ``CoreConfig.ready()``, before any query.
+    """
+    global _listener
+    if _listener is None:
+        _listener = QueryListener()
+        monitoring.register(_listener)
+
+
+class QueryRecorder:
+    """The MongoDB operations issued while it was active."""
+
+    def __init__(self):
+        self.operations = []
+
+    def __len__(self):
+        return len(self.operations)
+
+    def repeated(self, threshold=NPLUSONE_THRESHOLD):
+        """``[(QueryEvent, count)]`` for shapes issued at least ``threshold`` times."""
+        return [(query, count) for query, count in Counter(self.operations).most_common() if count >= threshold]
+
+    def report(self):
+        lines = [f'{len(self)} MongoDB operations:']
+        for query, count in Counter(self.operations).most_common():
+            lines.append(f'  {count} x {query.command} {query.collection} {query.shape}')
+        return '\n'.join(lines)
+
+
+@contextmanager
+def record_queries():
+    """Record the operations issued in this context; recorders may be nested."""
+    recorder = QueryRecorder()
+    token = _recorders.set(_recorders.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        _recorders.reset(token)
+
+
+def query_budget(max_queries):
+    """Declare the most MongoDB operations a view may issue for one request."""
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def _budget_problems(recorder, budget, repeat_threshold):
+    problems = []
+    if budget is not None and len(recorder) > budget:
+        problems.append(f'{len(recorder)} MongoDB operations, budget is {budget}')
+    for query, count in recorder.repeated(repeat_threshold):
+        problems.append(f'possible N+1: {count} x {query.command} {query.collection} {query.shape}')
+    return problems
+
+
+class QueryCountMiddleware:
+    """Count each request's MongoDB operations and report N+1 candidates and budget overruns."""
+
+    def __init__(self, get_response):
+        if not QUERY_COUNT_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        response['X-Query-Count'] = str(len(recorder))
+        budget = getattr(request, '_query_budget', None)
+        problems = _budget_problems(recorder, budget, NPLUSONE_THRESHOLD)
+        if problems:
+            message = f"{request.method} {request.path}: {'; '.join(problems)}"
+            if QUERY_BUDGET_STRICT and budget is not None and len(recorder) > budget:
+                raise QueryBudgetExceeded(f'{message}\n{recorder.report()}')
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = getattr(view_func, 'query_budget', None)
+
+
+@contextmanager
+def assert_max_queries(max_queries=None, repeat_threshold=NPLUSONE_THRESHOLD):
+    """
+    Test helper: fail with a per-shape report if the block issues more than
+    ``max_queries`` operations or repeats one shape ``repeat_threshold``
+    times::
+
+        with assert_max_queries(3):
+            self.client.get('/gk/')
+    """
+    with record_queries() as recorder:
+        yield recorder
+    problems = _budget_problems(recorder, max_queries, repeat_threshold)
+    if problems:
+        raise AssertionError('\n'.join(problems) + '\n' + recorder.report())
+
+
+def assert_view_budget(client, path, repeat_threshold=NPLUSONE_THRESHOLD, **extra):
+    """
+    Test helper: GET ``path`` with the test ``client`` and fail if its view
+    exceeds the budget it declares with :func:`query_budget`.
+    """
+    budget = getattr(resolve(path.split('?')[0]).func, 'query_budget', None)
+    if budget is None:
+        raise AssertionError(f'{path} declares no query budget')
+    with assert_max_queries(budget, repeat_threshold):
+        response = client.get(path, **extra)
+    return response
@@ -0,0 +1,215 @@
+"""
+Read-only PyMongo queries for the hottest public pages.
+
+The GK, Pradesh detail, subjective Q&A, objective set and model set test
+pages only ever read a handful of fields with simple ``find`` lookups, yet
+through the ORM each lookup is parsed by djongo's SQL translator and then
+loads every column. The functions here issue the equivalent projected
+queries on the shared client from :func:`core.mongo.read_collection` and
+return small immutable read models carrying just what the templates use.
+
+Read models are not model instances: they cannot be saved and have no
+related managers, so related rows are loaded here alongside them. Lookups
+that find nothing raise the model's own ``DoesNotExist`` so views keep
+their existing 404 handling. ``manage.py benchmark_reads`` compares these
+queries with the ORM ones they replace.
+"""
+import datetime
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .models import (
+    GKEntry, GKQuestion, Pradesh, PradeshQA, SubjectiveSubject, SubjectiveChapter, SubjectiveQA,
+    ObjectiveSubject, ObjectiveSet, ObjectiveMCQ, ModelSet, ModelSetQuestion,
+)
+from .mongo import read_collection
+from .pagination import KeysetPage, get_page_size, parse_cursor
+
+
+class StoredFile:
+    """The parts of a ``FieldFile`` templates use, for a stored file name."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name or ''
+
+    def __bool__(self):
+        return bool(self.name)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def url(self):
+        return default_storage.url(self.name)
+
+
+def _read_model(name, fields, **members):
+    """A namedtuple read model with ``pk`` first and the models' ``mongoid``."""
+    base = namedtuple(name, ('pk',) + fields, defaults=members.pop('defaults', None))
+    members.update(__slots__=(), mongoid=property(lambda self: str(self.pk)))
+    return type(name, (base,), members)
+
+
+def _choice_display(field_name, choices):
+    labels = dict(choices)
+    return lambda self: labels.get(getattr(self, field_name), getattr(self, field_name))
+
+
+GKEntryRow = _read_model(
+    'GKEntryRow', ('type', 'title', 'document', 'created_at', 'questions'),
+    get_type_display=_choice_display('type', GKEntry.GK_TYPE_CHOICES),
+)
+PradeshRow = _read_model(
+    'PradeshRow', ('province', 'title', 'document'),
+    get_province_display=_choice_display('province', Pradesh.PROVINCE_CHOICES),
+)
+QARow = _read_model('QARow', ('question', 'answer'))
+SubjectRow = _read_model('SubjectRow', ('name',))
+ChapterRow = _read_model('ChapterRow', ('subject_id', 'name'))
+ObjectiveSetRow = _read_model('ObjectiveSetRow', ('subject', 'title', 'description'))
+MCQRow = _read_model('MCQRow', ('question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer', 'explanation'))
+ModelSetRow = _read_model(
+    'ModelSetRow', ('title', 'timer_hours', 'timer_minutes', 'timer_seconds'),
+    total_seconds=property(lambda self: self.timer_hours * 3600 + self.timer_minutes * 60 + self.timer_seconds),
+)
+# No correct option: the test page must not ship the answer key
+TestQuestionRow = _read_model(
+    'TestQuestionRow', ('question_text', 'option_a', 'option_b', 'option_c', 'option_d', 'saved_answer'),
+    defaults=('',),
+)
+
+
+def _projection(fields):
+    return dict.fromkeys(fields, 1)
+
+
+def _aware(value):
+    # PyMongo hands back naive UTC datetimes
+    if value is not None and settings.USE_TZ and value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def _get(model, pk, fields):
+    document = read_collection(model).find_one({'_id': pk}, _projection(fields))
+    if document is None:
+        raise model.DoesNotExist(f'{model.__name__} matching query does not exist.')
+    return document
+
+
+def _qas(model, parent_column, parent_pk, sort=None):
+    cursor = read_collection(model).find({parent_column: parent_pk}, _projection(('question', 'answer')))
+    if sort:
+        cursor = cursor.sort(sort)
+    return [QARow(doc['_id'], doc.get('question', ''), doc.get('answer', '')) for doc in cursor]
+
+
+def _gk_entry(document, questions):
+    return GKEntryRow(
+        document['_id'], document.get('type'), document.get('title', ''),
+        StoredFile(document.get('document')), _aware(document.get('created_at')), questions,
+    )
+
+
+def gk_page(request, gk_type, page_size=None):
+    """
+    One keyset page of ``gk_type`` entries (see :func:`core.pagination.paginate`),
+    each with its questions, loaded for the whole page in a single query.
+    """
+    size = get_page_size(request, page_size)
+    cursor = parse_cursor(request.GET.get('cursor'))
+    criteria = {'type': gk_type}
+    if cursor is not None:
+        criteria['_id'] = {'$gt': cursor}
+    documents = list(
+        read_collection(GKEntry)
+        .find(criteria, _projection(('type', 'title', 'document', 'created_at')))
+        .sort('_id', 1)
+        .limit(size + 1)
+    )
+    next_cursor = str(documents[size - 1]['_id']) if len(documents) > size else None
+    documents = documents[:size]
+    questions = defaultdict(list)
+    if documents:
+        rows = read_collection(GKQuestion).find(
+            {'entry_id': {'$in': [doc['_id'] for doc in documents]}},
+            _projection(('entry_id', 'question', 'answer')),
+        )
+        for row in rows:
+            questions[row['entry_id']].append(QARow(row['_id'], row.get('question', ''), row.get('answer', '')))
+    entries = [_gk_entry(doc, questions[doc['_id']]) for doc in documents]
+    return KeysetPage(entries, cursor, next_cursor, request.GET)
+
+
+def gk_entry(pk):
+    """GK entry ``pk`` with its questions."""
+    document = _get(GKEntry, pk, ('type', 'title', 'document', 'created_at'))
+    return _gk_entry(document, _qas(GKQuestion, 'entry_id', pk))
+
+
+def pradesh_detail(pk):
+    """``(pradesh, qas)`` for Pradesh entry ``pk``."""
+    document = _get(Pradesh, pk, ('province', 'title', 'document'))
+    pradesh = PradeshRow(document['_id'], document.get('province'), document.get('title', ''), StoredFile(document.get('document')))
+    return pradesh, _qas(PradeshQA, 'pradesh_id', pk)
+
+
+def subjective_chapter(subject_pk, chapter_pk):
+    """
+    ``(subject, chapter, qas)`` for a chapter of ``subject_pk``, Q&As in the
+    order they were added. A chapter of another subject does not exist.
+    """
+    subject = _get(SubjectiveSubject, subject_pk, ('name',))
+    chapter = read_collection(SubjectiveChapter).find_one({'_id': chapter_pk, 'subject_id': subject_pk}, _projection(('name',)))
+    if chapter is None:
+        raise SubjectiveChapter.DoesNotExist('SubjectiveChapter matching query does not exist.')
+    return (
+        SubjectRow(subject['_id'], subject.get('name', '')),
+        ChapterRow(chapter['_id'], subject_pk, chapter.get('name', '')),
+        _qas(SubjectiveQA, 'chapter_id', chapter_pk, sort=[('_id', 1)]),
+    )
+
+
+def objective_set(pk):
+    """``(objective_set, mcqs)`` for set ``pk``, the set carrying its subject."""
+    document = _get(ObjectiveSet, pk, ('subject_id', 'title', 'description'))
+    subject = read_collection(ObjectiveSubject).find_one({'_id': document.get('subject_id')}, _projection(('name',)))
+    obj_set = ObjectiveSetRow(
+        document['_id'],
+        SubjectRow(subject['_id'], subject.get('name', '')) if subject else None,
+        document.get('title', ''),
+        document.get('description', ''),
+    )
+    fields = MCQRow._fields[1:]
+    mcqs = [
+        MCQRow(doc['_id'], *(doc.get(field, '') for field in fields))
+        for doc in read_collection(ObjectiveMCQ).find({'set_id': pk}, _projection(fields))
+    ]
+    return obj_set, mcqs
+
+
+def model_set(pk):
+    """The title and timer of model set ``pk``."""
+    document = _get(ModelSet, pk, ('title', 'timer_hours', 'timer_minutes', 'timer_seconds'))
+    return ModelSetRow(
+        document['_id'], document.get('title', ''),
+        document.get('timer_hours') or 0, document.get('timer_minutes') or 0, document.get('timer_seconds') or 0,
+    )
+
+
+def test_questions(set_pk, saved_answers=None):
+    """
+    The questions of model set ``set_pk`` in order, without their answers.
+    ``saved_answers`` maps question ids to answers to pre-select.
+    """
+    saved_answers = saved_answers or {}
+    fields = TestQuestionRow._fields[1:-1]
+    cursor = read_collection(ModelSetQuestion).find({'model_set_id': set_pk}, _projection(fields)).sort('_id', 1)
+    return [
+        TestQuestionRow(doc['_id'], *(doc.get(field, '') for field in fields), saved_answers.get(str(doc['_id']), ''))
+        for doc in cursor
+    ]
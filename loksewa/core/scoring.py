@@ -0,0 +1,92 @@
+"""
+Answer keys and scoring for model set tests.
+
+Each ModelSet's answer key is a compact list of ``(question_id, correct_option)``
+pairs built with one projected query and cached until a question in the set
+changes, so grading a submission never reloads question text, options or
+explanations. Keys are only cached in a shared cache: a per-process one would
+keep grading other workers' submissions against the key from before an edit.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .caches import cache_is_shared
+from .models import ModelSetQuestion
+from .mongo import collection_for
+
+ANSWER_KEY_TTL = getattr(settings, 'ANSWER_KEY_TTL', 60 * 60)
+
+
+def _answer_key_cache_key(set_id):
+    return f'core:answer_key:{set_id}'
+
+
+def build_answer_key(set_id):
+    """Read ``(question_id, correct_option)`` pairs for ``set_id`` in question order."""
+    rows = collection_for(ModelSetQuestion).find(
+        {'model_set_id': set_id}, {'correct_option': 1},
+    ).sort('_id', 1)
+    answers = [(str(row['_id']), row.get('correct_option', '')) for row in rows]
+    return {'answers': answers, 'total': len(answers)}
+
+
+def get_answer_key(set_id):
+    """Return the cached answer key for ``set_id``, building it on a miss."""
+    if not cache_is_shared():
+        return build_answer_key(set_id)
+    key = _answer_key_cache_key(set_id)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = build_answer_key(set_id)
+        cache.set(key, answer_key, ANSWER_KEY_TTL)
+    return answer_key
+
+
+def invalidate_answer_key(set_id):
+    cache.delete(_answer_key_cache_key(set_id))
+
+
+def score_answers(answer_key, user_answers):
+    """
+    Grade ``user_answers`` (``{question_id: option}``) against ``answer_key``.
+
+    Returns ``(correct, results)`` where ``results`` lists one dict per
+    question in key order.
+    """
+    correct = 0
+    results = []
+    for number, (question_id, correct_option) in enumerate(answer_key['answers'], start=1):
+        user_answer = user_answers.get(question_id, '')
+        is_correct = user_answer == correct_option
+        if is_correct:
+            correct += 1
+        results.append({
+            'number': number,
+            'question_id': question_id,
+            'user_answer': user_answer,
+            'correct_option': correct_option,
+            'is_correct': is_correct,
+        })
+    return correct, results
+
+
+def attach_questions(set_id, results):
+    """
+    Add the question text and explanation to :func:`score_answers` results
+    for the result page, with one projected read.
+    """
+    rows = collection_for(ModelSetQuestion).find({'model_set_id': set_id}, {'question_text': 1, 'explanation': 1})
+    details = {str(row['_id']): row for row in rows}
+    for result in results:
+        row = details.get(result['question_id'], {})
+        result['question_text'] = row.get('question_text', '')
+        result['explanation'] = row.get('explanation', '')
+    return results
+
+
+def answers_from_post(answer_key, post):
+    """Pick the ``answer_<question_id>`` radio values for the keyed questions out of ``post``."""
+    return {
+        question_id: post.get(f'answer_{question_id}', '')
+        for question_id, _ in answer_key['answers']
+    }
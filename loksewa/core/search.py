@@ -0,0 +1,264 @@
+"""
+Site-wide full-text search over notes, GK, Pradesh, subjective, objective
+and article content.
+
+Every searchable row is mirrored into one ``core_search`` collection as a
+small document (kind, title, body, snippet, url) that carries a weighted
+MongoDB text index, so a query is a single indexed ``$text`` lookup ranked
+by ``textScore`` instead of a regex scan per collection. The index is built
+by ``manage.py build_search_index`` and kept current by the change queue
+in :mod:`core.indexer`, which batches calls to :func:`apply_changes`.
+The first batch a process applies also creates the text index, so search
+works before the first full build; until then it finds nothing.
+
+Text indexes match whole words; the language is ``none`` so Nepali and
+English text are tokenized the same way, without stemming or stop words.
+"""
+import logging
+from collections import namedtuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.urls import reverse
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, TEXT
+from pymongo.errors import OperationFailure
+
+from .models import Note, GKEntry, GKQuestion, PradeshQA, SubjectiveChapter, SubjectiveQA, ObjectiveMCQ, Article
+from .mongo import get_database, collection_for
+from .text import plain_text
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLLECTION = 'core_search'
+SEARCH_PAGE_SIZE = getattr(settings, 'SEARCH_PAGE_SIZE', 20)
+# Ranked results are paged with skip/limit; cap how deep a reader can go
+SEARCH_MAX_PAGE = getattr(settings, 'SEARCH_MAX_PAGE', 50)
+SEARCH_BATCH_SIZE = 500
+SNIPPET_LENGTH = 200
+
+SearchSource = namedtuple('SearchSource', ['model', 'label', 'parent_field', 'build'])
+SearchHit = namedtuple('SearchHit', ['kind', 'label', 'title', 'snippet', 'url', 'score'])
+
+
+class SearchPage:
+    """One ranked page of search results."""
+
+    def __init__(self, query, hits, number, has_next):
+        self.query = query
+        self.object_list = hits
+        self.number = number
+        self.has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_previous(self):
+        return self.number > 1
+
+
+def _note(note, memo):
+    return note.title, '', f"{reverse('notes')}?q={quote(note.title)}"
+
+
+def _gk_entry(entry, memo):
+    return entry.title, '', reverse('gk_detail', args=[entry.pk])
+
+
+def _gk_question(question, memo):
+    return question.question, question.answer, reverse('gk_detail', args=[question.entry_id])
+
+
+def _pradesh_qa(qa, memo):
+    return qa.question, qa.answer, reverse('pradesh_detail', args=[qa.pradesh_id])
+
+
+def _subjective_qa(qa, memo):
+    # The QA page URL needs the chapter's subject; memoize it across a rebuild
+    if qa.chapter_id not in memo:
+        chapter = collection_for(SubjectiveChapter).find_one({'_id': qa.chapter_id}, {'subject_id': 1})
+        memo[qa.chapter_id] = chapter['subject_id'] if chapter else None
+    subject_id = memo[qa.chapter_id]
+    url = reverse('subjective_qas', args=[subject_id, qa.chapter_id]) if subject_id else ''
+    return qa.question, qa.answer, url
+
+
+def _objective_mcq(mcq, memo):
+    body = ' '.join(filter(None, (mcq.option_a, mcq.option_b, mcq.option_c, mcq.option_d, mcq.explanation)))
+    return mcq.question, body, reverse('objective_set_detail', args=[mcq.set_id])
+
+
+def _article(article, memo):
+    return article.title, plain_text(article.content), reverse('blog_detail', args=[article.pk])
+
+
+SEARCH_SOURCES = {
+    'note': SearchSource(Note, 'Note', None, _note),
+    'gk': SearchSource(GKEntry, 'GK', None, _gk_entry),
+    'gk_question': SearchSource(GKQuestion, 'GK Question', 'entry', _gk_question),
+    'pradesh_qa': SearchSource(PradeshQA, 'Pradesh Q&A', 'pradesh', _pradesh_qa),
+    'subjective_qa': SearchSource(SubjectiveQA, 'Subjective Q&A', 'chapter', _subjective_qa),
+    'objective_mcq': SearchSource(ObjectiveMCQ, 'Objective MCQ', 'set', _objective_mcq),
+    'article': SearchSource(Article, 'Article', None, _article),
+}
+SOURCE_KINDS = {source.model: kind for kind, source in SEARCH_SOURCES.items()}
+
+
+# Whether this process has made sure the live collection has its indexes
+_index_ensured = False
+
+
+def search_collection(name=SEARCH_COLLECTION):
+    return get_database()[name]
+
+
+def ensure_search_index(collection=None):
+    """Create the weighted text index (a no-op when it already exists)."""
+    collection = collection if collection is not None else search_collection()
+    collection.create_index(
+        [('title', TEXT), ('body', TEXT)],
+        weights={'title': 10, 'body': 1},
+        default_language='none',
+        name='search_text',
+    )
+    collection.create_index([('kind', 1), ('parent_id', 1)], name='search_parent')
+
+
+def _document_id(kind, pk):
+    return f'{kind}:{pk}'
+
+
+def build_document(instance, memo=None):
+    """Return the search document for ``instance``, or None if its model is not searchable."""
+    kind = SOURCE_KINDS.get(type(instance))
+    if kind is None:
+        return None
+    source = SEARCH_SOURCES[kind]
+    title, body, url = source.build(instance, {} if memo is None else memo)
+    body = body or ''
+    return {
+        '_id': _document_id(kind, instance.pk),
+        'kind': kind,
+        'object_id': instance.pk,
+        'parent_id': getattr(instance, f'{source.parent_field}_id') if source.parent_field else None,
+        'title': title,
+        'body': body,
+        'snippet': body[:SNIPPET_LENGTH],
+        'url': url,
+    }
+
+
+def apply_changes(upserts=None, deletes=None, parents=None):
+    """
+    Bring the index in line with a batch of changes, keyed by source kind.
+
+    ``upserts`` and ``deletes`` map a kind to primary keys; ``parents``
+    maps a kind to parent keys whose children were bulk written and must
+    be re-mirrored wholesale. Rows are re-read from their collections (one
+    query per kind), so the index reflects their state now rather than when
+    the change was queued, and every write goes out in one ``bulk_write``.
+    """
+    ops = []
+    memo = {}
+    for kind, pks in (deletes or {}).items():
+        ops += [DeleteOne({'_id': _document_id(kind, pk)}) for pk in pks]
+    for kind, pks in (upserts or {}).items():
+        found = set()
+        for instance in SEARCH_SOURCES[kind].model.objects.filter(pk__in=list(pks)):
+            document = build_document(instance, memo)
+            ops.append(ReplaceOne({'_id': document['_id']}, document, upsert=True))
+            found.add(instance.pk)
+        # Deleted again before the batch ran
+        ops += [DeleteOne({'_id': _document_id(kind, pk)}) for pk in set(pks) - found]
+    for kind, parent_ids in (parents or {}).items():
+        source = SEARCH_SOURCES[kind]
+        ops.append(DeleteMany({'kind': kind, 'parent_id': {'$in': list(parent_ids)}}))
+        rows = source.model.objects.filter(**{f'{source.parent_field}__in': list(parent_ids)})
+        ops += [InsertOne(build_document(row, memo)) for row in rows]
+    if ops:
+        global _index_ensured
+        if not _index_ensured:
+            ensure_search_index()
+            _index_ensured = True
+        # Ordered, so a parent's DeleteMany runs before its children are reinserted
+        search_collection().bulk_write(ops)
+    return len(ops)
+
+
+def rebuild_index(batch_size=SEARCH_BATCH_SIZE, stdout=None):
+    """
+    Rebuild the whole index into a scratch collection and swap it in.
+
+    Readers keep using the old index until the final ``rename``, so a
+    rebuild never serves a half-filled index. Returns ``{kind: count}``.
+    """
+    scratch = search_collection(f'{SEARCH_COLLECTION}_rebuild')
+    scratch.drop()
+    counts = {}
+    for kind, source in SEARCH_SOURCES.items():
+        memo = {}
+        batch = []
+        counts[kind] = 0
+        for instance in source.model.objects.all().iterator(chunk_size=batch_size):
+            batch.append(build_document(instance, memo))
+            if len(batch) >= batch_size:
+                scratch.insert_many(batch, ordered=False)
+                counts[kind] += len(batch)
+                batch = []
+        if batch:
+            scratch.insert_many(batch, ordered=False)
+            counts[kind] += len(batch)
+        if stdout is not None:
+            stdout.write(f'Indexed {counts[kind]} {source.label} documents')
+    ensure_search_index(scratch)
+    if sum(counts.values()):
+        scratch.rename(SEARCH_COLLECTION, dropTarget=True)
+    else:
+        # rename() fails on a collection that was never created
+        search_collection().drop()
+        ensure_search_index()
+    return counts
+
+
+def get_page_number(request):
+    try:
+        number = int(request.GET.get('page', 1))
+    except (TypeError, ValueError):
+        number = 1
+    return max(1, min(number, SEARCH_MAX_PAGE))
+
+
+def search(query, kinds=None, page=1, page_size=SEARCH_PAGE_SIZE):
+    """
+    Return one :class:`SearchPage` of documents matching ``query``, best first.
+
+    ``kinds`` restricts the results to some :data:`SEARCH_SOURCES` keys.
+    Without a text index (nothing indexed yet) the page is empty.
+    """
+    query = (query or '').strip()
+    if not query:
+        return SearchPage(query, [], 1, False)
+    page = max(1, min(page, SEARCH_MAX_PAGE))
+    criteria = {'$text': {'$search': query}}
+    if kinds:
+        criteria['kind'] = {'$in': list(kinds)}
+    projection = {'kind': 1, 'title': 1, 'snippet': 1, 'url': 1, 'score': {'$meta': 'textScore'}}
+    try:
+        rows = list(
+            search_collection()
+            .find(criteria, projection)
+            .sort([('score', {'$meta': 'textScore'})])
+            .skip((page - 1) * page_size)
+            .limit(page_size + 1)
+        )
+    except OperationFailure as e:
+        logger.warning('Search failed, run manage.py build_search_index: %s', e)
+        return SearchPage(query, [], page, False)
+    hits = [
+        SearchHit(row['kind'], SEARCH_SOURCES[row['kind']].label, row['title'], row.get('snippet', ''), row['url'], row['score'])
+        for row in rows[:page_size] if row['kind'] in SEARCH_SOURCES
+    ]
+    return SearchPage(query, hits, page, len(rows) > page_size and page < SEARCH_MAX_PAGE)
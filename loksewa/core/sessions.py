@@ -0,0 +1,98 @@
+"""
+Two-tier cache session engine (``SESSION_ENGINE = 'core.sessions'``).
+
+Sessions are stored in the ``SESSION_CACHE_ALIAS`` cache, which is shared
+by every worker; settings select this engine only when ``REDIS_URL`` is
+set, and use the file engine otherwise. Each process keeps a small LRU of
+recently read sessions in front of it for ``SESSION_LOCAL_TTL`` seconds, so
+the burst of requests a page load makes costs one round trip to the shared
+store. Writes and
+deletes go through to both tiers; set ``SESSION_LOCAL_TTL = 0`` to turn the
+local tier off.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+
+SESSION_LOCAL_TTL = getattr(settings, 'SESSION_LOCAL_TTL', 5)
+SESSION_LOCAL_MAX_ENTRIES = getattr(settings, 'SESSION_LOCAL_MAX_ENTRIES', 1000)
+
+
+class LocalSessionCache:
+    """Thread-safe, size-bounded LRU whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if not self.ttl:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Sessions are mutated in place by the request, so never hand out the cached dict
+        return copy.deepcopy(data)
+
+    def set(self, key, data):
+        if not self.ttl:
+            return
+        entry = (copy.deepcopy(data), time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_sessions = LocalSessionCache(SESSION_LOCAL_MAX_ENTRIES, SESSION_LOCAL_TTL)
+
+
+class SessionStore(CacheSessionStore):
+
+    def load(self):
+        if self.session_key is not None:
+            session_data = local_sessions.get(self.cache_key)
+            if session_data is not None:
+                return session_data
+        session_data = super().load()
+        if self.session_key is not None:
+            local_sessions.set(self.cache_key, session_data)
+        return session_data
+
+    def exists(self, session_key):
+        if local_sessions.get(self.cache_key_prefix + session_key) is not None:
+            return True
+        return super().exists(session_key)
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        if self.session_key is not None:
+            local_sessions.set(self.cache_key, self._get_session(no_load=must_create))
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+        if session_key is not None:
+            local_sessions.delete(self.cache_key_prefix + session_key)
+        super().delete(session_key)
@@ -0,0 +1,85 @@
+"""
+Model signal handlers that keep cached data in step with admin edits.
+
+Connected from ``CoreConfig.ready``.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal
+
+from .models import ObjectiveSet, ObjectiveMCQ, ModelSetQuestion
+from .scoring import invalidate_answer_key
+from .indexer import enqueue_instance, enqueue_children
+from .pagecache import OBJECT_GROUPS, invalidate_object, invalidate_children
+from .search import SEARCH_SOURCES
+from .stats import DASHBOARD_MODELS, invalidate_dashboard_stats, invalidate_objective_counts
+
+# Sent by the bulk write paths (which bypass post_save/post_delete) with
+# ``sender=<child model>`` and ``parent=<parent instance>``.
+children_bulk_changed = Signal()
+
+
+def _dashboard_created(sender, created, **kwargs):
+    # Updates leave the counts untouched, only inserts change them
+    if created:
+        invalidate_dashboard_stats()
+
+
+def _dashboard_deleted(sender, **kwargs):
+    invalidate_dashboard_stats()
+
+
+for _model in DASHBOARD_MODELS.values():
+    post_save.connect(_dashboard_created, sender=_model, dispatch_uid=f'dashboard_stats_save_{_model.__name__}')
+    post_delete.connect(_dashboard_deleted, sender=_model, dispatch_uid=f'dashboard_stats_delete_{_model.__name__}')
+
+
+def _objective_changed(sender, **kwargs):
+    invalidate_objective_counts()
+
+
+for _model in (ObjectiveSet, ObjectiveMCQ):
+    post_save.connect(_objective_changed, sender=_model, dispatch_uid=f'objective_counts_save_{_model.__name__}')
+    post_delete.connect(_objective_changed, sender=_model, dispatch_uid=f'objective_counts_delete_{_model.__name__}')
+
+
+def _model_set_question_changed(sender, instance, **kwargs):
+    invalidate_answer_key(instance.model_set_id)
+
+
+post_save.connect(_model_set_question_changed, sender=ModelSetQuestion, dispatch_uid='answer_key_save')
+post_delete.connect(_model_set_question_changed, sender=ModelSetQuestion, dispatch_uid='answer_key_delete')
+
+
+def _search_saved(sender, instance, **kwargs):
+    # Only queued here; the indexer applies changes in batches off the request
+    enqueue_instance(instance)
+
+
+def _search_deleted(sender, instance, **kwargs):
+    enqueue_instance(instance, deleted=True)
+
+
+for _source in SEARCH_SOURCES.values():
+    post_save.connect(_search_saved, sender=_source.model, dispatch_uid=f'search_save_{_source.model.__name__}')
+    post_delete.connect(_search_deleted, sender=_source.model, dispatch_uid=f'search_delete_{_source.model.__name__}')
+
+
+def _search_children_changed(sender, parent, **kwargs):
+    enqueue_children(sender, parent)
+
+
+children_bulk_changed.connect(_search_children_changed, dispatch_uid='search_children')
+
+
+def _page_changed(sender, instance, **kwargs):
+    invalidate_object(instance)
+
+
+def _page_children_changed(sender, parent, **kwargs):
+    invalidate_children(sender, parent.pk)
+
+
+for _model in OBJECT_GROUPS:
+    post_save.connect(_page_changed, sender=_model, dispatch_uid=f'page_cache_save_{_model.__name__}')
+    post_delete.connect(_page_changed, sender=_model, dispatch_uid=f'page_cache_delete_{_model.__name__}')
+children_bulk_changed.connect(_page_children_changed, dispatch_uid='page_cache_children')
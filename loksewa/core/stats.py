@@ -0,0 +1,140 @@
+"""
+Aggregated counters for the admin and listing pages.
+
+Counts are read straight from MongoDB (collection metadata or grouped
+aggregations) instead of issuing one djongo ``COUNT`` query per model or
+per row. The dashboard counters are kept in the cache as a snapshot.
+Objective counts are cached until a set or MCQ changes, which only holds
+when every worker sees the invalidation, so they are read afresh unless
+the cache is shared (see :func:`core.caches.cache_is_shared`).
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .caches import cache_is_shared
+from .models import User, Note, Article, Pradesh, ModelSet, Quiz, Job, SubjectiveChapter, SubjectiveQA, ObjectiveSet, ObjectiveMCQ
+from .mongo import get_database, collection_for
+
+DASHBOARD_STATS_KEY = 'core:dashboard_stats'
+DASHBOARD_STATS_TTL = getattr(settings, 'DASHBOARD_STATS_TTL', 60)
+OBJECTIVE_COUNTS_KEY = 'core:objective_counts'
+OBJECTIVE_COUNTS_TTL = getattr(settings, 'OBJECTIVE_COUNTS_TTL', 60 * 60)
+
+# Context name -> model counted on the admin dashboard
+DASHBOARD_MODELS = {
+    'user_count': User,
+    'note_count': Note,
+    'article_count': Article,
+    'pradesh_count': Pradesh,
+    'modelset_count': ModelSet,
+    'quiz_count': Quiz,
+    'job_count': Job,
+}
+
+
+def _count_collections():
+    db = get_database()
+    return {
+        name: db[model._meta.db_table].estimated_document_count()
+        for name, model in DASHBOARD_MODELS.items()
+    }
+
+
+def dashboard_stats():
+    """Return the cached dashboard counters, rebuilding the snapshot if it expired."""
+    stats = cache.get(DASHBOARD_STATS_KEY)
+    if stats is None:
+        stats = _count_collections()
+        cache.set(DASHBOARD_STATS_KEY, stats, DASHBOARD_STATS_TTL)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    cache.delete(DASHBOARD_STATS_KEY)
+
+
+def group_counts(model, field):
+    """Return ``{value: count}`` for ``field`` across ``model``'s collection in one aggregation."""
+    pipeline = [{'$group': {'_id': f'${field}', 'count': {'$sum': 1}}}]
+    return {row['_id']: row['count'] for row in collection_for(model).aggregate(pipeline)}
+
+
+def _tree_counts(middle_model, parent_field, leaf_model, middle_field, middle_name, leaf_name):
+    """
+    Counts for a three level parent -> middle -> leaf tree in two round trips:
+    one projected read of the middle -> parent links and one grouped
+    aggregation of leaves per middle document.
+    """
+    leaf_counts = group_counts(leaf_model, middle_field)
+    parents = {}
+    middles = {}
+    for row in collection_for(middle_model).find({}, {parent_field: 1}):
+        row_leaves = leaf_counts.get(row['_id'], 0)
+        middles[row['_id']] = row_leaves
+        totals = parents.setdefault(row.get(parent_field), {middle_name: 0, leaf_name: 0})
+        totals[middle_name] += 1
+        totals[leaf_name] += row_leaves
+    return parents, middles
+
+
+def subjective_counts():
+    """
+    Chapter and Q&A counts for the SubjectiveSubject -> Chapter -> QA tree.
+
+    Returns::
+
+        {
+            'subjects': {subject_id: {'chapters': int, 'qas': int}},
+            'chapters': {chapter_id: int},
+            'total_chapters': int,
+            'total_qas': int,
+        }
+    """
+    subjects, chapters = _tree_counts(SubjectiveChapter, 'subject_id', SubjectiveQA, 'chapter_id', 'chapters', 'qas')
+    return {
+        'subjects': subjects,
+        'chapters': chapters,
+        'total_chapters': len(chapters),
+        'total_qas': sum(chapters.values()),
+    }
+
+
+def annotate_subjective_counts(subjects, counts=None):
+    """Set ``chapter_count``/``qa_count`` on each subject from :func:`subjective_counts`."""
+    counts = counts or subjective_counts()
+    for subject in subjects:
+        totals = counts['subjects'].get(subject._id, {})
+        subject.chapter_count = totals.get('chapters', 0)
+        subject.qa_count = totals.get('qas', 0)
+    return subjects
+
+
+def objective_counts():
+    """
+    Set and MCQ counts per ObjectiveSubject, cached until a set or MCQ
+    changes when the cache is shared.
+
+    Returns ``{'subjects': {subject_id: {'sets': int, 'mcqs': int}}, 'sets': {set_id: int}}``.
+    """
+    shared = cache_is_shared()
+    counts = cache.get(OBJECTIVE_COUNTS_KEY) if shared else None
+    if counts is None:
+        subjects, sets = _tree_counts(ObjectiveSet, 'subject_id', ObjectiveMCQ, 'set_id', 'sets', 'mcqs')
+        counts = {'subjects': subjects, 'sets': sets}
+        if shared:
+            cache.set(OBJECTIVE_COUNTS_KEY, counts, OBJECTIVE_COUNTS_TTL)
+    return counts
+
+
+def annotate_objective_counts(subjects, counts=None):
+    """Set ``set_count``/``mcq_count`` on each subject from :func:`objective_counts`."""
+    counts = counts or objective_counts()
+    for subject in subjects:
+        totals = counts['subjects'].get(subject._id, {})
+        subject.set_count = totals.get('sets', 0)
+        subject.mcq_count = totals.get('mcqs', 0)
+    return subjects
+
+
+def invalidate_objective_counts():
+    cache.delete(OBJECTIVE_COUNTS_KEY)
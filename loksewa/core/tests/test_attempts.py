@@ -0,0 +1,67 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.attempts import question_difficulty, record_attempt, user_attempts
+from core.models import ModelSet, TestAttempt, User
+
+
+def results(*answers):
+    """``score_answers``-style results for ``(question_id, answer, is_correct)`` triples."""
+    return [
+        {'number': i, 'question_id': qid, 'user_answer': answer, 'correct_option': 'A', 'is_correct': correct}
+        for i, (qid, answer, correct) in enumerate(answers, start=1)
+    ]
+
+
+class AttemptTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reader', password='pw')
+        self.model_set = ModelSet.objects.create(title='Set 1')
+
+    def test_record_attempt_embeds_the_answers(self):
+        attempt = record_attempt(self.user, self.model_set, 1, results(('q1', 'A', True), ('q2', '', False)), 95.7)
+        attempt = TestAttempt.objects.get(pk=attempt.pk)
+        self.assertEqual((attempt.score, attempt.total, attempt.elapsed_seconds), (1, 2, 95))
+        self.assertEqual(
+            [(a['question_id'], a['answer'], a['is_correct']) for a in attempt.answers],
+            [('q1', 'A', True), ('q2', '', False)],
+        )
+        self.assertEqual(attempt.percent, 50)
+
+    def test_negative_elapsed_time_is_stored_as_zero(self):
+        attempt = record_attempt(self.user, self.model_set, 0, results(), -3)
+        self.assertEqual(attempt.elapsed_seconds, 0)
+        self.assertEqual(attempt.percent, 0)
+
+    def test_user_attempts_lists_own_attempts_newest_first(self):
+        first = record_attempt(self.user, self.model_set, 0, results(('q1', 'B', False)), 10)
+        TestAttempt.objects.filter(pk=first.pk).update(submitted_at=timezone.now() - datetime.timedelta(minutes=5))
+        second = record_attempt(self.user, self.model_set, 1, results(('q1', 'A', True)), 10)
+        record_attempt(User.objects.create_user('other', password='pw'), self.model_set, 1, results(('q1', 'A', True)), 10)
+        self.assertEqual([a.pk for a in user_attempts(self.user)], [second.pk, first.pk])
+        self.assertEqual([a.pk for a in user_attempts(self.user, limit=1)], [second.pk])
+
+    def test_question_difficulty_aggregates_every_attempt(self):
+        other = User.objects.create_user('other', password='pw')
+        record_attempt(self.user, self.model_set, 1, results(('q1', 'A', True), ('q2', 'B', False)), 10)
+        record_attempt(other, self.model_set, 2, results(('q1', 'A', True), ('q2', 'A', True)), 10)
+        record_attempt(other, ModelSet.objects.create(title='Set 2'), 0, results(('q1', 'C', False)), 10)
+        difficulty = question_difficulty(self.model_set.pk)
+        self.assertEqual(difficulty['q1'], {'attempts': 2, 'correct': 2, 'rate': 1.0})
+        self.assertEqual(difficulty['q2'], {'attempts': 2, 'correct': 1, 'rate': 0.5})
+
+    def test_question_difficulty_without_attempts_is_empty(self):
+        self.assertEqual(question_difficulty(self.model_set.pk), {})
+
+    def test_history_page_shows_the_users_attempts(self):
+        record_attempt(self.user, self.model_set, 1, results(('q1', 'A', True)), 42)
+        self.client.force_login(self.user)
+        response = self.client.get('/test-history/')
+        self.assertContains(response, 'Set 1')
+        self.assertContains(response, '1/1 (100%)')
+
+    def test_history_page_requires_login(self):
+        response = self.client.get('/test-history/')
+        self.assertEqual(response.status_code, 302)
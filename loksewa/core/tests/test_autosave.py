@@ -0,0 +1,213 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import autosave
+from core.autosave import DeadlinePassed, finish, get_state, is_expired, remaining_seconds, save_deltas, start_or_resume
+from core.models import AttemptDraft, ModelSet, ModelSetQuestion, User
+from core.mongo import collection_for
+
+
+class TimerTests(SimpleTestCase):
+    def test_untimed_state_never_expires(self):
+        state = {'deadline': None}
+        self.assertFalse(is_expired(state, now=10 ** 12))
+        self.assertIsNone(remaining_seconds(state))
+
+    def test_deadline_has_a_grace_period(self):
+        state = {'deadline': 1000.0}
+        self.assertFalse(is_expired(state, now=1000 + autosave.DEADLINE_GRACE_SECONDS))
+        self.assertTrue(is_expired(state, now=1001 + autosave.DEADLINE_GRACE_SECONDS))
+        self.assertEqual(remaining_seconds(state, now=940.5), 59)
+        self.assertEqual(remaining_seconds(state, now=2000), 0)
+
+
+class AutosaveTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.model_set = ModelSet.objects.create(title='Set 1', timer_minutes=30)
+        self.valid_ids = {'q1', 'q2', 'q3'}
+
+    def start(self, total_seconds=1800):
+        return start_or_resume(self.user.pk, self.model_set.pk, total_seconds)
+
+    def save(self, deltas):
+        return save_deltas(self.user.pk, self.model_set.pk, deltas, self.valid_ids)
+
+    def draft(self):
+        return collection_for(AttemptDraft).find_one({'user_id': self.user.pk, 'model_set_id': self.model_set.pk})
+
+    def expire(self):
+        past = time.time() - autosave.DEADLINE_GRACE_SECONDS - 60
+        collection_for(AttemptDraft).update_one({'_id': self.draft()['_id']}, {'$set': {'deadline': past}})
+        state = cache.get(autosave._state_key(self.user.pk, self.model_set.pk))
+        if state is not None:
+            state['deadline'] = past
+            cache.set(autosave._state_key(self.user.pk, self.model_set.pk), state)
+
+
+@override_settings(SHARED_CACHE_ALIASES=['default'])
+class SharedCacheAutosaveTests(AutosaveTestCase):
+    def test_start_sets_the_deadline_and_writes_a_draft(self):
+        state = self.start(600)
+        self.assertAlmostEqual(state['deadline'] - state['started_at'], 600)
+        self.assertEqual(self.draft()['started_at'], state['started_at'])
+
+    def test_resuming_keeps_the_clock_and_answers(self):
+        started = self.start()
+        self.save({'q1': 'a'})
+        resumed = self.start()
+        self.assertEqual(resumed['started_at'], started['started_at'])
+        self.assertEqual(resumed['answers'], {'q1': 'A'})
+
+    def test_resuming_after_cache_eviction_reads_the_draft(self):
+        started = self.start()
+        with mock.patch.object(autosave, 'AUTOSAVE_FLUSH_SECONDS', 0):
+            self.save({'q2': 'B'})
+        cache.clear()
+        resumed = self.start()
+        self.assertEqual(resumed['started_at'], started['started_at'])
+        self.assertEqual(resumed['answers'], {'q2': 'B'})
+
+    def test_expired_test_restarts(self):
+        started = self.start()
+        self.save({'q1': 'A'})
+        self.expire()
+        restarted = self.start()
+        self.assertGreaterEqual(restarted['started_at'], started['started_at'])
+        self.assertEqual(restarted['answers'], {})
+
+    def test_deltas_are_filtered(self):
+        self.start()
+        state = self.save({'q1': 'b', 'q2': 'E', 'forged': 'A', 'q3': 7})
+        self.assertEqual(state['answers'], {'q1': 'B'})
+        state = self.save({'q1': None})
+        self.assertEqual(state['answers'], {'q1': ''})
+
+    def test_deltas_between_flushes_stay_in_the_cache(self):
+        self.start()
+        self.save({'q1': 'A'})
+        self.assertEqual(self.draft()['answers'], {})
+        self.assertEqual(get_state(self.user.pk, self.model_set.pk)['answers'], {'q1': 'A'})
+
+    def test_saving_without_a_running_test_fails(self):
+        with self.assertRaises(LookupError):
+            self.save({'q1': 'A'})
+
+    def test_saving_after_the_deadline_fails(self):
+        self.start()
+        self.expire()
+        with self.assertRaises(DeadlinePassed):
+            self.save({'q1': 'A'})
+
+    def test_concurrent_deltas_are_all_kept(self):
+        self.valid_ids = {f'q{i}' for i in range(10)}
+        self.start()
+        barrier = threading.Barrier(len(self.valid_ids))
+
+        def slow_get_state(*args):
+            # Widen the gap between reading and writing the state back
+            state = get_state(*args)
+            time.sleep(0.005)
+            return state
+
+        def post(question_id):
+            barrier.wait()
+            self.save({question_id: 'A'})
+
+        threads = [threading.Thread(target=post, args=(question_id,)) for question_id in self.valid_ids]
+        with mock.patch.object(autosave, 'get_state', slow_get_state):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(set(get_state(self.user.pk, self.model_set.pk)['answers']), self.valid_ids)
+
+    def test_finish_reconciles_posted_answers_and_clears_the_state(self):
+        self.start()
+        self.save({'q1': 'A', 'q2': 'B'})
+        answers, elapsed, started_at = finish(self.user.pk, self.model_set.pk, {'q2': 'C', 'q3': ''})
+        self.assertEqual(answers, {'q1': 'A', 'q2': 'C'})
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertIsNotNone(started_at)
+        self.assertIsNone(get_state(self.user.pk, self.model_set.pk))
+        self.assertIsNone(self.draft())
+
+    def test_finish_after_the_deadline_keeps_only_saved_answers(self):
+        self.start(600)
+        self.save({'q1': 'A'})
+        self.expire()
+        answers, elapsed, _ = finish(self.user.pk, self.model_set.pk, {'q1': 'B', 'q2': 'C'})
+        self.assertEqual(answers, {'q1': 'A'})
+        self.assertLessEqual(elapsed, 600)
+
+    def test_finish_without_a_running_test_takes_the_post(self):
+        self.assertEqual(finish(self.user.pk, self.model_set.pk, {'q1': 'A'}), ({'q1': 'A'}, 0, None))
+
+
+@override_settings(SHARED_CACHE_ALIASES=[])
+class ProcessLocalCacheAutosaveTests(AutosaveTestCase):
+    def test_deltas_are_written_straight_to_the_draft(self):
+        self.start()
+        self.save({'q1': 'A'})
+        self.assertEqual(self.draft()['answers'], {'q1': 'A'})
+
+    def test_deltas_from_different_workers_are_merged(self):
+        self.start()
+        self.save({'q1': 'A'})
+        # Another worker never saw this process's cache
+        cache.clear()
+        state = self.save({'q2': 'B'})
+        self.assertEqual(state['answers'], {'q1': 'A', 'q2': 'B'})
+        self.assertEqual(self.draft()['answers'], {'q1': 'A', 'q2': 'B'})
+
+    def test_saving_after_the_deadline_fails(self):
+        self.start()
+        self.expire()
+        with self.assertRaises(DeadlinePassed):
+            self.save({'q1': 'A'})
+        self.assertEqual(self.draft()['answers'], {})
+
+    def test_finish_removes_the_draft(self):
+        self.start()
+        self.save({'q1': 'A'})
+        answers, _, _ = finish(self.user.pk, self.model_set.pk, {})
+        self.assertEqual(answers, {'q1': 'A'})
+        self.assertIsNone(self.draft())
+
+
+class AutosaveViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.model_set = ModelSet.objects.create(title='Set 1', timer_minutes=30)
+        self.question = ModelSetQuestion.objects.create(
+            model_set=self.model_set, question_text='Q', option_a='1', option_b='2', option_c='3', option_d='4', correct_option='A',
+        )
+        self.url = f'/model-sets/{self.model_set.pk}/autosave/'
+        self.client.force_login(self.user)
+
+    def test_saves_posted_answers(self):
+        self.client.get(f'/model-sets/{self.model_set.pk}/test/')
+        response = self.client.post(self.url, {f'answer_{self.question.pk}': 'C'})
+        self.assertEqual(response.json()['saved'], 1)
+        self.assertGreater(response.json()['remaining'], 0)
+
+    def test_accepts_json_deltas(self):
+        self.client.get(f'/model-sets/{self.model_set.pk}/test/')
+        response = self.client.post(self.url, {str(self.question.pk): 'B'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.assertEqual(self.client.post('/model-sets/not-an-id/autosave/').status_code, 404)
+        self.assertEqual(self.client.post(self.url, 'nope', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(self.url, '[1]', content_type='application/json').status_code, 400)
+
+    def test_conflict_without_a_running_test(self):
+        response = self.client.post(self.url, {f'answer_{self.question.pk}': 'C'})
+        self.assertEqual(response.status_code, 409)
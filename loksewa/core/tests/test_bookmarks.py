@@ -0,0 +1,136 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.bookmarks import bookmark_ids, toggle_bookmark
+from core.contenttypes import content_type_of
+from core.models import Article, Bookmark, Note, ObjectiveMCQ, ObjectiveSet, ObjectiveSubject, User
+from core.querycount import record_queries
+
+
+class ToggleBookmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.note = Note.objects.create(title='Constitution', file='notes/constitution.pdf')
+        self.content_type = content_type_of(Note)
+
+    def test_toggle_adds_then_removes(self):
+        self.assertEqual(toggle_bookmark(self.user, self.content_type, self.note.pk), 'added')
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset({str(self.note.pk)}))
+        self.assertEqual(toggle_bookmark(self.user, self.content_type, self.note.pk), 'removed')
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset())
+
+    def test_toggle_decides_from_the_database(self):
+        bookmark_ids(self.user, self.content_type)
+        # Bookmarked elsewhere after the set was read
+        Bookmark.objects.create(user=self.user, content_type=self.content_type, object_id=str(self.note.pk))
+        self.assertEqual(toggle_bookmark(self.user, self.content_type, self.note.pk), 'removed')
+        self.assertFalse(Bookmark.objects.filter(user=self.user).exists())
+
+    def test_anonymous_users_have_no_bookmarks(self):
+        self.assertEqual(bookmark_ids(AnonymousUser(), self.content_type), frozenset())
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_shared_cache_holds_the_set_until_a_toggle(self):
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset())
+        Bookmark.objects.create(user=self.user, content_type=self.content_type, object_id=str(self.note.pk))
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset())
+        toggle_bookmark(self.user, self.content_type, self.note.pk)
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset())
+
+    @override_settings(SHARED_CACHE_ALIASES=[])
+    def test_process_local_cache_is_bypassed(self):
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset())
+        Bookmark.objects.create(user=self.user, content_type=self.content_type, object_id=str(self.note.pk))
+        self.assertEqual(bookmark_ids(self.user, self.content_type), frozenset({str(self.note.pk)}))
+
+
+class ToggleBookmarkViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.note = Note.objects.create(title='Constitution', file='notes/constitution.pdf')
+        self.client.force_login(self.user)
+
+    def test_ajax_toggle_returns_the_status(self):
+        url = f'/bookmark/note/{self.note.pk}/'
+        response = self.client.post(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), {'status': 'added'})
+        response = self.client.post(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), {'status': 'removed'})
+
+    def test_plain_toggle_redirects_back(self):
+        response = self.client.post(f'/bookmark/note/{self.note.pk}/', HTTP_REFERER='/notes/')
+        self.assertRedirects(response, '/notes/', fetch_redirect_response=False)
+
+    def test_unknown_targets_are_not_found(self):
+        self.assertEqual(self.client.post(f'/bookmark/user/{self.note.pk}/').status_code, 404)
+        self.assertEqual(self.client.post('/bookmark/note/not-an-id/').status_code, 404)
+
+    def test_notes_page_marks_bookmarked_notes(self):
+        Bookmark.objects.create(user=self.user, content_type=content_type_of(Note), object_id=str(self.note.pk))
+        response = self.client.get('/notes/')
+        self.assertIn(str(self.note.pk), response.context['bookmarks'])
+
+
+class MyBookmarksTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.client.force_login(self.user)
+        subject = ObjectiveSubject.objects.create(name='Constitution')
+        self.mcq_set = ObjectiveSet.objects.create(subject=subject, title='Set 1')
+        self.note = Note.objects.create(title='Fundamental rights', file='notes/rights.pdf')
+        self.article = Article.objects.create(title='Exam tips', content='Read twice.')
+        self.mcq = ObjectiveMCQ.objects.create(
+            set=self.mcq_set, question='How many provinces?', option_a='5', option_b='6', option_c='7', option_d='8',
+            correct_answer='C',
+        )
+        for target in (self.note, self.article, self.mcq):
+            self.bookmark(target)
+
+    def bookmark(self, target):
+        Bookmark.objects.create(user=self.user, content_type=content_type_of(type(target)), object_id=str(target.pk))
+
+    def test_lists_bookmarks_newest_first(self):
+        response = self.client.get('/bookmarks/', {'format': 'json'})
+        results = response.json()['results']
+        self.assertEqual([item['id'] for item in results], [str(self.mcq.pk), str(self.article.pk), str(self.note.pk)])
+        self.assertEqual(results[1]['url'], f'/blog/{self.article.pk}/')
+        self.assertEqual(results[0]['title'], str(self.mcq))
+
+    def test_targets_are_loaded_once_per_content_type(self):
+        with record_queries() as few:
+            self.client.get('/bookmarks/', {'format': 'json'})
+        for i in range(5):
+            self.bookmark(Note.objects.create(title=f'Note {i}', file=f'notes/{i}.pdf'))
+        with record_queries() as many:
+            self.client.get('/bookmarks/', {'format': 'json'})
+        self.assertEqual(len(many), len(few))
+
+    def test_deleted_targets_are_skipped(self):
+        self.article.delete()
+        results = self.client.get('/bookmarks/', {'format': 'json'}).json()['results']
+        self.assertEqual([item['id'] for item in results], [str(self.mcq.pk), str(self.note.pk)])
+
+    def test_other_users_bookmarks_are_not_listed(self):
+        other = User.objects.create_user('other', password='pw')
+        Bookmark.objects.create(user=other, content_type=content_type_of(Note), object_id=str(Note.objects.create(title='Theirs', file='notes/x.pdf').pk))
+        results = self.client.get('/bookmarks/', {'format': 'json'}).json()['results']
+        self.assertNotIn('Theirs', [item['title'] for item in results])
+
+    def test_pages_follow_the_cursor(self):
+        first = self.client.get('/bookmarks/', {'format': 'json', 'limit': 2}).json()
+        self.assertEqual(len(first['results']), 2)
+        second = self.client.get('/bookmarks/', {'format': 'json', 'limit': 2, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([item['id'] for item in second['results']], [str(self.note.pk)])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_html_page_renders(self):
+        response = self.client.get('/bookmarks/')
+        self.assertContains(response, 'Fundamental rights')
+
+    def test_login_is_required(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/bookmarks/').status_code, 302)
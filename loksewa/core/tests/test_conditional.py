@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.conditional import conditional_page
+from core.pagecache import invalidate_groups
+
+
+@conditional_page('gk_detail')
+def detail_view(request, pk):
+    detail_view.calls += 1
+    return HttpResponse(f'entry {pk}')
+
+
+class ConditionalTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        detail_view.calls = 0
+
+    def get(self, user=None, **headers):
+        request = self.factory.get('/gk/e1/', **headers)
+        request.user = user or AnonymousUser()
+        return detail_view(request, pk='e1')
+
+
+@override_settings(SHARED_CACHE_ALIASES=['default'])
+class SharedCacheConditionalTests(ConditionalTestCase):
+    def test_sets_validators_and_cache_control(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(detail_view.calls, 1)
+
+    def test_edits_change_the_etag(self):
+        etag = self.get()['ETag']
+        invalidate_groups(['gk:e1'])
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_pages_do_not_change_the_etag(self):
+        etag = self.get()['ETag']
+        invalidate_groups(['gk:e2', 'pradesh_list'])
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_validators_are_per_viewer(self):
+        etag = self.get()['ETag']
+        user = mock.Mock(is_authenticated=True, pk=1)
+        self.assertEqual(self.get(user, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_last_modified_revalidation(self):
+        last_modified = self.get()['Last-Modified']
+        self.assertEqual(self.get(HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+
+@override_settings(SHARED_CACHE_ALIASES=[])
+class ProcessLocalConditionalTests(ConditionalTestCase):
+    def test_no_validators_without_a_shared_cache(self):
+        response = self.get()
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_revalidation_always_renders(self):
+        response = self.get(HTTP_IF_NONE_MATCH='"anything"', HTTP_IF_MODIFIED_SINCE='Sat, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(detail_view.calls, 1)
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase
+
+from core import contenttypes
+from core.bookmarks import toggle_bookmark
+from core.contenttypes import (
+    bookmark_content_types, content_type_for, content_type_of, model_for_content_type_id, warm_content_types,
+)
+from core.models import Article, Note, ObjectiveMCQ, User
+from core.querycount import record_queries
+
+
+class RegistryTests(TestCase):
+    def test_allowlisted_names_resolve(self):
+        content_type = content_type_for('note')
+        self.assertIs(content_type.model_class(), Note)
+        self.assertEqual(content_type_of(ObjectiveMCQ).model, 'objectivemcq')
+
+    def test_other_names_are_rejected(self):
+        for name in ('user', 'bookmark', 'Note', ''):
+            with self.assertRaises(LookupError):
+                content_type_for(name)
+
+    def test_mapping_is_read_only(self):
+        with self.assertRaises(TypeError):
+            bookmark_content_types()['user'] = content_type_for('note')
+
+    def test_ids_map_back_to_models(self):
+        self.assertIs(model_for_content_type_id(content_type_for('article').pk), Article)
+        self.assertIsNone(model_for_content_type_id(-1))
+
+    def test_toggle_does_not_look_up_content_types(self):
+        user = User.objects.create_user('reader', password='pw')
+        note = Note.objects.create(title='Constitution', file='notes/constitution.pdf')
+        content_type = content_type_for('note')
+        with record_queries() as recorder:
+            toggle_bookmark(user, content_type, note.pk)
+        self.assertNotIn('django_content_type', [query.collection for query in recorder.operations])
+
+
+class WarmRegistryTests(SimpleTestCase):
+    def setUp(self):
+        registry = contenttypes._registry
+        self.addCleanup(setattr, contenttypes, '_registry', registry)
+        contenttypes._registry = None
+
+    def test_database_errors_defer_loading(self):
+        with mock.patch('core.contenttypes._load', side_effect=DatabaseError('down')):
+            with self.assertLogs('core.contenttypes', 'WARNING'):
+                warm_content_types()
+        self.assertIsNone(contenttypes._registry)
+
+    def test_registry_loads_once(self):
+        loaded = ({}, {})
+        with mock.patch('core.contenttypes._load', return_value=loaded) as load:
+            warm_content_types()
+            bookmark_content_types()
+        load.assert_called_once_with()
@@ -0,0 +1,245 @@
+import csv
+import io
+import json
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.importers import (
+    detect_format, import_model_set_questions, import_objective_mcqs, iter_pasted, iter_rows, normalize_mcq, question_hash,
+)
+from core.models import ModelSet, ModelSetQuestion, ObjectiveMCQ, ObjectiveSet, ObjectiveSubject, User
+from core.stats import objective_counts
+
+CSV_BANK = (
+    'question_text,option_a,option_b,option_c,option_d,correct_option,explanation\n'
+    'Largest province?,Karnali,Bagmati,Koshi,Gandaki,a,By area\n'
+    'Missing option?,One,Two,,Four,B,\n'
+    'Capital?,Kathmandu,Pokhara,Biratnagar,Butwal,A,\n'
+)
+JSON_ROWS = [
+    {'question': 'Largest province?', 'a': 'Karnali', 'b': 'Bagmati', 'c': 'Koshi', 'd': 'Gandaki', 'answer': 'A'},
+    {'question': 'Bad answer?', 'a': '1', 'b': '2', 'c': '3', 'd': '4', 'answer': 'E'},
+]
+PASTED_BANK = """
+Which is the largest province of Nepal?
+A) Karnali
+B) Bagmati
+C) Koshi
+D) Gandaki
+Answer: A
+Explanation: By area.
+
+Which river is the longest
+in Nepal?
+(a) Karnali
+(b) Koshi
+(c) Gandaki
+(d) Bagmati
+Correct - a
+"""
+
+
+def upload(name, content):
+    return SimpleUploadedFile(name, content.encode('utf-8'))
+
+
+class ReaderTests(SimpleTestCase):
+    def test_format_is_detected_from_the_extension(self):
+        self.assertEqual(detect_format('bank.CSV'), 'csv')
+        self.assertEqual(detect_format('bank.json'), 'json')
+        self.assertEqual(detect_format('bank.ndjson'), 'jsonl')
+        self.assertEqual(detect_format('bank.txt', 'XLSX'), 'xlsx')
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'Unsupported import format'):
+            detect_format('bank.docx')
+
+    def test_csv_rows_carry_their_line_numbers(self):
+        rows = list(iter_rows(upload('bank.csv', CSV_BANK)))
+        self.assertEqual([line_no for line_no, row in rows], [2, 3, 4])
+        self.assertEqual(rows[0][1]['question_text'], 'Largest province?')
+
+    def test_jsonl_skips_blank_lines(self):
+        content = json.dumps(JSON_ROWS[0]) + '\n\n' + json.dumps(JSON_ROWS[1]) + '\n'
+        rows = list(iter_rows(upload('bank.jsonl', content)))
+        self.assertEqual([line_no for line_no, row in rows], [1, 3])
+
+    def test_json_array_yields_one_row_per_item(self):
+        rows = list(iter_rows(upload('bank.json', json.dumps(JSON_ROWS))))
+        self.assertEqual(rows, [(1, JSON_ROWS[0]), (2, JSON_ROWS[1])])
+
+    def test_json_must_be_an_array(self):
+        with self.assertRaisesMessage(ValueError, 'must hold an array'):
+            list(iter_rows(upload('bank.json', json.dumps(JSON_ROWS[0]))))
+
+    def test_malformed_json_is_reported(self):
+        with self.assertRaisesMessage(ValueError, 'Invalid JSON'):
+            list(iter_rows(upload('bank.json', '[{"question": ')))
+
+    def test_corrupt_xlsx_is_reported(self):
+        with self.assertRaisesMessage(ValueError, 'Invalid XLSX file'):
+            list(iter_rows(SimpleUploadedFile('bank.xlsx', b'not a workbook')))
+
+    def test_malformed_csv_is_reported(self):
+        oversized = 'question_text\n' + 'x' * (csv.field_size_limit() + 1) + '\n'
+        with self.assertRaisesMessage(ValueError, 'Invalid CSV on line'):
+            list(iter_rows(upload('bank.csv', oversized)))
+
+    def test_normalize_accepts_aliases_and_lowercase_answers(self):
+        row = normalize_mcq({'Question': ' Capital? ', 'A': 'Kathmandu', 'B': 'Pokhara', 'C': 'Dharan', 'D': 'Butwal', 'Correct': 'a'})
+        self.assertEqual(row['question'], 'Capital?')
+        self.assertEqual(row['correct'], 'A')
+        self.assertEqual(row['explanation'], '')
+
+    def test_normalize_rejects_invalid_rows(self):
+        base = {'question': 'Q', 'a': '1', 'b': '2', 'c': '3', 'd': '4', 'answer': 'A'}
+        cases = [
+            ({**base, 'question': ' '}, 'Question text is missing.'),
+            ({**base, 'c': ''}, 'Option C is missing.'),
+            ({**base, 'd': 'x' * 501}, 'Option D is longer than 500 characters.'),
+            ({**base, 'answer': 'E'}, 'Correct option must be one of A, B, C or D.'),
+            ('[1, 2]', 'Row is not an object.'),
+        ]
+        for raw, message in cases:
+            with self.subTest(message=message), self.assertRaisesMessage(ValueError, message):
+                normalize_mcq(raw)
+
+    def test_xlsx_rows_are_read_after_the_header(self):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            self.skipTest('openpyxl is not installed')
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_option'])
+        sheet.append(['Capital?', 'Kathmandu', 'Pokhara', 'Dharan', 'Butwal', 'A'])
+        sheet.append([None] * 6)
+        data = io.BytesIO()
+        workbook.save(data)
+        data.seek(0)
+        rows = list(iter_rows(data, 'bank.xlsx'))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][0], 2)
+        self.assertEqual(normalize_mcq(rows[0][1])['option_a'], 'Kathmandu')
+
+
+class ImportModelSetQuestionsTests(TestCase):
+    def setUp(self):
+        self.model_set = ModelSet.objects.create(title='Set 1')
+
+    def test_valid_rows_are_inserted_and_invalid_ones_reported(self):
+        report = import_model_set_questions(self.model_set, iter_rows(upload('bank.csv', CSV_BANK)), batch_size=1)
+        self.assertEqual(report.inserted, 2)
+        self.assertEqual(report.errors, [(3, 'Option C is missing.')])
+        question = ModelSetQuestion.objects.get(model_set=self.model_set, question_text='Largest province?')
+        self.assertEqual((question.correct_option, question.explanation), ('A', 'By area'))
+
+    def test_json_array_upload_through_the_view(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.post(
+            f'/admin/model-set-questions/{self.model_set.pk}/import/', {'file': upload('bank.json', json.dumps(JSON_ROWS))},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['report'].inserted, 1)
+        self.assertEqual(response.context['errors'], [(2, 'Correct option must be one of A, B, C or D.')])
+
+    def test_json_object_upload_is_rejected_with_a_message(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.post(
+            f'/admin/model-set-questions/{self.model_set.pk}/import/', {'file': upload('bank.json', json.dumps(JSON_ROWS[0]))},
+        )
+        self.assertContains(response, 'must hold an array')
+        self.assertFalse(ModelSetQuestion.objects.filter(model_set=self.model_set).exists())
+
+    def test_corrupt_xlsx_upload_is_rejected_with_a_message(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.post(
+            f'/admin/model-set-questions/{self.model_set.pk}/import/', {'file': SimpleUploadedFile('bank.xlsx', b'not a workbook')},
+        )
+        self.assertContains(response, 'Invalid XLSX file')
+
+    def test_malformed_set_id_redirects_to_the_set_list(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.get('/admin/model-set-questions/not-an-id/import/')
+        self.assertRedirects(response, '/admin/manage-model-sets/', fetch_redirect_response=False)
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)], ['Model Set not found!'])
+
+
+class PastedBankTests(SimpleTestCase):
+    def test_blocks_are_split_on_blank_lines(self):
+        rows = list(iter_pasted(PASTED_BANK))
+        self.assertEqual([line_no for line_no, row in rows], [2, 10])
+        first, second = rows[0][1], rows[1][1]
+        self.assertEqual(first['question'], 'Which is the largest province of Nepal?')
+        self.assertEqual((first['option_a'], first['correct'], first['explanation']), ('Karnali', 'A', 'By area.'))
+        self.assertEqual(second['question'], 'Which river is the longest in Nepal?')
+        self.assertEqual((second['option_d'], second['correct']), ('Bagmati', 'a'))
+
+    def test_incomplete_block_fails_validation(self):
+        (line_no, row), = iter_pasted('Question without options?\nAnswer: A')
+        with self.assertRaisesMessage(ValueError, 'Option A is missing.'):
+            normalize_mcq(row)
+
+    def test_question_hash_ignores_case_punctuation_and_spacing(self):
+        self.assertEqual(question_hash('Capital of  Nepal?'), question_hash('capital of nepal'))
+        self.assertNotEqual(question_hash('Capital of Nepal?'), question_hash('Capital of India?'))
+
+
+class ImportObjectiveMCQsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.obj_set = ObjectiveSet.objects.create(subject=ObjectiveSubject.objects.create(name='GK'), title='Set 1')
+        ObjectiveMCQ.objects.create(
+            set=self.obj_set, question='Which is the largest province of Nepal?',
+            option_a='Karnali', option_b='Bagmati', option_c='Koshi', option_d='Gandaki', correct_answer='A',
+        )
+
+    def questions(self):
+        return sorted(ObjectiveMCQ.objects.filter(set=self.obj_set).values_list('question', flat=True))
+
+    def test_questions_already_in_the_set_are_skipped(self):
+        report = import_objective_mcqs(self.obj_set, iter_pasted(PASTED_BANK))
+        self.assertEqual((report.inserted, report.duplicates, report.errors), (1, 1, []))
+        self.assertEqual(self.questions(), ['Which is the largest province of Nepal?', 'Which river is the longest in Nepal?'])
+
+    def test_repeats_within_one_file_are_skipped(self):
+        rows = [(1, {**JSON_ROWS[0], 'question': 'Capital?'}), (2, {**JSON_ROWS[0], 'question': 'capital'})]
+        report = import_objective_mcqs(self.obj_set, rows, batch_size=1)
+        self.assertEqual((report.inserted, report.duplicates), (1, 1))
+
+    def test_same_question_in_another_set_is_not_a_duplicate(self):
+        other = ObjectiveSet.objects.create(subject=self.obj_set.subject, title='Set 2')
+        report = import_objective_mcqs(other, iter_pasted(PASTED_BANK))
+        self.assertEqual((report.inserted, report.duplicates), (2, 0))
+
+    def test_import_refreshes_the_cached_counts(self):
+        self.assertEqual(objective_counts()['sets'][self.obj_set.pk], 1)
+        import_objective_mcqs(self.obj_set, iter_pasted(PASTED_BANK))
+        self.assertEqual(objective_counts()['sets'][self.obj_set.pk], 2)
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_counts_are_refreshed_when_an_import_fails_part_way(self):
+        objective_counts()
+
+        def rows():
+            yield from iter_pasted(PASTED_BANK)
+            raise ValueError('Invalid CSV on line 12')
+
+        other = ObjectiveSet.objects.create(subject=self.obj_set.subject, title='Set 2')
+        with self.assertRaises(ValueError):
+            import_objective_mcqs(other, rows(), batch_size=1)
+        self.assertEqual(objective_counts()['sets'][other.pk], 2)
+
+    def test_pasted_block_through_the_view(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.post(f'/manage-objective-mcqs/{self.obj_set.pk}/', {
+            'mode': 'bulk', 'block': PASTED_BANK + '\nBroken question?\nA) only one option\n',
+        })
+        self.assertRedirects(response, f'/manage-objective-mcqs/{self.obj_set.pk}/', fetch_redirect_response=False)
+        self.assertEqual(
+            [str(m) for m in get_messages(response.wsgi_request)],
+            ['1 MCQs imported, 1 duplicates skipped, 1 rows rejected.', 'Line 18: Option B is missing.'],
+        )
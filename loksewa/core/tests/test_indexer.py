@@ -0,0 +1,139 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core import indexer
+from core.indexer import CHILDREN, DELETE, UPSERT, IndexQueue, drain_persistent_queue, enqueue, local_queue, queue_collection
+from core.models import Article, GKEntry, GKQuestion
+from core.search import rebuild_index, search_collection
+
+
+class IndexQueueTests(SimpleTestCase):
+    def setUp(self):
+        self.queue = IndexQueue(delay=60)
+        patcher = mock.patch('core.indexer.apply_changes')
+        self.apply_changes = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_edits_coalesce(self):
+        for _ in range(10):
+            self.queue.put('article', UPSERT, 'a1')
+        self.queue.put('article', UPSERT, 'a2')
+        self.assertEqual(self.queue.flush(), 2)
+        upserts, deletes, parents = self.apply_changes.call_args.args
+        self.assertEqual(upserts, {'article': {'a1', 'a2'}})
+        self.assertEqual(dict(deletes), {})
+
+    def test_the_last_event_for_an_object_wins(self):
+        self.queue.put('article', UPSERT, 'a1')
+        self.queue.put('article', DELETE, 'a1')
+        self.queue.flush()
+        upserts, deletes, parents = self.apply_changes.call_args.args
+        self.assertEqual(dict(upserts), {})
+        self.assertEqual(deletes, {'article': {'a1'}})
+
+    def test_parent_refreshes_are_kept_apart_from_object_events(self):
+        self.queue.put('gk_question', UPSERT, 'e1')
+        self.queue.put('gk_question', CHILDREN, 'e1')
+        self.assertEqual(self.queue.flush(), 2)
+        upserts, deletes, parents = self.apply_changes.call_args.args
+        self.assertEqual(parents, {'gk_question': {'e1'}})
+
+    def test_flushing_an_empty_queue_writes_nothing(self):
+        self.assertEqual(self.queue.flush(), 0)
+        self.apply_changes.assert_not_called()
+
+    def test_failed_batch_is_queued_again(self):
+        self.queue.put('article', UPSERT, 'a1')
+        self.apply_changes.side_effect = ConnectionError
+        with self.assertRaises(ConnectionError):
+            self.queue.flush()
+        self.apply_changes.side_effect = None
+        self.assertEqual(self.queue.flush(), 1)
+        upserts, deletes, parents = self.apply_changes.call_args.args
+        self.assertEqual(upserts, {'article': {'a1'}})
+
+    def test_newer_events_win_over_a_failed_batch(self):
+        self.queue.put('article', UPSERT, 'a1')
+        events = self.queue._take()
+        self.queue.put('article', DELETE, 'a1')
+        self.queue._requeue(events)
+        self.queue.flush()
+        upserts, deletes, parents = self.apply_changes.call_args.args
+        self.assertEqual(deletes, {'article': {'a1'}})
+
+    def test_events_are_dropped_after_the_last_retry(self):
+        queue = IndexQueue(delay=60, max_retries=2)
+        queue.put('article', UPSERT, 'a1')
+        self.apply_changes.side_effect = ConnectionError
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                queue.flush()
+        with self.assertLogs('core.indexer', 'ERROR') as logs, self.assertRaises(ConnectionError):
+            queue.flush()
+        self.assertIn('Dropped 1 search index updates', logs.output[0])
+        self.assertEqual(queue.flush(), 0)
+
+
+class LocalQueueTests(TestCase):
+    def setUp(self):
+        local_queue.flush()
+        rebuild_index()
+
+    def test_saves_are_indexed_on_flush(self):
+        article = Article.objects.create(title='Budget speech', content='Highlights')
+        self.assertIsNone(search_collection().find_one({'_id': f'article:{article.pk}'}))
+        local_queue.flush()
+        self.assertEqual(search_collection().find_one({'_id': f'article:{article.pk}'})['title'], 'Budget speech')
+
+    def test_save_then_delete_leaves_no_document(self):
+        article = Article.objects.create(title='Draft', content='')
+        article.delete()
+        local_queue.flush()
+        self.assertIsNone(search_collection().find_one({'_id': f'article:{article.pk}'}))
+
+
+class PersistentQueueTests(TestCase):
+    def setUp(self):
+        local_queue.flush()
+        patcher = mock.patch('core.indexer.SEARCH_INDEX_MODE', 'mongo')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        queue_collection().delete_many({})
+        rebuild_index()
+        self.entry = GKEntry.objects.create(type='nepal', title='Rivers')
+        self.question = GKQuestion.objects.create(entry=self.entry, question='Longest river?', answer='Karnali')
+
+    def test_events_are_queued_in_mongo(self):
+        self.assertEqual(queue_collection().count_documents({}), 2)
+        self.assertEqual(local_queue.flush(), 0)
+
+    def test_requeueing_bumps_the_version(self):
+        enqueue('gk_question', UPSERT, self.question.pk)
+        row = queue_collection().find_one({'kind': 'gk_question'})
+        self.assertEqual(row['version'], 2)
+
+    def test_drain_applies_and_removes_events(self):
+        self.assertEqual(drain_persistent_queue(), 2)
+        self.assertEqual(queue_collection().count_documents({}), 0)
+        self.assertIsNotNone(search_collection().find_one({'_id': f'gk_question:{self.question.pk}'}))
+        self.assertEqual(drain_persistent_queue(), 0)
+
+    def test_events_queued_during_a_drain_survive_it(self):
+        real_apply = indexer._apply
+
+        def apply_and_edit(events):
+            enqueue('gk_question', UPSERT, self.question.pk)
+            return real_apply(events)
+
+        with mock.patch('core.indexer._apply', apply_and_edit):
+            drain_persistent_queue()
+        self.assertEqual(queue_collection().count_documents({}), 1)
+
+    def test_run_indexer_once(self):
+        out = StringIO()
+        call_command('run_indexer', '--once', stdout=out)
+        self.assertIn('Applied 2 search index updates', out.getvalue())
+        self.assertEqual(queue_collection().count_documents({}), 0)
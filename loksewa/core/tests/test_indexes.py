@@ -0,0 +1,105 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from pymongo import ASCENDING, DESCENDING
+
+from core.indexes import VIEW_QUERIES, _matches, _plan_stages, ensure_indexes, index_specs
+from core.models import Bookmark, GKEntry
+from core.mongo import collection_for
+
+
+def _info(spec, unique=None):
+    info = {'key': list(spec.keys), 'v': 2}
+    if unique if unique is not None else spec.unique:
+        info['unique'] = True
+    return info
+
+
+class MatchTests(SimpleTestCase):
+    def setUp(self):
+        self.spec = next(spec for spec in index_specs(Bookmark) if spec.unique)
+
+    def test_same_keys_and_uniqueness_match(self):
+        self.assertTrue(_matches(_info(self.spec), self.spec))
+
+    def test_uniqueness_must_agree(self):
+        self.assertFalse(_matches(_info(self.spec, unique=False), self.spec))
+
+    def test_bookmark_listing_is_declared(self):
+        specs = {spec.name: spec for spec in index_specs(Bookmark)}
+        self.assertEqual(specs['bookmark_user_idx'].keys, [('user_id', ASCENDING), ('id', DESCENDING)])
+
+    def test_key_order_and_direction_matter(self):
+        info = _info(self.spec)
+        self.assertFalse(_matches(dict(info, key=info['key'][::-1]), self.spec))
+        self.assertFalse(_matches(dict(info, key=[(name, -1) for name, _ in info['key']]), self.spec))
+
+
+class EnsureIndexesTests(SimpleTestCase):
+    def setUp(self):
+        self.spec = index_specs(GKEntry)[0]
+        self.collection = mock.Mock()
+        patcher = mock.patch('core.indexes.collection_for', return_value=self.collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def ensure(self, existing, **kwargs):
+        self.collection.index_information.return_value = dict({'_id_': {'key': [('_id', 1)]}}, **existing)
+        return {result.name: result for result in ensure_indexes([GKEntry], **kwargs)}
+
+    def test_missing_index_is_created(self):
+        result = self.ensure({})[self.spec.name]
+        self.assertEqual(result.status, 'created')
+        self.collection.create_index.assert_any_call(self.spec.keys, name=self.spec.name, unique=False)
+        self.collection.drop_index.assert_not_called()
+
+    def test_index_under_another_name_is_kept(self):
+        result = self.ensure({'type_1__id_1': _info(self.spec)})[self.spec.name]
+        self.assertEqual((result.status, result.detail), ('ok', 'as type_1__id_1'))
+        self.collection.drop_index.assert_not_called()
+
+    def test_name_taken_by_other_keys_is_rebuilt(self):
+        stale = {'key': [('type', 1)], 'v': 2}
+        result = self.ensure({self.spec.name: stale})[self.spec.name]
+        self.assertEqual(result.status, 'rebuilt')
+        self.collection.drop_index.assert_called_once_with(self.spec.name)
+
+    def test_same_keys_with_other_options_are_rebuilt(self):
+        result = self.ensure({'type_1__id_1': _info(self.spec, unique=True)})[self.spec.name]
+        self.assertEqual(result.status, 'rebuilt')
+        self.collection.drop_index.assert_called_once_with('type_1__id_1')
+
+    def test_dry_run_changes_nothing(self):
+        result = self.ensure({}, dry_run=True)[self.spec.name]
+        self.assertEqual(result.status, 'would be created')
+        self.collection.create_index.assert_not_called()
+
+    def test_dry_run_summary_counts_only_existing_indexes(self):
+        self.collection.index_information.return_value = {'_id_': {'key': [('_id', 1)]}}
+        out = StringIO()
+        with mock.patch('core.management.commands.ensure_indexes.ensure_indexes', wraps=lambda **kwargs: ensure_indexes([GKEntry], **kwargs)):
+            call_command('ensure_indexes', '--dry-run', '--skip-report', stdout=out)
+        self.assertIn('0 of 1 declared indexes in place, 1 would be created or rebuilt', out.getvalue())
+
+
+class EnsureIndexesDatabaseTests(TestCase):
+    def test_indexes_are_created_once(self):
+        collection_for(Bookmark).drop_indexes()
+        statuses = {result.status for result in ensure_indexes([Bookmark, GKEntry])}
+        self.assertNotIn('failed', statuses)
+        self.assertEqual({result.status for result in ensure_indexes([Bookmark, GKEntry])}, {'ok'})
+
+    def test_unique_declaration_is_in_place(self):
+        ensure_indexes([Bookmark])
+        unique = next(spec for spec in index_specs(Bookmark) if spec.unique)
+        info = collection_for(Bookmark).index_information()
+        self.assertTrue(any(_matches(index, unique) for index in info.values()))
+
+    def test_bookmark_listing_uses_the_index(self):
+        ensure_indexes([Bookmark])
+        view, model, criteria, sort = next(query for query in VIEW_QUERIES if query[0] == 'my_bookmarks')
+        plan = collection_for(model).find(criteria).sort(sort).explain()['queryPlanner']['winningPlan']
+        self.assertNotIn('COLLSCAN', _plan_stages(plan))
+        self.assertNotIn('SORT', _plan_stages(plan))
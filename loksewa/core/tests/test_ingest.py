@@ -0,0 +1,158 @@
+from bson import ObjectId
+from django.test import SimpleTestCase, TestCase
+
+from core.ingest import apply_qa_diff, bulk_ingest, diff_qa_pairs, ingest_qa_pairs
+from core.models import GKEntry, GKQuestion, Pradesh, PradeshQA, SubjectiveChapter, SubjectiveQA, SubjectiveSubject, User
+from core.signals import children_bulk_changed
+
+
+class SignalCatcher:
+    def __init__(self, test):
+        self.calls = []
+        children_bulk_changed.connect(self)
+        test.addCleanup(children_bulk_changed.disconnect, self)
+
+    def __call__(self, sender, parent, **kwargs):
+        self.calls.append((sender, parent.pk))
+
+
+class IngestQAPairsTests(TestCase):
+    def setUp(self):
+        self.entry = GKEntry.objects.create(type='nepal', title='Rivers')
+
+    def questions(self):
+        return sorted(GKQuestion.objects.filter(entry=self.entry).values_list('question', 'answer'))
+
+    def test_inserts_every_pair(self):
+        result = ingest_qa_pairs(GKQuestion, 'entry', self.entry, ['Longest?', 'Deepest?'], ['Karnali', 'Kali'])
+        self.assertEqual(result, (2, 0))
+        self.assertEqual(self.questions(), [('Deepest?', 'Kali'), ('Longest?', 'Karnali')])
+
+    def test_skips_blank_questions_and_pads_missing_answers(self):
+        result = ingest_qa_pairs(GKQuestion, 'entry', self.entry, ['Longest?', '  ', 'Widest?'], ['Karnali', 'x'])
+        self.assertEqual(result, (2, 1))
+        self.assertEqual(self.questions(), [('Longest?', 'Karnali'), ('Widest?', '')])
+
+    def test_require_answer_and_strip(self):
+        chapter = SubjectiveChapter.objects.create(subject=SubjectiveSubject.objects.create(name='History'), name='Modern')
+        result = ingest_qa_pairs(
+            SubjectiveQA, 'chapter', chapter, [' When? ', 'Who?'], [' 1990 ', ' '], require_answer=True, strip=True,
+        )
+        self.assertEqual(result, (1, 1))
+        self.assertEqual(list(SubjectiveQA.objects.filter(chapter=chapter).values_list('question', 'answer')), [('When?', '1990')])
+
+    def test_notifies_listeners_once_per_call(self):
+        catcher = SignalCatcher(self)
+        ingest_qa_pairs(GKQuestion, 'entry', self.entry, ['Longest?', 'Deepest?'], ['Karnali', 'Kali'])
+        self.assertEqual(catcher.calls, [(GKQuestion, self.entry.pk)])
+
+    def test_nothing_inserted_sends_no_signal(self):
+        catcher = SignalCatcher(self)
+        result = ingest_qa_pairs(GKQuestion, 'entry', self.entry, ['', ' '], ['a', 'b'])
+        self.assertEqual(result, (0, 2))
+        self.assertEqual(catcher.calls, [])
+        self.assertEqual(self.questions(), [])
+
+    def test_bulk_ingest_flushes_in_batches(self):
+        rows = ((f'Q{i}', f'A{i}') for i in range(5))
+        result = bulk_ingest(
+            GKQuestion, rows, lambda row: {'entry': self.entry, 'question': row[0], 'answer': row[1]}, batch_size=2,
+        )
+        self.assertEqual(result, (5, 0))
+        self.assertEqual(len(self.questions()), 5)
+
+    def test_manage_gk_creates_the_entry_and_its_questions(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.post('/manage-gk/', {
+            'type': 'world', 'title': 'Capitals', 'question': ['France?', '', 'Japan?'], 'answer': ['Paris', '', 'Tokyo'],
+        })
+        self.assertRedirects(response, '/manage-gk/', fetch_redirect_response=False)
+        entry = GKEntry.objects.get(title='Capitals')
+        self.assertEqual(GKQuestion.objects.filter(entry=entry).count(), 2)
+
+
+class DiffQAPairsTests(SimpleTestCase):
+    def setUp(self):
+        self.a, self.b = ObjectId(), ObjectId()
+        self.existing = {self.a: ('Q1', 'A1'), self.b: ('Q2', 'A2')}
+
+    def test_unchanged_rows_produce_no_changes(self):
+        diff = diff_qa_pairs(self.existing, [str(self.a), str(self.b)], ['Q1', 'Q2'], ['A1', 'A2'])
+        self.assertEqual(diff, ([], {}, []))
+
+    def test_edited_row_is_updated_in_place(self):
+        inserts, updates, deletes = diff_qa_pairs(self.existing, [str(self.a), str(self.b)], ['Q1', 'Q2'], ['A1', 'new'])
+        self.assertEqual((inserts, updates, deletes), ([], {self.b: ('Q2', 'new')}, []))
+
+    def test_rows_without_a_known_id_are_inserted(self):
+        inserts, updates, deletes = diff_qa_pairs(
+            self.existing, [str(self.a), str(self.b), '', 'garbage', str(ObjectId())],
+            ['Q1', 'Q2', 'Q3', 'Q4', 'Q5'], ['A1', 'A2', 'A3', 'A4', 'A5'],
+        )
+        self.assertEqual(inserts, [('Q3', 'A3'), ('Q4', 'A4'), ('Q5', 'A5')])
+        self.assertEqual((updates, deletes), ({}, []))
+
+    def test_missing_and_blanked_rows_are_deleted(self):
+        inserts, updates, deletes = diff_qa_pairs(self.existing, [str(self.a)], [' '], ['A1'])
+        self.assertEqual((inserts, updates), ([], {}))
+        self.assertCountEqual(deletes, [self.a, self.b])
+
+    def test_a_repeated_id_only_keeps_its_first_row(self):
+        inserts, updates, deletes = diff_qa_pairs(self.existing, [str(self.a), str(self.a)], ['Q1', 'Copy'], ['A1', 'A1'])
+        self.assertEqual(inserts, [('Copy', 'A1')])
+        self.assertEqual(deletes, [self.b])
+
+
+class ApplyQADiffTests(TestCase):
+    def setUp(self):
+        self.pradesh = Pradesh.objects.create(province=3, title='Bagmati facts')
+        self.keep = PradeshQA.objects.create(pradesh=self.pradesh, question='Capital?', answer='Hetauda')
+        self.edit = PradeshQA.objects.create(pradesh=self.pradesh, question='Districts?', answer='12')
+        self.drop = PradeshQA.objects.create(pradesh=self.pradesh, question='Old?', answer='Old')
+
+    def rows(self):
+        return {qa.pk: (qa.question, qa.answer) for qa in PradeshQA.objects.filter(pradesh=self.pradesh)}
+
+    def test_applies_inserts_updates_and_deletes(self):
+        catcher = SignalCatcher(self)
+        diff = apply_qa_diff(
+            PradeshQA, 'pradesh', self.pradesh,
+            [str(self.keep.pk), str(self.edit.pk), ''], ['Capital?', 'Districts?', 'River?'], ['Hetauda', '13', 'Bagmati'],
+        )
+        self.assertEqual(diff, (1, 1, 1))
+        rows = self.rows()
+        self.assertEqual(rows[self.keep.pk], ('Capital?', 'Hetauda'))
+        self.assertEqual(rows[self.edit.pk], ('Districts?', '13'))
+        self.assertNotIn(self.drop.pk, rows)
+        self.assertIn(('River?', 'Bagmati'), rows.values())
+        self.assertEqual(catcher.calls, [(PradeshQA, self.pradesh.pk)])
+
+    def test_unchanged_post_writes_nothing(self):
+        catcher = SignalCatcher(self)
+        before = self.rows()
+        diff = apply_qa_diff(
+            PradeshQA, 'pradesh', self.pradesh,
+            [str(qa.pk) for qa in (self.keep, self.edit, self.drop)], ['Capital?', 'Districts?', 'Old?'], ['Hetauda', '12', 'Old'],
+        )
+        self.assertEqual(diff, (0, 0, 0))
+        self.assertEqual(self.rows(), before)
+        self.assertEqual(catcher.calls, [])
+
+    def test_other_parents_are_untouched(self):
+        other = Pradesh.objects.create(province=4, title='Gandaki facts')
+        theirs = PradeshQA.objects.create(pradesh=other, question='Capital?', answer='Pokhara')
+        apply_qa_diff(PradeshQA, 'pradesh', self.pradesh, [str(theirs.pk)], ['Capital?'], ['Changed'])
+        self.assertEqual(PradeshQA.objects.get(pk=theirs.pk).answer, 'Pokhara')
+        self.assertEqual(list(self.rows().values()), [('Capital?', 'Changed')])
+
+    def test_edit_gk_keeps_ids_of_untouched_questions(self):
+        entry = GKEntry.objects.create(type='nepal', title='Rivers')
+        kept = GKQuestion.objects.create(entry=entry, question='Longest?', answer='Karnali')
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        self.client.post(f'/edit-gk/{entry.pk}/', {
+            'type': 'nepal', 'title': 'Rivers', 'question_id': [str(kept.pk), ''],
+            'question': ['Longest?', 'Deepest?'], 'answer': ['Karnali', 'Kali'],
+        })
+        questions = {qa.question: qa.pk for qa in GKQuestion.objects.filter(entry=entry)}
+        self.assertEqual(questions['Longest?'], kept.pk)
+        self.assertIn('Deepest?', questions)
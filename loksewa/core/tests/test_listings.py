@@ -0,0 +1,82 @@
+import importlib
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.models import Article, Category, CurrentEvent, ModelSet, User
+from core.querycount import assert_max_queries
+from core.text import summarize
+
+LONG_BODY = '<p>The <b>Constitution</b> of Nepal&nbsp;2072</p>\n' + 'word ' * 500
+
+excerpts_migration = importlib.import_module('core.migrations.0007_excerpts')
+
+
+class ExcerptMigrationTests(SimpleTestCase):
+    def test_frozen_excerpt_matches_the_current_rules(self):
+        self.assertEqual(excerpts_migration.make_excerpt(LONG_BODY), summarize(LONG_BODY)['excerpt'])
+
+    def test_empty_bodies_have_empty_excerpts(self):
+        self.assertEqual(excerpts_migration.make_excerpt(None), '')
+
+
+class SavedExcerptTests(TestCase):
+    def test_excerpt_is_derived_on_save(self):
+        article = Article.objects.create(title='Constitution', content=LONG_BODY, category='blog')
+        self.assertTrue(article.excerpt.startswith('The Constitution of Nepal 2072 word'))
+        self.assertTrue(article.excerpt.endswith('…'))
+        self.assertEqual(Article.objects.get(pk=article.pk).excerpt, article.excerpt)
+
+    def test_partial_saves_of_the_body_refresh_the_excerpt(self):
+        event = CurrentEvent.objects.create(title='Budget', description='Old text')
+        event.description = 'New text'
+        event.save(update_fields=['description'])
+        self.assertEqual(CurrentEvent.objects.get(pk=event.pk).excerpt, 'New text')
+
+
+class ListingFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.client.force_login(self.user)
+
+    def test_blog_leaves_the_content_in_the_database(self):
+        for i in range(4):
+            Article.objects.create(title=f'Post {i}', content=LONG_BODY, category='blog')
+        with assert_max_queries(repeat_threshold=3):
+            response = self.client.get(reverse('blog'))
+        self.assertContains(response, 'The Constitution of Nepal')
+        self.assertNotContains(response, 'word ' * 100)
+        self.assertIn('content', response.context['articles'][0].get_deferred_fields())
+
+    def test_current_event_leaves_the_description_in_the_database(self):
+        for i in range(4):
+            CurrentEvent.objects.create(title=f'Event {i}', description=LONG_BODY)
+        with assert_max_queries(repeat_threshold=3):
+            response = self.client.get(reverse('current_event'))
+        self.assertIn('description', response.context['events'][0].get_deferred_fields())
+
+    def test_model_sets_load_only_listed_fields(self):
+        ModelSet.objects.create(title='Set 1', description='Practice set')
+        response = self.client.get(reverse('model_sets'))
+        self.assertContains(response, 'Set 1')
+        self.assertIn('timer_hours', response.context['model_sets'][0].get_deferred_fields())
+
+
+class AdminListingFieldsTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+
+    def test_manage_blog_defers_the_content(self):
+        Article.objects.create(title='Post', content=LONG_BODY, category='blog')
+        response = self.client.get(reverse('manage_blog'))
+        self.assertIn('content', response.context['articles'][0].get_deferred_fields())
+
+    def test_manage_model_sets_loads_categories_in_one_query(self):
+        for i in range(4):
+            ModelSet.objects.create(title=f'Set {i}', category=Category.objects.create(name=f'Category {i}'))
+        with assert_max_queries(repeat_threshold=3):
+            response = self.client.get(reverse('manage_model_sets'))
+        self.assertEqual(response.context['model_sets'][0].category.name, 'Category 3')
+        self.assertIn('description', response.context['model_sets'][0].get_deferred_fields())
@@ -0,0 +1,74 @@
+import datetime
+
+from bson import ObjectId
+from django.test import SimpleTestCase, TestCase
+from pymongo import ASCENDING, DESCENDING
+
+from core.models import Job, Note
+from core.ordering import NEWEST_FIRST, OLDEST_FIRST, hydrate, ordered, sort_keys
+
+
+class HydrateTests(SimpleTestCase):
+    def test_sort_keys_use_columns_and_directions(self):
+        self.assertEqual(sort_keys(Job, ('-application_deadline', 'title')), [('application_deadline', DESCENDING), ('title', ASCENDING)])
+
+    def test_mongo_values_are_converted(self):
+        document = {
+            '_id': ObjectId(), 'title': 'Officer', 'position': 'Section officer', 'vacancies': 3,
+            'opening_date': datetime.datetime(2026, 1, 5), 'application_deadline': datetime.datetime(2026, 2, 1),
+            'job_type': 'job', 'location': 'Kathmandu', 'posted_at': datetime.datetime(2026, 1, 5, 9, 30),
+        }
+        job = hydrate(Job, document)
+        self.assertEqual(job.pk, document['_id'])
+        self.assertEqual(job.opening_date, datetime.date(2026, 1, 5))
+        self.assertEqual(job.posted_at.tzinfo, datetime.timezone.utc)
+        self.assertFalse(job._state.adding)
+
+    def test_missing_fields_take_their_defaults(self):
+        job = hydrate(Job, {'_id': ObjectId(), 'title': 'Officer'})
+        self.assertEqual(job.vacancies, 1)
+        self.assertEqual(job.more_details, '')
+
+    def test_only_defers_the_other_fields(self):
+        job = hydrate(Job, {'_id': ObjectId(), 'title': 'Officer'}, only=('title',))
+        self.assertEqual(job.get_deferred_fields(), {f.attname for f in Job._meta.concrete_fields} - {'_id', 'title'})
+
+
+class OrderedTests(TestCase):
+    def setUp(self):
+        deadlines = [datetime.date(2026, 3, 1), datetime.date(2026, 5, 1), datetime.date(2026, 3, 1)]
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {i}', position='Officer', opening_date=datetime.date(2026, 1, 1),
+                application_deadline=deadline, job_type='job', location='Kathmandu',
+            )
+            for i, deadline in enumerate(deadlines)
+        ]
+
+    def titles(self, rows):
+        return [row.title for row in rows]
+
+    def test_newest_and_oldest_first(self):
+        self.assertEqual(self.titles(ordered(Job, NEWEST_FIRST)), ['Job 2', 'Job 1', 'Job 0'])
+        self.assertEqual(self.titles(ordered(Job, OLDEST_FIRST)), ['Job 0', 'Job 1', 'Job 2'])
+
+    def test_ties_are_broken_by_id(self):
+        self.assertEqual(self.titles(ordered(Job, ('-application_deadline',))), ['Job 1', 'Job 2', 'Job 0'])
+
+    def test_criteria_and_limit(self):
+        rows = ordered(Job, NEWEST_FIRST, {'application_deadline': {'$lt': datetime.datetime(2026, 4, 1)}}, limit=1)
+        self.assertEqual(self.titles(rows), ['Job 2'])
+
+    def test_rows_are_model_instances(self):
+        job = ordered(Job, OLDEST_FIRST)[0]
+        self.assertEqual(job, self.jobs[0])
+        self.assertEqual(job.application_deadline, datetime.date(2026, 3, 1))
+        job.title = 'Renamed'
+        job.save()
+        self.assertEqual(Job.objects.get(pk=job.pk).title, 'Renamed')
+
+    def test_only_projects_the_named_fields(self):
+        note = Note.objects.create(title='Rights', file='notes/rights.pdf')
+        row = ordered(Note, NEWEST_FIRST, only=('title',))[0]
+        self.assertEqual((row.pk, row.title), (note.pk, 'Rights'))
+        self.assertIn('file', row.get_deferred_fields())
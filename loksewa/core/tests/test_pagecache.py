@@ -0,0 +1,108 @@
+import datetime
+from unittest import mock
+
+from bson import ObjectId
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from core.models import Article, GKQuestion
+from core.pagecache import (
+    PAGE_VERSION_TTL, cached_fragment, group_versions, invalidate_children, invalidate_groups, invalidate_object,
+    version_time,
+)
+
+
+class FragmentTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/gk/')
+        self.request.user = AnonymousUser()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {'fragment': f'<p>build {self.builds}</p>'}
+
+    def fragment(self, view_name='gk', kwargs=None):
+        return cached_fragment(self.request, view_name, kwargs or {}, self.build)['fragment']
+
+
+@override_settings(SHARED_CACHE_ALIASES=['default'])
+class SharedCacheFragmentTests(FragmentTestCase):
+    def test_fragment_is_built_once(self):
+        self.assertEqual(self.fragment(), '<p>build 1</p>')
+        self.assertEqual(self.fragment(), '<p>build 1</p>')
+        self.assertEqual(self.builds, 1)
+
+    def test_invalidating_a_group_rebuilds_its_pages(self):
+        self.fragment()
+        self.fragment('gk_detail', {'pk': 'e1'})
+        invalidate_groups(['gk_list'])
+        self.assertEqual(self.fragment(), '<p>build 3</p>')
+        self.fragment('gk_detail', {'pk': 'e1'})
+        self.assertEqual(self.builds, 3)
+
+    def test_saved_objects_invalidate_their_groups(self):
+        article = Article(_id=ObjectId())
+        self.fragment('blog_detail', {'pk': article.pk})
+        invalidate_object(article)
+        self.fragment('blog_detail', {'pk': article.pk})
+        self.assertEqual(self.builds, 2)
+
+    def test_bulk_child_writes_invalidate_the_parent(self):
+        self.fragment('gk_detail', {'pk': 'e1'})
+        invalidate_children(GKQuestion, 'e1')
+        self.fragment('gk_detail', {'pk': 'e1'})
+        self.assertEqual(self.builds, 2)
+
+    def test_viewers_get_separate_entries(self):
+        self.fragment()
+        self.request.user = mock.Mock(is_authenticated=True, pk=1)
+        self.fragment()
+        self.assertEqual(self.builds, 2)
+
+    def test_versions_expire(self):
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            group_versions(['gk_list'])
+            invalidate_groups(['gk_list'])
+        self.assertEqual([call.args[1] for call in set_many.call_args_list], [PAGE_VERSION_TTL, PAGE_VERSION_TTL])
+
+
+@override_settings(SHARED_CACHE_ALIASES=[])
+class ProcessLocalFragmentTests(FragmentTestCase):
+    def test_fragment_is_built_every_time(self):
+        self.fragment()
+        self.assertEqual(self.fragment(), '<p>build 2</p>')
+
+    def test_nothing_is_cached(self):
+        self.fragment()
+        self.assertEqual(cache.get_many(['core:page_group:gk_list']), {})
+
+
+class VersionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_versions_are_stable_until_invalidated(self):
+        first = group_versions(['gk_list', 'pradesh_list'])
+        self.assertEqual(group_versions(['gk_list', 'pradesh_list']), first)
+        invalidate_groups(['gk_list'])
+        second = group_versions(['gk_list', 'pradesh_list'])
+        self.assertNotEqual(second[0], first[0])
+        self.assertEqual(second[1], first[1])
+
+    def test_version_time_is_when_it_was_issued(self):
+        before = datetime.datetime.now(datetime.timezone.utc)
+        issued = version_time(group_versions(['gk_list'])[0])
+        self.assertLess(abs((issued - before).total_seconds()), 5)
+
+
+class PageSignalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_saving_an_article_bumps_the_blog_version(self):
+        before = group_versions(['article_list'])
+        Article.objects.create(title='Exam tips', content='Read twice.', category='blog')
+        self.assertNotEqual(group_versions(['article_list']), before)
@@ -0,0 +1,96 @@
+from bson import ObjectId
+from django.http import QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from core.models import GalleryImage
+from core.pagination import MAX_PAGE_SIZE, KeysetPage, get_page_size, paginate, parse_cursor, wants_json
+
+
+class CursorTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_parse_cursor_round_trips_an_object_id(self):
+        oid = ObjectId()
+        self.assertEqual(parse_cursor(str(oid)), oid)
+
+    def test_parse_cursor_ignores_missing_and_malformed_values(self):
+        for value in (None, '', 'not-an-id', '123'):
+            self.assertIsNone(parse_cursor(value))
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(get_page_size(self.factory.get('/', {'limit': '5'})), 5)
+        self.assertEqual(get_page_size(self.factory.get('/', {'limit': '0'})), 1)
+        self.assertEqual(get_page_size(self.factory.get('/', {'limit': '100000'})), MAX_PAGE_SIZE)
+
+    def test_bad_page_size_falls_back_to_the_default(self):
+        self.assertEqual(get_page_size(self.factory.get('/', {'limit': 'ten'}), 7), 7)
+
+    def test_page_queries_keep_filters_and_drop_format(self):
+        request = self.factory.get('/gk/', {'tab': 'world', 'cursor': 'old', 'format': 'json'})
+        page = KeysetPage([], None, 'new', request.GET)
+        self.assertTrue(page.has_next)
+        self.assertEqual(QueryDict(page.next_query).dict(), {'tab': 'world', 'cursor': 'new'})
+        self.assertEqual(page.first_query, 'tab=world')
+
+    def test_last_page_has_no_next(self):
+        self.assertFalse(KeysetPage([], None, None, QueryDict()).has_next)
+
+    def test_wants_json(self):
+        self.assertTrue(wants_json(self.factory.get('/', {'format': 'json'})))
+        self.assertTrue(wants_json(self.factory.get('/', HTTP_ACCEPT='application/json')))
+        self.assertFalse(wants_json(self.factory.get('/')))
+
+
+class PaginateTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.images = [GalleryImage.objects.create(title=f'Image {i}') for i in range(5)]
+
+    def ids(self, page):
+        return [image.pk for image in page]
+
+    def test_pages_walk_the_collection_in_id_order(self):
+        page = paginate(self.factory.get('/', {'limit': 2}), GalleryImage.objects.all())
+        self.assertEqual(self.ids(page), [image.pk for image in self.images[:2]])
+        self.assertEqual(page.next_cursor, str(self.images[1].pk))
+
+        page = paginate(self.factory.get('/', {'limit': 2, 'cursor': page.next_cursor}), GalleryImage.objects.all())
+        self.assertEqual(self.ids(page), [image.pk for image in self.images[2:4]])
+
+        page = paginate(self.factory.get('/', {'limit': 2, 'cursor': page.next_cursor}), GalleryImage.objects.all())
+        self.assertEqual(self.ids(page), [self.images[4].pk])
+        self.assertFalse(page.has_next)
+
+    def test_newest_first_walks_ids_downwards(self):
+        page = paginate(self.factory.get('/', {'limit': 3}), GalleryImage.objects.all(), newest_first=True)
+        self.assertEqual(self.ids(page), [image.pk for image in self.images[:1:-1]])
+        page = paginate(self.factory.get('/', {'limit': 3, 'cursor': page.next_cursor}), GalleryImage.objects.all(), newest_first=True)
+        self.assertEqual(self.ids(page), [image.pk for image in self.images[1::-1]])
+        self.assertFalse(page.has_next)
+
+    def test_exact_fit_has_no_next_page(self):
+        page = paginate(self.factory.get('/', {'limit': 5}), GalleryImage.objects.all())
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_next)
+
+    def test_malformed_cursor_starts_from_the_first_page(self):
+        page = paginate(self.factory.get('/', {'limit': 2, 'cursor': 'garbage'}), GalleryImage.objects.all())
+        self.assertEqual(self.ids(page), [image.pk for image in self.images[:2]])
+
+    def test_listing_view_serves_json_pages(self):
+        response = self.client.get('/gallery/', {'limit': 3, 'format': 'json'})
+        data = response.json()
+        self.assertEqual([row['id'] for row in data['results']], [str(image.pk) for image in self.images[:3]])
+        self.assertEqual(data['results'][0]['title'], 'Image 0')
+        self.assertEqual(data['next_cursor'], str(self.images[2].pk))
+
+        data = self.client.get('/gallery/', {'limit': 3, 'format': 'json', 'cursor': data['next_cursor']}).json()
+        self.assertEqual([row['id'] for row in data['results']], [str(image.pk) for image in self.images[3:]])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_listing_view_renders_html_with_a_next_link(self):
+        response = self.client.get('/gallery/', {'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['images']), self.images[:2])
+        self.assertContains(response, f'cursor={self.images[1].pk}')
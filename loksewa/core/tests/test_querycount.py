@@ -0,0 +1,143 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import (
+    Article, CurrentEvent, GKEntry, GKQuestion, Job, ModelSet, ModelSetQuestion, ObjectiveMCQ, ObjectiveSet,
+    ObjectiveSubject, Pradesh, PradeshQA, SubjectiveChapter, SubjectiveQA, SubjectiveSubject, User,
+)
+from core.querycount import (
+    QueryListener, _query_parts, _shape, assert_max_queries, assert_view_budget, record_queries,
+)
+
+# Enough rows that a per-row query shape repeats past the threshold below
+ROWS = 6
+REPEAT_THRESHOLD = 3
+
+
+class ShapeTests(SimpleTestCase):
+    def test_values_are_replaced_and_keys_sorted(self):
+        self.assertEqual(
+            repr(_shape({'type': 'nepal', '_id': {'$gt': 'abc'}})),
+            repr({'_id': {'$gt': '?'}, 'type': '?'}),
+        )
+
+    def test_lists_collapse_to_one_element(self):
+        self.assertEqual(_shape({'_id': {'$in': [1, 2, 3]}}), {'_id': {'$in': ['?']}})
+        self.assertEqual(_shape([]), [])
+
+    def test_same_query_with_other_values_has_the_same_shape(self):
+        self.assertEqual(_shape({'entry_id': 'a', 'n': [1]}), _shape({'entry_id': 'b', 'n': [2, 3]}))
+
+    def test_query_parts_by_command(self):
+        self.assertEqual(_query_parts('find', {'find': 'c', 'filter': {'a': 1}}), {'a': 1})
+        self.assertEqual(_query_parts('aggregate', {'pipeline': [{'$match': {}}]}), [{'$match': {}}])
+        self.assertEqual(_query_parts('update', {'updates': [{'q': {'a': 1}}, {'q': {'b': 2}}]}), [{'a': 1}])
+        self.assertEqual(_query_parts('insert', {'documents': [{}]}), {})
+
+
+class RecorderTests(SimpleTestCase):
+    def event(self, command_name='find', collection='core_gkentry', criteria=None):
+        return mock.Mock(command_name=command_name, command={command_name: collection, 'filter': criteria or {'type': 'nepal'}})
+
+    def test_commands_are_recorded_only_while_recording(self):
+        listener = QueryListener()
+        listener.started(self.event())
+        with record_queries() as outer:
+            with record_queries() as inner:
+                listener.started(self.event())
+            listener.started(self.event('hello'))
+        self.assertEqual((len(outer), len(inner)), (1, 1))
+        self.assertEqual(outer.operations[0].collection, 'core_gkentry')
+
+    def test_repeated_shapes_are_reported(self):
+        listener = QueryListener()
+        with self.assertRaisesRegex(AssertionError, 'possible N\\+1: 3 x find core_gkquestion'):
+            with assert_max_queries(10, repeat_threshold=3):
+                for value in 'abc':
+                    listener.started(self.event(collection='core_gkquestion', criteria={'entry_id': value}))
+
+    def test_budget_overruns_are_reported(self):
+        listener = QueryListener()
+        with self.assertRaisesRegex(AssertionError, '2 MongoDB operations, budget is 1'):
+            with assert_max_queries(1):
+                listener.started(self.event())
+                listener.started(self.event(collection='core_pradesh'))
+
+    def test_views_without_a_budget_are_rejected(self):
+        with self.assertRaisesRegex(AssertionError, 'declares no query budget'):
+            assert_view_budget(self.client, '/notes/')
+
+
+class ViewBudgetTests(TestCase):
+    """Every budgeted view stays within budget cold, warm and with many rows."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader', password='pw')
+        self.client.force_login(self.user)
+        self.gk_entries = [GKEntry.objects.create(type='nepal', title=f'Entry {i}') for i in range(ROWS)]
+        for entry in self.gk_entries:
+            for j in range(2):
+                GKQuestion.objects.create(entry=entry, question=f'{entry.title} Q{j}', answer='A')
+        self.pradesh = Pradesh.objects.create(province=3, title='Bagmati')
+        for i in range(ROWS):
+            PradeshQA.objects.create(pradesh=self.pradesh, question=f'Q{i}', answer='A')
+        for i in range(ROWS):
+            Article.objects.create(title=f'Post {i}', content='Body', category='blog')
+            CurrentEvent.objects.create(title=f'Event {i}', description='Body')
+            Job.objects.create(
+                title=f'Job {i}', position='Officer', opening_date=datetime.date(2026, 1, 1),
+                application_deadline=datetime.date(2026, 2, 1), job_type='job', location='Kathmandu',
+            )
+        subject = SubjectiveSubject.objects.create(name='Constitution')
+        chapter = SubjectiveChapter.objects.create(subject=subject, name='Rights')
+        for i in range(ROWS):
+            SubjectiveQA.objects.create(chapter=chapter, question=f'Q{i}', answer='A')
+        objective_set = ObjectiveSet.objects.create(subject=ObjectiveSubject.objects.create(name='Polity'), title='Set 1')
+        for i in range(ROWS):
+            ObjectiveMCQ.objects.create(
+                set=objective_set, question=f'Q{i}', option_a='1', option_b='2', option_c='3', option_d='4', correct_answer='A',
+            )
+        model_set = ModelSet.objects.create(title='Model set', timer_minutes=30)
+        for i in range(ROWS):
+            ModelSetQuestion.objects.create(
+                model_set=model_set, question_text=f'Q{i}', option_a='1', option_b='2', option_c='3', option_d='4', correct_option='A',
+            )
+        self.paths = [
+            '/gk/?tab=nepal',
+            f'/gk/{self.gk_entries[0].pk}/',
+            f'/pradesh/{self.pradesh.pk}/',
+            '/blog/',
+            '/job-board/',
+            '/current-event/',
+            f'/subjectives/{subject.pk}/{chapter.pk}/',
+            f'/objectives/set/{objective_set.pk}/',
+            f'/model-sets/{model_set.pk}/test/',
+        ]
+
+    def test_cold_cache(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                cache.clear()
+                self.assertEqual(assert_view_budget(self.client, path).status_code, 200)
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_warm_cache(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                with record_queries() as cold:
+                    self.client.get(path)
+                response = assert_view_budget(self.client, path)
+                self.assertEqual(response.status_code, 200)
+                with record_queries() as warm:
+                    self.client.get(path)
+                self.assertLessEqual(len(warm), len(cold))
+
+    def test_no_query_repeats_per_row(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                cache.clear()
+                assert_view_budget(self.client, path, repeat_threshold=REPEAT_THRESHOLD)
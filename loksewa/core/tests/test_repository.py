@@ -0,0 +1,130 @@
+from bson import ObjectId
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from core import repository
+from core.models import (
+    GKEntry, GKQuestion, ModelSet, ModelSetQuestion, ObjectiveMCQ, ObjectiveSet, ObjectiveSubject, Pradesh, PradeshQA,
+    SubjectiveChapter, SubjectiveQA, SubjectiveSubject, User,
+)
+from core.querycount import record_queries
+
+
+class ReadModelTests(SimpleTestCase):
+    def test_stored_file(self):
+        self.assertFalse(repository.StoredFile(None))
+        stored = repository.StoredFile('gk/docs/rivers.pdf')
+        self.assertTrue(stored)
+        self.assertEqual(str(stored), 'gk/docs/rivers.pdf')
+        self.assertTrue(stored.url.endswith('gk/docs/rivers.pdf'))
+
+    def test_rows_behave_like_models_in_templates(self):
+        pk = ObjectId()
+        pradesh = repository.PradeshRow(pk, 3, 'Bagmati', repository.StoredFile(''))
+        self.assertEqual(pradesh.mongoid, str(pk))
+        self.assertEqual(pradesh.get_province_display(), 'Bagmati')
+        self.assertEqual(repository.ModelSetRow(pk, 'Set', 1, 2, 3).total_seconds, 3723)
+        with self.assertRaises(AttributeError):
+            pradesh.title = 'Changed'
+
+
+class RepositoryTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_gk_page_loads_questions_for_the_whole_page(self):
+        entries = [GKEntry.objects.create(type='nepal', title=f'Entry {i}') for i in range(3)]
+        GKEntry.objects.create(type='world', title='Elsewhere')
+        for entry in entries:
+            GKQuestion.objects.create(entry=entry, question=f'About {entry.title}?', answer='Yes')
+        with record_queries() as recorder:
+            page = repository.gk_page(self.factory.get('/gk/', {'limit': 2}), 'nepal')
+        self.assertEqual(len(recorder), 2)
+        self.assertEqual([row.title for row in page], ['Entry 0', 'Entry 1'])
+        self.assertEqual([qa.question for qa in page.object_list[0].questions], ['About Entry 0?'])
+        self.assertEqual(page.next_cursor, str(entries[1].pk))
+
+        page = repository.gk_page(self.factory.get('/gk/', {'limit': 2, 'cursor': page.next_cursor}), 'nepal')
+        self.assertEqual([row.title for row in page], ['Entry 2'])
+        self.assertFalse(page.has_next)
+
+    def test_missing_rows_raise_the_models_does_not_exist(self):
+        with self.assertRaises(GKEntry.DoesNotExist):
+            repository.gk_entry(ObjectId())
+        with self.assertRaises(Pradesh.DoesNotExist):
+            repository.pradesh_detail(ObjectId())
+        with self.assertRaises(ModelSet.DoesNotExist):
+            repository.model_set(ObjectId())
+
+    def test_pradesh_detail(self):
+        pradesh = Pradesh.objects.create(province=6, title='Karnali notes')
+        PradeshQA.objects.create(pradesh=pradesh, question='Capital?', answer='Birendranagar')
+        row, qas = repository.pradesh_detail(pradesh.pk)
+        self.assertEqual((row.title, row.get_province_display()), ('Karnali notes', 'Karnali'))
+        self.assertFalse(row.document)
+        self.assertEqual([(qa.question, qa.answer) for qa in qas], [('Capital?', 'Birendranagar')])
+
+    def test_subjective_chapter_must_belong_to_the_subject(self):
+        subject = SubjectiveSubject.objects.create(name='Constitution')
+        other = SubjectiveSubject.objects.create(name='Economics')
+        chapter = SubjectiveChapter.objects.create(subject=subject, name='Rights')
+        qas = [SubjectiveQA.objects.create(chapter=chapter, question=f'Q{i}', answer='A') for i in range(3)]
+        _, row, rows = repository.subjective_chapter(subject.pk, chapter.pk)
+        self.assertEqual(row.name, 'Rights')
+        self.assertEqual([qa.pk for qa in rows], [qa.pk for qa in qas])
+        with self.assertRaises(SubjectiveChapter.DoesNotExist):
+            repository.subjective_chapter(other.pk, chapter.pk)
+
+    def test_objective_set_carries_its_subject(self):
+        subject = ObjectiveSubject.objects.create(name='Constitution')
+        obj_set = ObjectiveSet.objects.create(subject=subject, title='Set 1')
+        ObjectiveMCQ.objects.create(
+            set=obj_set, question='Provinces?', option_a='5', option_b='6', option_c='7', option_d='8', correct_answer='C',
+        )
+        row, mcqs = repository.objective_set(obj_set.pk)
+        self.assertEqual((row.title, row.subject.name), ('Set 1', 'Constitution'))
+        self.assertEqual([mcq.correct_answer for mcq in mcqs], ['C'])
+
+    def test_test_questions_leave_out_the_answer_key(self):
+        model_set = ModelSet.objects.create(title='Set 1', timer_minutes=30)
+        questions = [
+            ModelSetQuestion.objects.create(
+                model_set=model_set, question_text=f'Q{i}', option_a='1', option_b='2', option_c='3', option_d='4', correct_option='A',
+            )
+            for i in range(2)
+        ]
+        rows = repository.test_questions(model_set.pk, {str(questions[1].pk): 'D'})
+        self.assertEqual([row.question_text for row in rows], ['Q0', 'Q1'])
+        self.assertEqual([row.saved_answer for row in rows], ['', 'D'])
+        self.assertNotIn('correct_option', rows[0]._fields)
+        self.assertEqual(repository.model_set(model_set.pk).total_seconds, 1800)
+
+
+class ModelSetTestViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('reader', password='pw'))
+
+    def test_unknown_and_malformed_ids_are_not_found(self):
+        self.assertEqual(self.client.get(f'/model-sets/{ObjectId()}/test/').status_code, 404)
+        self.assertEqual(self.client.get('/model-sets/not-an-id/test/').status_code, 404)
+        self.assertEqual(self.client.post('/model-sets/not-an-id/test/').status_code, 404)
+
+
+class ManageModelSetQuestionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        self.model_set = ModelSet.objects.create(title='Model set', timer_minutes=30)
+        ModelSetQuestion.objects.create(
+            model_set=self.model_set, question_text='Largest province?', option_a='Karnali', option_b='Bagmati',
+            option_c='Koshi', option_d='Gandaki', correct_option='A',
+        )
+
+    def test_page_lists_the_questions(self):
+        response = self.client.get(f'/admin/model-set-questions/{self.model_set.pk}/')
+        self.assertContains(response, 'Largest province?')
+
+    def test_malformed_id_redirects_to_the_set_list(self):
+        response = self.client.get('/admin/model-set-questions/not-an-id/')
+        self.assertRedirects(response, '/admin/manage-model-sets/', fetch_redirect_response=False)
@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.caches import cache_is_shared
+from core.models import Category, ModelSet, ModelSetQuestion, User
+from core.mongo import collection_for
+from core.scoring import answers_from_post, attach_questions, build_answer_key, get_answer_key, score_answers
+
+ANSWER_KEY = {'answers': [('q1', 'A'), ('q2', 'C'), ('q3', 'D')], 'total': 3}
+
+
+class ScoreAnswersTests(SimpleTestCase):
+    def test_counts_correct_answers_in_key_order(self):
+        correct, results = score_answers(ANSWER_KEY, {'q1': 'A', 'q2': 'B', 'q3': 'D'})
+        self.assertEqual(correct, 2)
+        self.assertEqual([r['number'] for r in results], [1, 2, 3])
+        self.assertEqual([r['is_correct'] for r in results], [True, False, True])
+        self.assertEqual(results[1]['correct_option'], 'C')
+
+    def test_unanswered_and_unknown_questions_score_nothing(self):
+        correct, results = score_answers(ANSWER_KEY, {'other': 'A'})
+        self.assertEqual(correct, 0)
+        self.assertEqual([r['user_answer'] for r in results], ['', '', ''])
+
+    def test_answers_are_read_for_keyed_questions_only(self):
+        post = QueryDict('answer_q1=B&answer_q3=D&answer_forged=A')
+        self.assertEqual(answers_from_post(ANSWER_KEY, post), {'q1': 'B', 'q2': '', 'q3': 'D'})
+
+
+class CacheIsSharedTests(SimpleTestCase):
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_local_memory_is_not_shared(self):
+        self.assertFalse(cache_is_shared())
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://'}})
+    def test_redis_is_shared(self):
+        self.assertTrue(cache_is_shared())
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_setting_overrides_the_backend_check(self):
+        self.assertTrue(cache_is_shared())
+        self.assertFalse(cache_is_shared('sessions'))
+
+
+class AnswerKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.model_set = ModelSet.objects.create(title='Set 1')
+        self.questions = [self.add_question(f'Question {i}', option, f'Because {i}') for i, option in enumerate('BDA', start=1)]
+
+    def add_question(self, text, correct, explanation=''):
+        return ModelSetQuestion.objects.create(
+            model_set=self.model_set, question_text=text, option_a='1', option_b='2', option_c='3', option_d='4',
+            correct_option=correct, explanation=explanation,
+        )
+
+    def test_key_lists_correct_options_in_question_order(self):
+        answer_key = build_answer_key(self.model_set.pk)
+        self.assertEqual(answer_key['answers'], [(str(q.pk), q.correct_option) for q in self.questions])
+        self.assertEqual(answer_key['total'], 3)
+
+    def test_empty_set_has_an_empty_key(self):
+        self.assertEqual(build_answer_key(ModelSet.objects.create(title='Empty').pk), {'answers': [], 'total': 0})
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_shared_cache_serves_the_key_until_a_question_changes(self):
+        get_answer_key(self.model_set.pk)
+        collection_for(ModelSetQuestion).update_one({'_id': self.questions[0].pk}, {'$set': {'correct_option': 'C'}})
+        self.assertEqual(get_answer_key(self.model_set.pk)['answers'][0][1], 'B')
+        self.add_question('Question 4', 'A')
+        answer_key = get_answer_key(self.model_set.pk)
+        self.assertEqual(answer_key['answers'][0][1], 'C')
+        self.assertEqual(answer_key['total'], 4)
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_deleting_a_question_invalidates_the_key(self):
+        get_answer_key(self.model_set.pk)
+        self.questions[1].delete()
+        self.assertEqual(get_answer_key(self.model_set.pk)['total'], 2)
+
+    @override_settings(SHARED_CACHE_ALIASES=[])
+    def test_process_local_cache_grades_from_the_database(self):
+        get_answer_key(self.model_set.pk)
+        # An edit handled by another worker only invalidates that worker's cache
+        collection_for(ModelSetQuestion).update_one({'_id': self.questions[0].pk}, {'$set': {'correct_option': 'C'}})
+        self.assertEqual(get_answer_key(self.model_set.pk)['answers'][0][1], 'C')
+
+    def test_attach_questions_adds_text_and_explanation(self):
+        _, results = score_answers(build_answer_key(self.model_set.pk), {})
+        attach_questions(self.model_set.pk, results)
+        self.assertEqual(results[0]['question_text'], 'Question 1')
+        self.assertEqual(results[2]['explanation'], 'Because 3')
+
+    def test_submitting_a_test_shows_graded_questions(self):
+        self.model_set.category = Category.objects.create(name='Loksewa')
+        self.model_set.save()
+        self.client.force_login(User.objects.create_user('reader', password='pw'))
+        q1, q2, q3 = self.questions
+        response = self.client.post(f'/model-sets/{self.model_set.pk}/test/', {
+            f'answer_{q1.pk}': 'B', f'answer_{q2.pk}': 'A',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.context['score'], response.context['total']), (1, 3))
+        self.assertContains(response, 'Question 2')
+        self.assertContains(response, 'Because 2')
@@ -0,0 +1,128 @@
+from unittest import mock
+
+from bson import ObjectId
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from pymongo.errors import OperationFailure
+
+from core import search as search_module
+from core.indexer import local_queue
+from core.models import Article, Note, User
+from core.search import SEARCH_MAX_PAGE, apply_changes, build_document, get_page_number, rebuild_index, search, search_collection
+
+
+class PageNumberTests(SimpleTestCase):
+    def test_page_number_is_clamped(self):
+        factory = RequestFactory()
+        self.assertEqual(get_page_number(factory.get('/search/', {'page': '3'})), 3)
+        self.assertEqual(get_page_number(factory.get('/search/', {'page': '-2'})), 1)
+        self.assertEqual(get_page_number(factory.get('/search/', {'page': 'two'})), 1)
+        self.assertEqual(get_page_number(factory.get('/search/', {'page': '100000'})), SEARCH_MAX_PAGE)
+
+    def test_blank_query_finds_nothing(self):
+        page = search('   ')
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_next)
+
+    def test_missing_text_index_finds_nothing(self):
+        collection = mock.Mock()
+        collection.find.side_effect = OperationFailure('text index required for $text query')
+        with mock.patch('core.search.search_collection', return_value=collection):
+            page = search('constitution')
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_next)
+
+    def test_article_snippets_are_plain_text(self):
+        article = Article(_id=ObjectId(), title='Exam tips', content='<p>Read the <strong>constitution</strong>&nbsp;twice.</p>')
+        document = build_document(article)
+        self.assertEqual(document['snippet'], 'Read the constitution twice.')
+        self.assertNotIn('strong', document['body'])
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.note = Note.objects.create(title='Constitution of Nepal', file='notes/constitution.pdf')
+        self.article = Article.objects.create(title='Exam tips', content='Read the constitution twice before the exam.')
+        local_queue.flush()
+        rebuild_index()
+
+    def test_build_document_mirrors_the_row(self):
+        document = build_document(self.article)
+        self.assertEqual(document['_id'], f'article:{self.article.pk}')
+        self.assertEqual(document['kind'], 'article')
+        self.assertEqual(document['title'], 'Exam tips')
+        self.assertEqual(document['url'], f'/blog/{self.article.pk}/')
+
+    def test_models_outside_the_index_have_no_document(self):
+        self.assertIsNone(build_document(User(username='reader')))
+
+    def test_title_matches_rank_above_body_matches(self):
+        page = search('constitution')
+        self.assertEqual([hit.kind for hit in page], ['note', 'article'])
+        self.assertGreater(page.object_list[0].score, page.object_list[1].score)
+
+    def test_kinds_restrict_the_results(self):
+        self.assertEqual([hit.kind for hit in search('constitution', ['article'])], ['article'])
+
+    def test_results_are_paged(self):
+        first = search('constitution', page_size=1)
+        self.assertTrue(first.has_next)
+        second = search('constitution', page=2, page_size=1)
+        self.assertEqual([hit.kind for hit in second], ['article'])
+        self.assertFalse(second.has_next)
+
+    def test_apply_changes_upserts_and_deletes(self):
+        self.article.title = 'Constitution exam tips'
+        self.article.save()
+        apply_changes(upserts={'article': [self.article.pk]}, deletes={'note': [self.note.pk]})
+        self.assertEqual(search_collection().find_one({'_id': f'article:{self.article.pk}'})['title'], 'Constitution exam tips')
+        self.assertIsNone(search_collection().find_one({'_id': f'note:{self.note.pk}'}))
+
+    def test_upsert_of_a_deleted_row_removes_its_document(self):
+        pk = self.article.pk
+        Article.objects.filter(pk=pk).delete()
+        apply_changes(upserts={'article': [pk]})
+        self.assertIsNone(search_collection().find_one({'_id': f'article:{pk}'}))
+
+    def test_signals_queue_index_updates(self):
+        article = Article.objects.create(title='Constitution amendments', content='')
+        local_queue.flush()
+        self.assertEqual([hit.url for hit in search('amendments')], [f'/blog/{article.pk}/'])
+        article.delete()
+        local_queue.flush()
+        self.assertEqual(list(search('amendments')), [])
+
+
+class SearchViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reader', password='pw')
+        Note.objects.create(title='Mathematics formulas', file='notes/maths.pdf')
+        local_queue.flush()
+        rebuild_index()
+
+    def test_login_is_required(self):
+        response = self.client.get('/search/', {'q': 'mathematics'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_returns_ranked_json(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/search/', {'q': 'mathematics', 'format': 'json'})
+        self.assertEqual([hit['title'] for hit in response.json()['results']], ['Mathematics formulas'])
+        self.assertEqual(response.json()['page'], 1)
+
+    def test_unknown_kind_searches_everything(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/search/', {'q': 'mathematics', 'kind': 'bogus'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['kind'], '')
+        self.assertEqual(len(response.context['page']), 1)
+
+    def test_notes_filter_matches_title_substrings(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/notes/', {'q': 'MATH'})
+        self.assertEqual([note.title for note in response.context['notes']], ['Mathematics formulas'])
+
+    def test_first_batch_creates_the_text_index(self):
+        search_collection().drop()
+        with mock.patch.object(search_module, '_index_ensured', False):
+            apply_changes(upserts={'article': [self.article.pk]})
+            self.assertEqual([hit.kind for hit in search('constitution')], ['article'])
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from core.sessions import LocalSessionCache, SessionStore, local_sessions
+
+
+class LocalSessionCacheTests(SimpleTestCase):
+    def test_entries_are_copies(self):
+        local = LocalSessionCache(10, 60)
+        data = {'cart': [1]}
+        local.set('k', data)
+        data['cart'].append(2)
+        local.get('k')['cart'].append(3)
+        self.assertEqual(local.get('k'), {'cart': [1]})
+
+    def test_entries_expire(self):
+        local = LocalSessionCache(10, 5)
+        with mock.patch('core.sessions.time.monotonic', return_value=100):
+            local.set('k', {'a': 1})
+        with mock.patch('core.sessions.time.monotonic', return_value=104):
+            self.assertEqual(local.get('k'), {'a': 1})
+        with mock.patch('core.sessions.time.monotonic', return_value=105):
+            self.assertIsNone(local.get('k'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        local = LocalSessionCache(2, 60)
+        local.set('a', {})
+        local.set('b', {})
+        local.get('a')
+        local.set('c', {})
+        self.assertIsNone(local.get('b'))
+        self.assertEqual(local.get('a'), {})
+
+    def test_zero_ttl_disables_the_tier(self):
+        local = LocalSessionCache(10, 0)
+        local.set('k', {'a': 1})
+        self.assertIsNone(local.get('k'))
+
+
+class SessionStoreTests(SimpleTestCase):
+    def setUp(self):
+        local_sessions.clear()
+        self.shared = caches[settings.SESSION_CACHE_ALIAS]
+        self.shared.clear()
+
+    def create(self, **data):
+        session = SessionStore()
+        session.update(data)
+        session.create()
+        return session
+
+    def test_saved_session_loads_in_another_store(self):
+        session = self.create(user='reader')
+        self.assertEqual(SessionStore(session.session_key)['user'], 'reader')
+
+    def test_local_tier_answers_repeat_reads(self):
+        session = self.create(user='reader')
+        with mock.patch.object(type(self.shared), 'get', side_effect=AssertionError('shared cache read')):
+            self.assertEqual(SessionStore(session.session_key)['user'], 'reader')
+
+    def test_other_workers_read_the_shared_store(self):
+        session = self.create(user='reader')
+        local_sessions.clear()
+        self.assertEqual(SessionStore(session.session_key)['user'], 'reader')
+        self.assertTrue(SessionStore().exists(session.session_key))
+
+    def test_changes_are_written_through(self):
+        session = self.create(step=1)
+        loaded = SessionStore(session.session_key)
+        loaded['step'] = 2
+        loaded.save()
+        local_sessions.clear()
+        self.assertEqual(SessionStore(session.session_key)['step'], 2)
+
+    def test_unsaved_changes_do_not_leak_into_the_local_tier(self):
+        session = self.create(step=1)
+        SessionStore(session.session_key)['step'] = 2
+        self.assertEqual(SessionStore(session.session_key)['step'], 1)
+
+    def test_delete_removes_both_tiers(self):
+        session = self.create(user='reader')
+        key = session.session_key
+        session.delete()
+        self.assertFalse(SessionStore().exists(key))
+        self.assertNotIn('user', SessionStore(key))
+
+    def test_unknown_session_is_empty(self):
+        self.assertEqual(dict(SessionStore('x' * 32).items()), {})
+
+
+class ClearSessionFilesTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = self.directory.name
+        prefix = settings.SESSION_COOKIE_NAME
+        self.fresh = self.touch(prefix + 'a' * 32)
+        self.stale = self.touch(prefix + 'b' * 32, age=settings.SESSION_COOKIE_AGE + 60)
+        self.other = self.touch('unrelated.txt')
+        self.short = self.touch(prefix + 'short')
+
+    def touch(self, name, age=0):
+        path = os.path.join(self.path, name)
+        open(path, 'w').close()
+        if age:
+            mtime = time.time() - age
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('clear_session_files', '--path', self.path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_only_session_files(self):
+        self.assertIn('Deleted 2 session files', self.run_command())
+        self.assertEqual(sorted(os.listdir(self.path)), sorted(map(os.path.basename, (self.other, self.short))))
+
+    def test_expired_only(self):
+        self.run_command('--expired-only')
+        self.assertTrue(os.path.exists(self.fresh))
+        self.assertFalse(os.path.exists(self.stale))
+
+    def test_dry_run_deletes_nothing(self):
+        self.assertIn('Would delete 2 session files', self.run_command('--dry-run'))
+        self.assertEqual(len(os.listdir(self.path)), 4)
+
+    def test_unreadable_path_fails(self):
+        with self.assertRaises(CommandError):
+            call_command('clear_session_files', '--path', os.path.join(self.path, 'missing'), stdout=StringIO())
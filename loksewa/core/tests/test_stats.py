@@ -0,0 +1,146 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Note, ObjectiveMCQ, ObjectiveSet, ObjectiveSubject, SubjectiveChapter, SubjectiveQA, SubjectiveSubject, User
+from core.mongo import collection_for
+from core.stats import (
+    DASHBOARD_MODELS, annotate_objective_counts, annotate_subjective_counts, dashboard_stats, objective_counts,
+    subjective_counts,
+)
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin', password='pw', role='admin')
+        Note.objects.create(title='One', file='notes/one.pdf')
+        Note.objects.create(title='Two', file='notes/two.pdf')
+
+    def test_counts_every_dashboard_model(self):
+        stats = dashboard_stats()
+        self.assertEqual(set(stats), set(DASHBOARD_MODELS))
+        self.assertEqual(stats['note_count'], 2)
+        self.assertEqual(stats['user_count'], 1)
+        self.assertEqual(stats['job_count'], 0)
+
+    def test_snapshot_is_served_from_the_cache(self):
+        dashboard_stats()
+        # Written behind the ORM's back, so no signal invalidates the snapshot
+        collection_for(Note).insert_one({'title': 'Three', 'file': 'notes/three.pdf'})
+        self.assertEqual(dashboard_stats()['note_count'], 2)
+
+    def test_creating_a_row_invalidates_the_snapshot(self):
+        dashboard_stats()
+        Note.objects.create(title='Three', file='notes/three.pdf')
+        self.assertEqual(dashboard_stats()['note_count'], 3)
+
+    def test_deleting_a_row_invalidates_the_snapshot(self):
+        dashboard_stats()
+        Note.objects.filter(title='One').get().delete()
+        self.assertEqual(dashboard_stats()['note_count'], 1)
+
+    def test_dashboard_renders_the_counts_for_admins(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['note_count'], 2)
+
+    def test_dashboard_is_closed_to_other_users(self):
+        self.client.force_login(User.objects.create_user('reader', password='pw'))
+        response = self.client.get('/dashboard/')
+        self.assertEqual(response.status_code, 302)
+        self.assertNotIn('note_count', response.context or {})
+
+
+class SubjectiveCountsTests(TestCase):
+    def setUp(self):
+        self.history = SubjectiveSubject.objects.create(name='History')
+        self.science = SubjectiveSubject.objects.create(name='Science')
+        self.empty = SubjectiveSubject.objects.create(name='Empty')
+        self.ancient = SubjectiveChapter.objects.create(subject=self.history, name='Ancient')
+        self.modern = SubjectiveChapter.objects.create(subject=self.history, name='Modern')
+        self.physics = SubjectiveChapter.objects.create(subject=self.science, name='Physics')
+        for chapter, count in ((self.ancient, 2), (self.modern, 1), (self.physics, 3)):
+            for i in range(count):
+                SubjectiveQA.objects.create(chapter=chapter, question=f'Q{i}', answer=f'A{i}')
+
+    def test_counts_chapters_and_qas_per_subject(self):
+        counts = subjective_counts()
+        self.assertEqual(counts['subjects'][self.history.pk], {'chapters': 2, 'qas': 3})
+        self.assertEqual(counts['subjects'][self.science.pk], {'chapters': 1, 'qas': 3})
+        self.assertEqual(counts['chapters'][self.ancient.pk], 2)
+        self.assertEqual(counts['total_chapters'], 3)
+        self.assertEqual(counts['total_qas'], 6)
+
+    def test_chapter_without_qas_counts_zero(self):
+        SubjectiveChapter.objects.create(subject=self.science, name='Chemistry')
+        counts = subjective_counts()
+        self.assertEqual(counts['subjects'][self.science.pk], {'chapters': 2, 'qas': 3})
+        self.assertEqual(counts['total_chapters'], 4)
+
+    def test_subject_without_chapters_is_annotated_with_zero(self):
+        subjects = annotate_subjective_counts([self.history, self.empty])
+        self.assertEqual((subjects[0].chapter_count, subjects[0].qa_count), (2, 3))
+        self.assertEqual((subjects[1].chapter_count, subjects[1].qa_count), (0, 0))
+
+    def test_manage_subjectives_shows_the_totals(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', role='admin'))
+        response = self.client.get('/manage-subjectives/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.context['total_chapters'], response.context['total_qas']), (3, 6))
+        self.assertContains(response, '(2 chapters, 3 Q&amp;A)')
+
+
+class ObjectiveCountsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.gk = ObjectiveSubject.objects.create(name='GK')
+        self.empty = ObjectiveSubject.objects.create(name='Empty')
+        self.set_one = ObjectiveSet.objects.create(subject=self.gk, title='Set 1')
+        self.set_two = ObjectiveSet.objects.create(subject=self.gk, title='Set 2')
+        self.mcq = self.add_mcq(self.set_one)
+        self.add_mcq(self.set_one)
+
+    def add_mcq(self, obj_set):
+        return ObjectiveMCQ.objects.create(
+            set=obj_set, question='Capital?', option_a='A', option_b='B', option_c='C', option_d='D', correct_answer='A',
+        )
+
+    def test_counts_sets_and_mcqs_per_subject(self):
+        counts = objective_counts()
+        self.assertEqual(counts['subjects'][self.gk.pk], {'sets': 2, 'mcqs': 2})
+        self.assertEqual(counts['sets'], {self.set_one.pk: 2, self.set_two.pk: 0})
+
+    def test_subject_without_sets_is_annotated_with_zero(self):
+        subjects = annotate_objective_counts([self.gk, self.empty])
+        self.assertEqual((subjects[0].set_count, subjects[0].mcq_count), (2, 2))
+        self.assertEqual((subjects[1].set_count, subjects[1].mcq_count), (0, 0))
+
+    def test_adding_an_mcq_invalidates_the_cached_counts(self):
+        objective_counts()
+        self.add_mcq(self.set_two)
+        self.assertEqual(objective_counts()['subjects'][self.gk.pk], {'sets': 2, 'mcqs': 3})
+
+    def test_deleting_a_set_invalidates_the_cached_counts(self):
+        objective_counts()
+        self.set_two.delete()
+        self.assertEqual(objective_counts()['subjects'][self.gk.pk], {'sets': 1, 'mcqs': 2})
+
+    @override_settings(SHARED_CACHE_ALIASES=['default'])
+    def test_counts_are_cached_between_changes(self):
+        objective_counts()
+        collection_for(ObjectiveMCQ).insert_one({'set_id': self.set_two.pk, 'question': 'Unsignalled'})
+        self.assertEqual(objective_counts()['sets'][self.set_two.pk], 0)
+
+    @override_settings(SHARED_CACHE_ALIASES=[])
+    def test_counts_are_not_cached_in_a_process_local_cache(self):
+        objective_counts()
+        collection_for(ObjectiveMCQ).insert_one({'set_id': self.set_two.pk, 'question': 'Unsignalled'})
+        self.assertEqual(objective_counts()['sets'][self.set_two.pk], 1)
+
+    def test_objectives_page_shows_the_counts(self):
+        self.client.force_login(User.objects.create_user('reader', password='pw'))
+        response = self.client.get('/objectives/', {'format': 'json'})
+        rows = {row['name']: row for row in response.json()['results']}
+        self.assertEqual((rows['GK']['set_count'], rows['GK']['mcq_count']), (2, 2))
+        self.assertEqual((rows['Empty']['set_count'], rows['Empty']['mcq_count']), (0, 0))
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from core.models import Article, CurrentEvent
+from core.mongo import collection_for
+from core.text import EXCERPT_WORDS, READING_WORDS_PER_MINUTE, apply_summary, plain_text, summarize
+
+
+class SummarizeTests(SimpleTestCase):
+    def test_markup_and_entities_are_stripped(self):
+        self.assertEqual(plain_text('<p>Rivers &amp; <i>lakes</i></p>\n\n<br>of Nepal'), 'Rivers & lakes of Nepal')
+
+    def test_long_bodies_are_truncated(self):
+        summary = summarize('word ' * (EXCERPT_WORDS + 10))
+        self.assertEqual(len(summary['excerpt'].split()), EXCERPT_WORDS)
+        self.assertTrue(summary['excerpt'].endswith('…'))
+        self.assertEqual(summary['word_count'], EXCERPT_WORDS + 10)
+
+    def test_reading_time_rounds_up(self):
+        self.assertEqual(summarize('word ' * (READING_WORDS_PER_MINUTE + 1))['reading_time'], 2)
+        self.assertEqual(summarize('one')['reading_time'], 1)
+
+    def test_empty_bodies(self):
+        self.assertEqual(summarize(None), {'excerpt': '', 'word_count': 0, 'reading_time': 0})
+
+    def test_update_fields_are_widened_only_when_the_source_is_saved(self):
+        article = Article(content='Short body')
+        self.assertEqual(apply_summary(article, 'content', ['content']), {'content', 'excerpt', 'word_count', 'reading_time'})
+        self.assertEqual(apply_summary(article, 'content', ['title']), ['title'])
+        self.assertIsNone(apply_summary(article, 'content'))
+        self.assertEqual(article.word_count, 2)
+
+
+class BackfillSummariesTests(TestCase):
+    def setUp(self):
+        self.article = Article.objects.create(title='Post', content='<p>Three short words</p>', category='blog')
+        self.event = CurrentEvent.objects.create(title='Event', description='Two words')
+        # Rows written before the summary fields existed
+        collection_for(Article).update_many({}, {'$set': {'excerpt': '', 'word_count': 0, 'reading_time': 0}})
+        collection_for(CurrentEvent).update_many({}, {'$unset': {'excerpt': '', 'word_count': '', 'reading_time': ''}})
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('backfill_summaries', *args, stdout=out)
+        return out.getvalue()
+
+    def test_backfill_fills_every_row(self):
+        output = self.call('--batch-size', '1')
+        self.assertIn('Updated 1 articles', output)
+        article = Article.objects.get(pk=self.article.pk)
+        self.assertEqual((article.excerpt, article.word_count, article.reading_time), ('Three short words', 3, 1))
+        self.assertEqual(CurrentEvent.objects.get(pk=self.event.pk).word_count, 2)
+
+    def test_dry_run_only_counts(self):
+        output = self.call('--dry-run')
+        self.assertIn('Would update 1 articles', output)
+        self.assertIn('Dry run complete', output)
+        self.assertEqual(Article.objects.get(pk=self.article.pk).word_count, 0)
+
+    def test_batch_size_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            self.call('--batch-size', '0')
@@ -0,0 +1,51 @@
+"""
+Plain-text summaries derived from article and current event bodies.
+
+List pages show a short excerpt, a word count and a reading time for each
+row. Deriving them once when the row is saved, rather than in every
+template render, lets those pages load these small fields instead of the
+body. ``manage.py backfill_summaries`` fills them in for existing rows.
+"""
+import html
+import math
+import re
+
+from django.conf import settings
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = getattr(settings, 'EXCERPT_WORDS', 40)
+READING_WORDS_PER_MINUTE = getattr(settings, 'READING_WORDS_PER_MINUTE', 200)
+
+SUMMARY_FIELDS = ('excerpt', 'word_count', 'reading_time')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def plain_text(value):
+    """``value`` without markup or entities, whitespace collapsed."""
+    return _WHITESPACE.sub(' ', html.unescape(strip_tags(value or ''))).strip()
+
+
+def summarize(value):
+    """The :data:`SUMMARY_FIELDS` for body text ``value``; reading time is in whole minutes."""
+    text = plain_text(value)
+    words = len(text.split())
+    return {
+        'excerpt': Truncator(text).words(EXCERPT_WORDS),
+        'word_count': words,
+        'reading_time': math.ceil(words / READING_WORDS_PER_MINUTE),
+    }
+
+
+def apply_summary(instance, source, update_fields=None):
+    """
+    Set ``instance``'s summary fields from its ``source`` field before a
+    save, returning ``update_fields`` widened to include them when the
+    source is being saved.
+    """
+    for name, value in summarize(getattr(instance, source)).items():
+        setattr(instance, name, value)
+    if update_fields is not None and source in update_fields:
+        update_fields = {*update_fields, *SUMMARY_FIELDS}
+    return update_fields
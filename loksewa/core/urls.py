@@ -15,11 +15,18 @@ urlpatterns = [
     path('logout/', auth_views.LogoutView.as_view(next_page='/'), name='logout'),
     path('dashboard/', admin_dashboard, name='admin_dashboard'),
     path('notes/', notes, name='notes'),
+    path('search/', views.site_search, name='search'),
     path('gk/', gk, name='gk'),
     path('gk/<str:pk>/', views.gk_detail, name='gk_detail'),
     path('pradesh/', pradesh, name='pradesh'),
     path('pradesh/<str:pk>/', pradesh_detail, name='pradesh_detail'),
     path('model-sets/', model_sets, name='model_sets'),
+    path('model-sets/categories/', views.model_set_categories, name='model_set_categories'),
+    path('model-sets/category/<str:category_id>/', views.model_sets_by_category, name='model_sets_by_category'),
+    path('model-sets/<str:set_id>/', views.model_set_start, name='model_set_start'),
+    path('model-sets/<str:set_id>/test/', views.model_set_test, name='model_set_test'),
+    path('model-sets/<str:set_id>/autosave/', views.model_set_autosave, name='model_set_autosave'),
+    path('test-history/', views.test_history, name='test_history'),
     path('current-event/', views.current_event, name='current_event'),
     path('current-event/<str:pk>/', views.current_event_detail, name='current_event_detail'),
     path('templates/', templates_page, name='templates_page'),
@@ -29,6 +36,7 @@ urlpatterns = [
     path('contact/', contact, name='contact'),
     path('services/', services, name='services'),
     path('bookmark/<str:model_name>/<str:object_id>/', toggle_bookmark, name='toggle_bookmark'),
+    path('bookmarks/', views.my_bookmarks, name='my_bookmarks'),
     path('job-board/', job_board, name='job_board'),
     path('job-post/', job_post, name='job_post'),
     path('admin/forbidden/', admin_forbidden, name='admin_forbidden'),
@@ -101,6 +109,11 @@ urlpatterns = [
     path('admin/manage-model-sets/', views.manage_model_sets, name='manage_model_sets'),
     path('admin/edit-model-set/<str:set_id>/', views.edit_model_set, name='edit_model_set'),
     path('admin/delete-model-set/<str:set_id>/', views.delete_model_set, name='delete_model_set'),
+    path('admin/model-set-questions/<str:set_id>/', views.manage_model_set_questions, name='manage_model_set_questions'),
+    path('admin/model-set-questions/<str:set_id>/bulk-add/', views.bulk_add_model_set_questions, name='bulk_add_model_set_questions'),
+    path('admin/model-set-questions/<str:set_id>/import/', views.import_model_set_questions_view, name='import_model_set_questions'),
+    path('admin/edit-model-set-question/<str:question_id>/', views.edit_model_set_question, name='edit_model_set_question'),
+    path('admin/delete-model-set-question/<str:question_id>/', views.delete_model_set_question, name='delete_model_set_question'),
     
     # Firebase Upload URLs (New - without modifying existing)
     path('firebase/upload-note/<str:note_id>/', firebase_views.upload_note_to_firebase, name='upload_note_to_firebase'),
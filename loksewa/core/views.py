@@ -6,9 +6,7 @@ from django import forms
 from django.contrib.auth.decorators import login_required, user_passes_test
 from .models import Note, Article, Pradesh, ModelSet, Quiz, TemplateResource, GalleryImage, Job, ObjectiveSubject, ObjectiveSet, ObjectiveMCQ
 from django.views.decorators.csrf import csrf_exempt
-from django.contrib.contenttypes.models import ContentType
 from django.http import JsonResponse, HttpResponseRedirect
-from .models import Bookmark
 from django.http import HttpResponseForbidden
 from django.contrib import messages
 from django.contrib.auth import get_user_model
@@ -17,14 +15,32 @@ from django.contrib.auth.views import PasswordResetView
 from .models import GKEntry, GKQuestion, PradeshQA
 from .models import CurrentEvent
 from bson import ObjectId
+from bson.errors import InvalidId
 from .forms import SubjectiveSubjectForm, SubjectiveChapterForm, SubjectiveQAForm, CategoryForm, ModelSetForm, ModelSetQuestionForm
 from .models import SubjectiveSubject, SubjectiveChapter, SubjectiveQA
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
-import datetime
+from .pagination import render_listing, wants_json
+from .ordering import ordered, NEWEST_FIRST, OLDEST_FIRST
+from . import repository
+from .pagecache import cached_fragment, render_cached_listing, render_fragment
+from .conditional import conditional_page
+from .querycount import query_budget
+from .ingest import ingest_qa_pairs, apply_qa_diff
+from .importers import iter_rows, iter_pasted, import_model_set_questions, import_objective_mcqs
+from .scoring import get_answer_key, answers_from_post, score_answers, attach_questions
+from .attempts import record_attempt, user_attempts, question_difficulty
+from .autosave import start_or_resume, save_deltas, finish as finish_attempt, remaining_seconds, DeadlinePassed
+from .search import SEARCH_SOURCES, search, get_page_number
+from .contenttypes import content_type_for, content_type_of
+from .bookmarks import bookmark_ids, bookmarks_page, toggle_bookmark as toggle_bookmark_for
+from .stats import dashboard_stats, subjective_counts, annotate_subjective_counts, annotate_objective_counts
+import json
+from itertools import zip_longest
 
 User = get_user_model()
 
+MAX_IMPORT_ERRORS_SHOWN = 100
+
 class CustomUserCreationForm(UserCreationForm):
     first_name = forms.CharField(max_length=30, required=True, label='First Name')
     last_name = forms.CharField(max_length=30, required=True, label='Last Name')
@@ -105,22 +121,7 @@ def admin_forbidden(request):
 @login_required
 @user_passes_test(is_admin, login_url='/accounts/admin/forbidden/')
 def admin_dashboard(request):
-    user_count = User.objects.count()
-    note_count = Note.objects.count()
-    article_count = Article.objects.count()
-    pradesh_count = Pradesh.objects.count()
-    modelset_count = ModelSet.objects.count()
-    quiz_count = Quiz.objects.count()
-    job_count = Job.objects.count()
-    return render(request, 'admin/dashboard.html', {
-        'user_count': user_count,
-        'note_count': note_count,
-        'article_count': article_count,
-        'pradesh_count': pradesh_count,
-        'modelset_count': modelset_count,
-        'quiz_count': quiz_count,
-        'job_count': job_count,
-    })
+    return render(request, 'admin/dashboard.html', dashboard_stats())
 
 # Notes page
 @login_required
@@ -133,32 +134,60 @@ def notes(request):
         notes = Note.objects.filter(title__regex=pattern)
     else:
         notes = Note.objects.all()
-    bookmarks = []
-    if request.user.is_authenticated:
-        bookmarks = Bookmark.objects.filter(user=request.user, content_type=ContentType.objects.get_for_model(Note)).values_list('object_id', flat=True)
-    return render(request, 'notes.html', {'notes': notes, 'bookmarks': bookmarks})
+    bookmarks = bookmark_ids(request.user, content_type_of(Note))
+    return render_listing(request, 'notes.html', notes, 'notes', ('title', 'file', 'uploaded_at'), {'bookmarks': bookmarks})
+
+# Site-wide search
+@login_required
+def site_search(request):
+    q = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind', '')
+    kinds = [kind] if kind in SEARCH_SOURCES else None
+    page = search(q, kinds, get_page_number(request))
+    if wants_json(request):
+        return JsonResponse({
+            'results': [hit._asdict() for hit in page.object_list],
+            'page': page.number,
+            'has_next': page.has_next,
+        })
+    return render(request, 'search.html', {
+        'q': q,
+        'kind': kind if kinds else '',
+        'kinds': [(key, source.label) for key, source in SEARCH_SOURCES.items()],
+        'page': page,
+    })
 
 # GK page
+@query_budget(4)
+@conditional_page('gk')
 def gk(request):
     tab = request.GET.get('tab', 'nepal')
     gk_entries = GKEntry.objects.filter(type=tab)
-    return render(request, 'gk.html', {'gk_entries': gk_entries, 'tab': tab})
+    return render_cached_listing(
+        request, 'gk', 'gk.html', gk_entries, 'gk_entries', ('type', 'title', 'document', 'created_at'), {'tab': tab},
+        fetch_page=lambda request: repository.gk_page(request, tab),
+    )
 
 # GK detail page
+@query_budget(4)
+@conditional_page('gk_detail')
 def gk_detail(request, pk):
     from .models import GKEntry
     from bson import ObjectId
     try:
         if isinstance(pk, str):
             pk = ObjectId(pk)
-        gk = GKEntry.objects.get(_id=pk)
-        questions = gk.questions.all()
-        return render(request, 'gk_detail.html', {'gk': gk, 'questions': questions})
+        def build():
+            gk = repository.gk_entry(pk)
+            return {'fragment': render_fragment('gk_detail.html', {'gk': gk, 'questions': gk.questions})}
+        context = cached_fragment(request, 'gk_detail', {'pk': pk}, build)
+        return render(request, 'gk_detail.html', context)
     except (GKEntry.DoesNotExist, ValueError, TypeError):
         from django.http import Http404
         raise Http404('GK entry not found')
 
 # Pradesh Bishesh page
+@conditional_page('pradesh')
 def pradesh(request):
     province_map = {
         1: 'Koshi',
@@ -174,29 +203,32 @@ def pradesh(request):
     if selected_province and selected_province.isdigit():
         pradeshes = pradeshes.filter(province=int(selected_province))
     provinces = [(k, v) for k, v in province_map.items()]
-    return render(request, 'pradesh.html', {
-        'pradeshes': pradeshes,
+    return render_cached_listing(request, 'pradesh', 'pradesh.html', pradeshes, 'pradeshes', ('province', 'title', 'document', 'created_at'), {
         'provinces': provinces,
         'selected_province': int(selected_province) if selected_province and selected_province.isdigit() else None,
     })
 
 # Pradesh Bishesh detail page
+@query_budget(4)
+@conditional_page('pradesh_detail')
 def pradesh_detail(request, pk):
     from bson import ObjectId
     try:
         if isinstance(pk, str):
             pk = ObjectId(pk)
-        pradesh = Pradesh.objects.get(_id=pk)
-        qas = pradesh.qas.all()
-        return render(request, 'pradesh_detail.html', {'pradesh': pradesh, 'qas': qas})
+        def build():
+            pradesh, qas = repository.pradesh_detail(pk)
+            return {'fragment': render_fragment('pradesh_detail.html', {'pradesh': pradesh, 'qas': qas})}
+        context = cached_fragment(request, 'pradesh_detail', {'pk': pk}, build)
+        return render(request, 'pradesh_detail.html', context)
     except (Pradesh.DoesNotExist, ValueError, TypeError):
         from django.http import Http404
         raise Http404('Pradesh entry not found')
 
 # Model Sets page
 def model_sets(request):
-    model_sets = ModelSet.objects.all()
-    return render(request, 'model_sets.html', {'model_sets': model_sets})
+    model_sets = ModelSet.objects.only('title', 'description', 'file', 'interactive_url')
+    return render_listing(request, 'model_sets.html', model_sets, 'model_sets', ('title', 'description', 'file', 'interactive_url'))
 
 # Quizzes page
 def quizzes(request):
@@ -209,28 +241,26 @@ def quizzes(request):
         quizzes = quizzes.filter(topic=topic)
     if level:
         quizzes = quizzes.filter(level=level)
-    bookmarks = []
-    if request.user.is_authenticated:
-        bookmarks = Bookmark.objects.filter(user=request.user, content_type=ContentType.objects.get_for_model(Quiz)).values_list('object_id', flat=True)
+    bookmarks = bookmark_ids(request.user, content_type_of(Quiz))
     return render(request, 'current_event.html', {'quizzes': quizzes, 'topics': topics, 'levels': levels, 'topic': topic, 'level': level, 'bookmarks': bookmarks})
 
 # Templates page
 def templates_page(request):
     templates = TemplateResource.objects.all()
-    return render(request, 'templates.html', {'templates': templates})
+    return render_listing(request, 'templates.html', templates, 'templates', ('title', 'image', 'file', 'description'))
 
 # Blog page
+@query_budget(4)
+@conditional_page('blog')
 def blog(request):
-    articles = Article.objects.filter(category='blog')
-    bookmarks = []
-    if request.user.is_authenticated:
-        bookmarks = Bookmark.objects.filter(user=request.user, content_type=ContentType.objects.get_for_model(Article)).values_list('object_id', flat=True)
-    return render(request, 'blog.html', {'articles': articles, 'bookmarks': bookmarks})
+    # List pages show the precomputed excerpt; the full content is left in the database
+    articles = Article.objects.filter(category='blog').only('title', 'category', 'image', 'created_at', 'excerpt', 'word_count', 'reading_time')
+    return render_listing(request, 'blog.html', articles, 'articles', ('title', 'excerpt', 'word_count', 'reading_time', 'image', 'created_at'), newest_first=True)
 
 # Gallery page
 def gallery(request):
     images = GalleryImage.objects.all()
-    return render(request, 'gallery.html', {'images': images})
+    return render_listing(request, 'gallery.html', images, 'images', ('title', 'file', 'description', 'caption'))
 
 # Contact page
 @csrf_exempt
@@ -250,9 +280,10 @@ def services(request):
     return render(request, 'services.html')
 
 # Job Board page
+@query_budget(3)
 def job_board(request):
-    jobs = Job.objects.all()  # Removed order_by for Djongo compatibility
-    return render(request, 'job_board.html', {'jobs': jobs})
+    jobs = Job.objects.all()
+    return render_listing(request, 'job_board.html', jobs, 'jobs', ('title', 'position', 'vacancies', 'opening_date', 'application_deadline', 'more_details', 'job_type', 'location'), newest_first=True)
 
 # Admin job post form
 class JobForm(forms.ModelForm):
@@ -273,22 +304,32 @@ def job_post(request):
 
 @login_required
 def toggle_bookmark(request, model_name, object_id):
-    user = request.user
-    content_type = ContentType.objects.get(model=model_name)
-    bookmark, created = Bookmark.objects.get_or_create(user=user, content_type=content_type, object_id=object_id)
-    if not created:
-        bookmark.delete()
-        status = 'removed'
-    else:
-        status = 'added'
-    if request.is_ajax():
+    try:
+        object_id = ObjectId(object_id)
+        content_type = content_type_for(model_name)
+    except (LookupError, InvalidId, ValueError, TypeError):
+        from django.http import Http404
+        raise Http404('Bookmark target not found')
+    status = toggle_bookmark_for(request.user, content_type, object_id)
+    # request.is_ajax() was removed in Django 4.0
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
         return JsonResponse({'status': status})
     return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
 
+@login_required
+def my_bookmarks(request):
+    page = bookmarks_page(request)
+    if wants_json(request):
+        return JsonResponse({
+            'results': [item._asdict() for item in page.object_list],
+            'next_cursor': page.next_cursor,
+        })
+    return render(request, 'my_bookmarks.html', {'bookmarks': page.object_list, 'page': page})
+
 @login_required
 def profile(request):
     from .models import ContactMessage
-    messages = ContactMessage.objects.filter(email=request.user.email)  # Removed order_by for Djongo compatibility
+    messages = ordered(ContactMessage, NEWEST_FIRST, {'email': request.user.email})
     return render(request, 'registration/profile.html', {
         'user': request.user,
         'contact_messages': messages,
@@ -343,7 +384,7 @@ def manage_notes(request):
         else:
             messages.error(request, 'Please provide both title and file.')
     
-    notes = Note.objects.all()  # Removed order_by for Djongo compatibility
+    notes = ordered(Note, NEWEST_FIRST)
     return render(request, 'admin/manage_notes.html', {'notes': notes})
 
 # Delete Note
@@ -388,7 +429,7 @@ def manage_blog(request):
         else:
             messages.error(request, 'Please provide title and content.')
     
-    articles = Article.objects.filter(category='blog')  # Removed order_by for Djongo compatibility
+    articles = ordered(Article, NEWEST_FIRST, {'category': 'blog'}, only=('title', 'image', 'created_at', 'excerpt'))
     return render(request, 'admin/manage_blog.html', {'articles': articles})
 
 # Edit Blog Post
@@ -457,7 +498,7 @@ def manage_templates(request):
             return redirect('manage_templates')
         else:
             messages.error(request, 'Please provide title and description.')
-    templates = TemplateResource.objects.all()  # Removed order_by for Djongo compatibility
+    templates = ordered(TemplateResource, NEWEST_FIRST)
     # Add id_str and id_generation_time for template-safe access
     for t in templates:
         t.id_str = str(t._id)
@@ -516,14 +557,12 @@ def manage_gk(request):
         answers = request.POST.getlist('answer')
         if type_ and title:
             entry = GKEntry.objects.create(type=type_, title=title, document=document)
-            for q, a in zip(questions, answers):
-                if q.strip():
-                    GKQuestion.objects.create(entry=entry, question=q, answer=a)
-            messages.success(request, 'GK entry added successfully!')
+            result = ingest_qa_pairs(GKQuestion, 'entry', entry, questions, answers)
+            messages.success(request, f'GK entry added successfully! {result.inserted} questions added, {result.skipped} skipped.')
             return redirect('manage_gk')
         else:
             messages.error(request, 'Please provide GK type and title.')
-    gk_entries = GKEntry.objects.all()  # Removed order_by for Djongo compatibility
+    gk_entries = ordered(GKEntry, NEWEST_FIRST)
     return render(request, 'admin/manage_gk.html', {'gk_entries': gk_entries})
 
 @login_required
@@ -542,13 +581,11 @@ def edit_gk(request, gk_id):
                 entry.document = document
             entry.save()
             # Update questions
-            GKQuestion.objects.filter(entry=entry).delete()
+            ids = request.POST.getlist('question_id')
             questions = request.POST.getlist('question')
             answers = request.POST.getlist('answer')
-            for q, a in zip(questions, answers):
-                if q.strip():
-                    GKQuestion.objects.create(entry=entry, question=q, answer=a)
-            messages.success(request, 'GK entry updated successfully!')
+            diff = apply_qa_diff(GKQuestion, 'entry', entry, ids, questions, answers)
+            messages.success(request, f'GK entry updated successfully! {diff.inserted} added, {diff.updated} updated, {diff.deleted} removed.')
             return redirect('manage_gk')
         return render(request, 'admin/edit_gk.html', {'entry': entry, 'questions': entry.questions.all()})
     except (GKEntry.DoesNotExist, ValueError, TypeError):
@@ -583,15 +620,13 @@ def manage_pradesh(request):
         if form.is_valid():
             pradesh = form.save()
             # Handle Q&A pairs if provided
-            for q, a in zip(questions, answers):
-                if q.strip():
-                    PradeshQA.objects.create(pradesh=pradesh, question=q, answer=a)
-            messages.success(request, 'Pradesh entry added successfully!')
+            result = ingest_qa_pairs(PradeshQA, 'pradesh', pradesh, questions, answers)
+            messages.success(request, f'Pradesh entry added successfully! {result.inserted} Q&A added, {result.skipped} skipped.')
             return redirect('manage_pradesh')
         else:
             messages.error(request, 'Please fill all required fields.')
     form = PradeshForm()
-    pradesh_entries = Pradesh.objects.all()  # Removed order_by for Djongo compatibility
+    pradesh_entries = ordered(Pradesh, NEWEST_FIRST)
     return render(request, 'admin/manage_pradesh.html', {'form': form, 'pradesh_entries': pradesh_entries})
 
 @login_required
@@ -609,13 +644,11 @@ def edit_pradesh(request, pradesh_id):
             if form.is_valid():
                 pradesh = form.save()
                 # Update Q&A
-                PradeshQA.objects.filter(pradesh=pradesh).delete()
+                ids = request.POST.getlist('question_id')
                 questions = request.POST.getlist('question')
                 answers = request.POST.getlist('answer')
-                for q, a in zip(questions, answers):
-                    if q.strip():
-                        PradeshQA.objects.create(pradesh=pradesh, question=q, answer=a)
-                messages.success(request, 'Province entry updated successfully!')
+                diff = apply_qa_diff(PradeshQA, 'pradesh', pradesh, ids, questions, answers)
+                messages.success(request, f'Province entry updated successfully! {diff.inserted} added, {diff.updated} updated, {diff.deleted} removed.')
                 return redirect('manage_pradesh')
         else:
             form = PradeshForm(instance=pradesh)
@@ -659,7 +692,7 @@ def manage_gallery(request):
             return redirect('manage_gallery')
         else:
             messages.error(request, 'Please provide a title.')
-    images = GalleryImage.objects.all()  # Removed order_by for Djongo compatibility
+    images = ordered(GalleryImage, NEWEST_FIRST)
     # Add id_str and id_generation_time for template-safe access
     for img in images:
         img.id_str = str(img._id)
@@ -737,7 +770,7 @@ def manage_jobs(request):
             return redirect('manage_jobs')
         else:
             messages.error(request, 'Please fill all required fields.')
-    jobs = Job.objects.all()  # Removed order_by for Djongo compatibility
+    jobs = ordered(Job, ('-application_deadline',))
     return render(request, 'admin/manage_jobs.html', {'jobs': jobs})
 
 @login_required
@@ -781,6 +814,7 @@ def delete_job(request, job_id):
         messages.error(request, 'Job not found!')
     return redirect('manage_jobs')
 
+@conditional_page('blog_detail')
 def blog_detail(request, pk):
     from .models import Article
     try:
@@ -788,8 +822,11 @@ def blog_detail(request, pk):
         from bson import ObjectId
         if isinstance(pk, str):
             pk = ObjectId(pk)
-        article = Article.objects.get(_id=pk, category='blog')
-        return render(request, 'blog_detail.html', {'article': article})
+        def build():
+            article = Article.objects.get(_id=pk, category='blog')
+            return {'fragment': render_fragment('blog_detail.html', {'article': article})}
+        context = cached_fragment(request, 'blog_detail', {'pk': pk}, build)
+        return render(request, 'blog_detail.html', context)
     except (Article.DoesNotExist, ValueError, TypeError):
         from django.http import Http404
         raise Http404('Blog post not found')
@@ -797,28 +834,31 @@ def blog_detail(request, pk):
 @login_required(login_url='/login/')
 def objectives(request):
     subjects = ObjectiveSubject.objects.all()
-    return render(request, 'objectives.html', {'subjects': subjects})
+    return render_listing(request, 'objectives.html', subjects, 'subjects', ('name', 'description', 'created_at', 'set_count', 'mcq_count'), annotate=annotate_objective_counts)
 
 @login_required(login_url='/login/')
 def subjectives(request):
-    subjects = SubjectiveSubject.objects.prefetch_related('chapters__qas').all()  # Removed order_by for Djongo compatibility
+    subjects = annotate_subjective_counts(ordered(SubjectiveSubject, ('name',)))
     return render(request, 'subjectives.html', {'subjects': subjects})
 
 def subjective_chapters(request, subject_id):
     from bson import ObjectId
     subject_id = ObjectId(subject_id)
     subject = SubjectiveSubject.objects.get(_id=subject_id)
-    chapters = subject.chapters.all()  # Removed order_by for Djongo compatibility
+    chapters = ordered(SubjectiveChapter, OLDEST_FIRST, {'subject_id': subject.pk})
     return render(request, 'subjective_chapters.html', {'subject': subject, 'chapters': chapters})
 
+@query_budget(5)
+@conditional_page('subjective_qas')
 def subjective_qas(request, subject_id, chapter_id):
     from bson import ObjectId
     subject_id = ObjectId(subject_id)
     chapter_id = ObjectId(chapter_id)
-    subject = SubjectiveSubject.objects.get(_id=subject_id)
-    chapter = SubjectiveChapter.objects.get(_id=chapter_id, subject=subject)
-    qas = chapter.qas.all()  # Removed order_by for Djongo compatibility
-    return render(request, 'subjective_qas.html', {'subject': subject, 'chapter': chapter, 'qas': qas})
+    def build():
+        subject, chapter, qas = repository.subjective_chapter(subject_id, chapter_id)
+        return {'fragment': render_fragment('subjective_qas.html', {'subject': subject, 'chapter': chapter, 'qas': qas})}
+    context = cached_fragment(request, 'subjective_qas', {'subject_id': subject_id, 'chapter_id': chapter_id}, build)
+    return render(request, 'subjective_qas.html', context)
 
 @login_required(login_url='/login/')
 def objective_subject_detail(request, subject_id):
@@ -833,15 +873,22 @@ def objective_subject_detail(request, subject_id):
         from django.http import Http404
         raise Http404('Subject not found')
 
+@query_budget(5)
 @login_required(login_url='/login/')
+@conditional_page('objective_set_detail')
 def objective_set_detail(request, set_id):
     from bson import ObjectId
     try:
         if isinstance(set_id, str):
             set_id = ObjectId(set_id)
-        obj_set = ObjectiveSet.objects.get(_id=set_id)
-        mcqs = obj_set.mcqs.all()
-        return render(request, 'objective_set_detail.html', {'set': obj_set, 'mcqs': mcqs})
+        def build():
+            obj_set, mcqs = repository.objective_set(set_id)
+            return {
+                'fragment': render_fragment('objective_set_detail.html', {'set': obj_set, 'mcqs': mcqs}),
+                'title': obj_set.title,
+            }
+        context = cached_fragment(request, 'objective_set_detail', {'set_id': set_id}, build)
+        return render(request, 'objective_set_detail.html', context)
     except (ObjectiveSet.DoesNotExist, ValueError, TypeError):
         from django.http import Http404
         raise Http404('Set not found')
@@ -864,14 +911,13 @@ def manage_subjectives(request):
             return redirect('manage_subjectives')
     else:
         form = SubjectiveSubjectForm()
-    subjects = SubjectiveSubject.objects.prefetch_related('chapters__qas').all()  # Removed order_by for Djongo compatibility
-    total_chapters = sum(subject.chapters.count() for subject in subjects)
-    total_qas = sum(qa.count() for subject in subjects for qa in [chapter.qas for chapter in subject.chapters.all()])
+    counts = subjective_counts()
+    subjects = annotate_subjective_counts(ordered(SubjectiveSubject, ('name',)), counts)
     return render(request, 'admin/manage_subjectives.html', {
         'form': form,
         'subjects': subjects,
-        'total_chapters': total_chapters,
-        'total_qas': total_qas,
+        'total_chapters': counts['total_chapters'],
+        'total_qas': counts['total_qas'],
     })
 
 @login_required
@@ -893,7 +939,7 @@ def manage_subjective_chapters(request, subject_id):
         form = SubjectiveChapterForm()
         if 'subject' in form.fields:
             del form.fields['subject']
-    chapters = subject.chapters.all()  # Removed order_by for Djongo compatibility
+    chapters = ordered(SubjectiveChapter, OLDEST_FIRST, {'subject_id': subject.pk})
     return render(request, 'admin/manage_subjective_chapters.html', {'form': form, 'subject': subject, 'chapters': chapters})
 
 @login_required
@@ -904,22 +950,18 @@ def manage_subjective_qas(request, chapter_id):
     if request.method == 'POST':
         questions = request.POST.getlist('question')
         answers = request.POST.getlist('answer')
-        created = 0
-        for q, a in zip(questions, answers):
-            if q.strip() and a.strip():
-                SubjectiveQA.objects.create(chapter=chapter, question=q.strip(), answer=a.strip())
-                created += 1
-        if created:
-            messages.success(request, f'{created} Q&A added successfully!')
+        result = ingest_qa_pairs(SubjectiveQA, 'chapter', chapter, questions, answers, require_answer=True, strip=True)
+        if result.inserted:
+            messages.success(request, f'{result.inserted} Q&A added successfully! {result.skipped} skipped.')
         else:
             messages.error(request, 'Please provide at least one valid Q&A.')
         return redirect('manage_subjective_qas', chapter_id=chapter.mongoid)
-    qas = chapter.qas.all()  # Removed order_by for Djongo compatibility
+    qas = ordered(SubjectiveQA, OLDEST_FIRST, {'chapter_id': chapter.pk})
     return render(request, 'admin/manage_subjective_qas.html', {'chapter': chapter, 'qas': qas})
 
 # User-facing view to display all subjectives
 def subjectives(request):
-    subjects = SubjectiveSubject.objects.prefetch_related('chapters__qas').all()  # Removed order_by for Djongo compatibility
+    subjects = annotate_subjective_counts(ordered(SubjectiveSubject, ('name',)))
     return render(request, 'subjectives.html', {'subjects': subjects})
 
 @login_required
@@ -1035,6 +1077,22 @@ def manage_objective_mcqs(request, set_id):
             set_id = ObjectId(set_id)
         obj_set = ObjectiveSet.objects.get(_id=set_id)
         
+        if request.method == 'POST' and request.POST.get('mode') == 'bulk':
+            upload = request.FILES.get('file')
+            try:
+                if upload:
+                    rows = iter_rows(upload, upload.name)
+                else:
+                    rows = iter_pasted(request.POST.get('block', ''))
+                report = import_objective_mcqs(obj_set, rows)
+            except ValueError as e:
+                messages.error(request, f'Import failed: {e}')
+            else:
+                messages.success(request, f'{report.inserted} MCQs imported, {report.duplicates} duplicates skipped, {len(report.errors)} rows rejected.')
+                for line_no, error in report.errors[:MAX_IMPORT_ERRORS_SHOWN]:
+                    messages.error(request, f'Line {line_no}: {error}')
+            return redirect('manage_objective_mcqs', set_id=obj_set.mongoid)
+
         if request.method == 'POST':
             question = request.POST.get('question')
             option_a = request.POST.get('option_a')
@@ -1106,7 +1164,6 @@ def delete_objective_mcq(request, mcq_id):
 @login_required
 @user_passes_test(is_admin, login_url='/admin/forbidden/')
 def manage_current_event(request):
-    events = CurrentEvent.objects.all()  # Removed order_by for Djongo compatibility
     if request.method == 'POST':
         title = request.POST.get('title')
         description = request.POST.get('description')
@@ -1115,7 +1172,7 @@ def manage_current_event(request):
         CurrentEvent.objects.create(title=title, description=description, image=image, document=document)
         messages.success(request, 'Current event created successfully!')
         return redirect('manage_current_event')
-    return render(request, 'admin/manage_current_event.html', {'events': events})
+    return render(request, 'admin/manage_current_event.html', {'events': ordered(CurrentEvent, NEWEST_FIRST, only=('title', 'image', 'document', 'created_at', 'excerpt'))})
 
 @login_required
 @user_passes_test(is_admin, login_url='/admin/forbidden/')
@@ -1151,18 +1208,24 @@ def delete_current_event(request, event_id):
     except (CurrentEvent.DoesNotExist, ValueError, TypeError):
         return HttpResponseForbidden('Event not found or invalid.')
 
+@query_budget(3)
+@conditional_page('current_event')
 def current_event(request):
-    events = CurrentEvent.objects.all()  # Removed order_by for Djongo compatibility
-    return render(request, 'current_event.html', {'events': events})
+    events = CurrentEvent.objects.only('title', 'image', 'document', 'created_at', 'excerpt', 'word_count', 'reading_time')
+    return render_listing(request, 'current_event.html', events, 'events', ('title', 'excerpt', 'word_count', 'reading_time', 'image', 'document', 'created_at'), newest_first=True)
 
+@conditional_page('current_event_detail')
 def current_event_detail(request, pk):
     from bson import ObjectId
     from .models import CurrentEvent
     try:
         if isinstance(pk, str):
             pk = ObjectId(pk)
-        event = CurrentEvent.objects.get(_id=pk)
-        return render(request, 'current_event_detail.html', {'event': event})
+        def build():
+            event = CurrentEvent.objects.get(_id=pk)
+            return {'fragment': render_fragment('current_event_detail.html', {'event': event})}
+        context = cached_fragment(request, 'current_event_detail', {'pk': pk}, build)
+        return render(request, 'current_event_detail.html', context)
     except (CurrentEvent.DoesNotExist, ValueError, TypeError):
         from django.http import Http404
         raise Http404('Current event not found')
@@ -1245,7 +1308,6 @@ def delete_subjective_subject(request, subject_id):
 @user_passes_test(is_admin, login_url='/admin/forbidden/')
 def manage_categories(request):
     from .models import Category
-    categories = Category.objects.all()  # Removed order_by for Djongo compatibility
     if request.method == 'POST':
         form = CategoryForm(request.POST)
         if form.is_valid():
@@ -1254,7 +1316,7 @@ def manage_categories(request):
             return redirect('manage_categories')
     else:
         form = CategoryForm()
-    return render(request, 'admin/manage_categories.html', {'categories': categories, 'form': form})
+    return render(request, 'admin/manage_categories.html', {'categories': ordered(Category, ('name',)), 'form': form})
 
 @login_required
 @user_passes_test(is_admin, login_url='/admin/forbidden/')
@@ -1294,8 +1356,7 @@ def delete_category(request, category_id):
 @login_required
 @user_passes_test(is_admin, login_url='/admin/forbidden/')
 def manage_model_sets(request):
-    from .models import ModelSet
-    model_sets = ModelSet.objects.all()  # Removed order_by for Djongo compatibility
+    from .models import Category, ModelSet
     if request.method == 'POST':
         form = ModelSetForm(request.POST, request.FILES)
         if form.is_valid():
@@ -1304,6 +1365,11 @@ def manage_model_sets(request):
             return redirect('manage_model_sets')
     else:
         form = ModelSetForm()
+    model_sets = ordered(ModelSet, NEWEST_FIRST, only=('title', 'category', 'timer_hours', 'timer_minutes', 'timer_seconds'))
+    # One query for the category badges instead of one per row
+    categories = Category.objects.only('name').in_bulk({ms.category_id for ms in model_sets if ms.category_id})
+    for ms in model_sets:
+        ms.category = categories.get(ms.category_id)
     return render(request, 'admin/manage_model_sets.html', {'model_sets': model_sets, 'form': form})
 
 @login_required
@@ -1349,7 +1415,10 @@ def manage_model_set_questions(request, set_id):
         if isinstance(set_id, str):
             set_id = ObjectId(set_id)
         model_set = ModelSet.objects.get(_id=set_id)
-        questions = ModelSetQuestion.objects.filter(model_set=model_set)
+        questions = list(ModelSetQuestion.objects.filter(model_set=model_set))
+        difficulty = question_difficulty(model_set._id)
+        for q in questions:
+            q.difficulty = difficulty.get(str(q._id))
         if request.method == 'POST':
             form = ModelSetQuestionForm(request.POST)
             if form.is_valid():
@@ -1361,7 +1430,7 @@ def manage_model_set_questions(request, set_id):
         else:
             form = ModelSetQuestionForm(initial={'model_set': model_set})
         return render(request, 'admin/manage_model_set_questions.html', {'model_set': model_set, 'questions': questions, 'form': form})
-    except (ModelSet.DoesNotExist, ValueError, TypeError):
+    except (ModelSet.DoesNotExist, InvalidId, ValueError, TypeError):
         messages.error(request, 'Model Set not found!')
         return redirect('manage_model_sets')
 
@@ -1405,45 +1474,60 @@ def delete_model_set_question(request, question_id):
 @login_required
 @user_passes_test(is_admin, login_url='/admin/forbidden/')
 def bulk_add_model_set_questions(request, set_id):
-    from .models import ModelSet, ModelSetQuestion
+    from .models import ModelSet
     try:
         if isinstance(set_id, str):
             set_id = ObjectId(set_id)
         model_set = ModelSet.objects.get(_id=set_id)
         if request.method == 'POST':
-            questions_data = request.POST.getlist('question_text')
-            option_a_data = request.POST.getlist('option_a')
-            option_b_data = request.POST.getlist('option_b')
-            option_c_data = request.POST.getlist('option_c')
-            option_d_data = request.POST.getlist('option_d')
-            correct_option_data = request.POST.getlist('correct_option')
-            explanation_data = request.POST.getlist('explanation')
-            count = 0
-            for i in range(len(questions_data)):
-                if questions_data[i].strip():
-                    ModelSetQuestion.objects.create(
-                        model_set=model_set,
-                        question_text=questions_data[i],
-                        option_a=option_a_data[i],
-                        option_b=option_b_data[i],
-                        option_c=option_c_data[i],
-                        option_d=option_d_data[i],
-                        correct_option=correct_option_data[i],
-                        explanation=explanation_data[i]
-                    )
-                    count += 1
-            messages.success(request, f'{count} questions added successfully!')
+            columns = ('question_text', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_option', 'explanation')
+            values = zip_longest(*(request.POST.getlist(column) for column in columns), fillvalue='')
+            rows = ((i, dict(zip(columns, row))) for i, row in enumerate(values, start=1) if row[0].strip())
+            report = import_model_set_questions(model_set, rows)
+            messages.success(request, f'{report.inserted} questions added successfully!')
+            for line_no, error in report.errors:
+                messages.error(request, f'Question {line_no}: {error}')
             return redirect('manage_model_set_questions', set_id=str(model_set._id))
         return render(request, 'admin/bulk_add_model_set_questions.html', {'model_set': model_set})
     except (ModelSet.DoesNotExist, ValueError, TypeError):
         messages.error(request, 'Model Set not found!')
         return redirect('manage_model_sets')
 
+@login_required
+@user_passes_test(is_admin, login_url='/admin/forbidden/')
+def import_model_set_questions_view(request, set_id):
+    from .models import ModelSet
+    try:
+        if isinstance(set_id, str):
+            set_id = ObjectId(set_id)
+        model_set = ModelSet.objects.get(_id=set_id)
+    except (ModelSet.DoesNotExist, InvalidId, ValueError, TypeError):
+        messages.error(request, 'Model Set not found!')
+        return redirect('manage_model_sets')
+    report = None
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        if not upload:
+            messages.error(request, 'Please choose a CSV, JSON, JSON-lines or XLSX file.')
+        else:
+            try:
+                rows = iter_rows(upload, upload.name, request.POST.get('format') or None)
+                report = import_model_set_questions(model_set, rows)
+            except ValueError as e:
+                messages.error(request, f'Import failed: {e}')
+            else:
+                messages.success(request, f'{report.inserted} questions imported, {len(report.errors)} rows rejected.')
+    return render(request, 'admin/import_model_set_questions.html', {
+        'model_set': model_set,
+        'report': report,
+        'errors': report.errors[:MAX_IMPORT_ERRORS_SHOWN] if report else [],
+    })
+
 # User-facing: List all categories
 @login_required
 def model_set_categories(request):
     from .models import Category
-    categories = Category.objects.all()  # Removed order_by for Djongo compatibility
+    categories = ordered(Category, ('name',))
     return render(request, 'model_set_categories.html', {'categories': categories})
 
 # User-facing: List all model sets in a category
@@ -1471,56 +1555,80 @@ def model_set_start(request, set_id):
             set_id = ObjectId(set_id)
         model_set = ModelSet.objects.get(_id=set_id)
         return render(request, 'model_set_start.html', {'model_set': model_set})
-    except (ModelSet.DoesNotExist, ValueError, TypeError):
+    except (ModelSet.DoesNotExist, InvalidId, ValueError, TypeError):
         from django.http import Http404
         raise Http404('Model Set not found')
 
+# User-facing: Past attempts of the logged-in user
+@login_required
+def test_history(request):
+    attempts = user_attempts(request.user)
+    return render(request, 'test_history.html', {'attempts': attempts})
+
+# User-facing: autosave answer deltas for a running test
+@login_required
+def model_set_autosave(request, set_id):
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+    try:
+        set_id = ObjectId(set_id)
+    except (InvalidId, TypeError):
+        return JsonResponse({'error': 'Model Set not found'}, status=404)
+    if request.content_type == 'application/json':
+        try:
+            deltas = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    else:
+        deltas = {key[len('answer_'):]: value for key, value in request.POST.items() if key.startswith('answer_')}
+    if not isinstance(deltas, dict):
+        return JsonResponse({'error': 'Expected an object of answers'}, status=400)
+    valid_ids = {question_id for question_id, _ in get_answer_key(set_id)['answers']}
+    try:
+        state = save_deltas(request.user.pk, set_id, deltas, valid_ids)
+    except LookupError:
+        return JsonResponse({'error': 'No test in progress'}, status=409)
+    except DeadlinePassed:
+        return JsonResponse({'error': 'Time is up', 'remaining': 0}, status=403)
+    return JsonResponse({'saved': len(state['answers']), 'remaining': remaining_seconds(state)})
+
 # User-facing: Test interface for a model set
+@query_budget(6)
 @login_required
 def model_set_test(request, set_id):
-    from .models import ModelSet, ModelSetQuestion
+    from .models import ModelSet
     from bson import ObjectId
     try:
         if isinstance(set_id, str):
             set_id = ObjectId(set_id)
-        model_set = ModelSet.objects.get(_id=set_id)
-        questions = list(ModelSetQuestion.objects.filter(model_set=model_set))
-        total_seconds = model_set.timer_hours * 3600 + model_set.timer_minutes * 60 + model_set.timer_seconds
         if request.method == 'POST':
-            user_answers = {}
-            for q in questions:
-                user_answers[str(q._id)] = request.POST.get(f'answer_{q._id}', '')
-            start_time = request.session.get(f'model_set_{set_id}_start_time')
-            if start_time:
-                elapsed = (timezone.now() - datetime.datetime.fromisoformat(start_time)).total_seconds()
-            else:
-                elapsed = 0
-            correct = 0
-            results = []
-            for q in questions:
-                user_ans = user_answers.get(str(q._id), '')
-                is_correct = (user_ans == q.correct_option)
-                if is_correct:
-                    correct += 1
-                results.append({'question': q, 'user_answer': user_ans, 'is_correct': is_correct})
-            score = correct
-            percent = (score / len(questions)) * 100 if questions else 0
-            request.session.pop(f'model_set_{set_id}_start_time', None)
+            model_set = ModelSet.objects.get(_id=set_id)
+            # Grade against the cached answer key; question bodies are not reloaded
+            answer_key = get_answer_key(model_set._id)
+            posted = answers_from_post(answer_key, request.POST)
+            user_answers, elapsed, started_at = finish_attempt(request.user.pk, model_set._id, posted)
+            score, results = score_answers(answer_key, user_answers)
+            total = answer_key['total']
+            percent = (score / total) * 100 if total else 0
+            record_attempt(request.user, model_set, score, results, elapsed, started_at)
             return render(request, 'model_set_result.html', {
                 'model_set': model_set,
-                'results': results,
+                'results': attach_questions(model_set._id, results),
                 'score': score,
                 'percent': percent,
                 'elapsed': int(elapsed),
-                'total': len(questions),
+                'total': total,
             })
-        # GET: start timer
-        request.session[f'model_set_{set_id}_start_time'] = timezone.now().isoformat()
+        # GET: start the timer, or resume it with the answers saved so far
+        model_set = repository.model_set(set_id)
+        state = start_or_resume(request.user.pk, model_set.pk, model_set.total_seconds)
+        questions = repository.test_questions(model_set.pk, state['answers'])
+        remaining = remaining_seconds(state)
         return render(request, 'model_set_test.html', {
             'model_set': model_set,
             'questions': questions,
-            'total_seconds': total_seconds,
+            'total_seconds': remaining if remaining is not None else 0,
         })
-    except (ModelSet.DoesNotExist, ValueError, TypeError):
+    except (ModelSet.DoesNotExist, InvalidId, ValueError, TypeError):
         from django.http import Http404
         raise Http404('Model Set not found')
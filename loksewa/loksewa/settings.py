@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -47,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-request MongoDB operation counts; only active when QUERY_COUNT_ENABLED (DEBUG by default)
+    'core.querycount.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,9 +59,45 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-# Use file-based sessions to avoid Djongo issues
-SESSION_ENGINE = 'django.contrib.sessions.backends.file'
-SESSION_FILE_PATH = None  # Use default temp directory
+# Caches: Redis when REDIS_URL is set, so every worker shares state. Without it
+# the default cache is per-process and sessions are stored in files on the host.
+# The Redis backend comes from django-redis (Django 3.1 has no built-in one).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'loksewa',
+            'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+        },
+        'sessions': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'loksewa_sessions',
+            'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+        },
+    }
+    # Cache-backed sessions (djongo has no session table) with a per-process
+    # LRU tier in front of Redis; see core/sessions.py.
+    SESSION_ENGINE = 'core.sessions'
+    SESSION_CACHE_ALIAS = 'sessions'
+    SESSION_LOCAL_TTL = 5
+    SESSION_LOCAL_MAX_ENTRIES = 1000
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+    # One file per session, shared by the workers on this host. Saving a
+    # session writes only its own file; `manage.py clearsessions` removes
+    # expired ones.
+    SESSION_ENGINE = 'django.contrib.sessions.backends.file'
+    SESSION_FILE_PATH = os.path.join(tempfile.gettempdir(), 'loksewa_sessions')
+    os.makedirs(SESSION_FILE_PATH, exist_ok=True)
+# Run `manage.py clear_session_files` once to remove files the old file engine
+# left in the temp directory.
 
 ROOT_URLCONF = 'loksewa.urls'
 
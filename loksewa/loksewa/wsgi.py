@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'loksewa.settings')
 
 application = get_wsgi_application()
+
+# Load bookmark content types once per worker instead of on the first requests
+from core.contenttypes import warm_content_types  # noqa: E402
+warm_content_types()